@@ -1,5 +1,6 @@
 import rhinoscriptsyntax as rs
 import Rhino
+import AlignMesh
 
 # Function to process the new Mesh with geometry, make it solid, and add arrows
 def process_mesh_with_geometry(original_mesh_id, offset_lowest):
@@ -49,44 +50,12 @@ def process_mesh_with_geometry(original_mesh_id, offset_lowest):
         return
     
     # Duplicate the original Mesh and position it 200mm above working plane
-    new_mesh_id = rs.CopyObject(original_mesh_id)
-    
-    # Calculate the normal of the original Mesh at Point 1
-    mesh_geo = rs.coercemesh(original_mesh_id)
-    point_1_3d = Rhino.Geometry.Point3d(point_1[0], point_1[1], point_1[2])
-    mesh_point = mesh_geo.ClosestMeshPoint(point_1_3d, 0.0)
-    if not mesh_point:
-        print("Could not find closest point on Mesh!")
-        return
-    normal = mesh_geo.NormalAt(mesh_point)
-    if not normal:
-        print("Could not calculate normal at lowest point!")
-        return
-    
-    # Define the target XY plane (horizontal) at Z = offset_lowest[2] + 0.2
     target_z = offset_lowest[2] + 0.2
     target_plane = Rhino.Geometry.Plane(Rhino.Geometry.Point3d(point_1[0], point_1[1], target_z),
                                         Rhino.Geometry.Vector3d(0, 0, 1))
-    
-    # Rotate the new Mesh to align with XY plane
-    source_plane = Rhino.Geometry.Plane(point_1_3d, normal)
-    rs.OrientObject(new_mesh_id, 
-                    [source_plane.Origin, source_plane.Origin + source_plane.Normal],
-                    [target_plane.Origin, target_plane.Origin + target_plane.Normal])
-    
-    # Move the new Mesh to ensure its lowest point is at target_z
-    new_vertices = rs.MeshVertices(new_mesh_id)
-    if not new_vertices:
-        print("Could not retrieve vertices from new Mesh!")
+    new_mesh_id, source_plane = AlignMesh.align_copy(original_mesh_id, point_1, target_z)
+    if not new_mesh_id:
         return
-    new_lowest_z = min(v[2] for v in new_vertices)
-    translation = (0, 0, target_z - new_lowest_z)
-    rs.MoveObject(new_mesh_id, translation)
-    
-    # Verify the new Mesh position
-    new_vertices_after_move = rs.MeshVertices(new_mesh_id)
-    final_lowest_z = min(v[2] for v in new_vertices_after_move)
-    print("New Mesh lowest Z: {:.2f} (should be {:.2f})".format(final_lowest_z, target_z))
     
     # QuadRemesh the new Mesh with higher quad count to preserve corners
     rs.Command("-QuadRemesh TargetQuadCount 100 AdaptiveSize 10 DetectHardEdges Yes _SelID {} _Enter".format(new_mesh_id))
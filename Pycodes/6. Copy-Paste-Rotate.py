@@ -1,6 +1,11 @@
 import rhinoscriptsyntax as rs
 import Rhino
 
+try:
+    import PropTable  # NumPy prop table (CPython); IronPython keeps the text dots
+except ImportError:
+    PropTable = None
+
 # Step 1: User selects a mesh and names it "Mesh_1"
 mesh_1 = rs.GetObject("Select a Mesh", rs.filter.mesh)
 if not mesh_1:
@@ -80,6 +85,12 @@ if not points:
 # Define offset_lowest for elevation reference (200mm below Point 1)
 offset_lowest = (point_1[0], point_1[1], point_1[2] - 0.2)
 
+# Prop table for every vertex in one pass, exported instead of per-vertex text
+table_files = None
+if PropTable:
+    table = PropTable.build_prop_table(points, offset_lowest[2], point_1)
+    table_files = PropTable.export_prop_table(table, rs.SaveFileName("Save prop table", "CSV Files (*.csv)|*.csv||"))
+
 # Add points and draw geometry
 for pt in points:
     rs.AddPoint(pt)
@@ -105,10 +116,11 @@ for pt in points:
     large_cylinder = rs.ExtrudeCurveStraight(large_cylinder_base, (0, 0, 0), (0, 0, 0.08))
     rs.DeleteObject(large_cylinder_base)
     
-    # Text with relative coordinates to Point 1
-    text = "X={:.2f}\nY={:.2f}\nZ={:.2f}\nH={:.2f}".format(
-        pt[0] - point_1[0], pt[1] - point_1[1], pt[2] - point_1[2], curve_length)
-    rs.AddText(text, end_point, height=0.06)
+    # Text with relative coordinates to Point 1 (only without a prop table)
+    if not table_files:
+        text = "X={:.2f}\nY={:.2f}\nZ={:.2f}\nH={:.2f}".format(
+            pt[0] - point_1[0], pt[1] - point_1[1], pt[2] - point_1[2], curve_length)
+        rs.AddText(text, end_point, height=0.06)
 
 # Step 6: Add annotations for Point 1 and Point 2 with real project coordinates
 text_point_1 = "Point 1 (Bottom-Left): ({:.2f}, {:.2f}, {:.2f})".format(point_1[0], point_1[1], point_1[2])
@@ -0,0 +1,87 @@
+"""
+Aligned copy of a panel mesh, laid flat with its lowest point at a target Z.
+
+Shared by the formwork scripts. With NumPy (CPython), PlaneAlign takes the
+rotation from the best-fit plane of every vertex and places the copy with one
+document transform. Without it (IronPython), the copy is oriented from the
+mesh normal at Point 1 and then moved down to the target Z, as the scripts
+always did. This module itself only needs the standard library and Rhino.
+"""
+import rhinoscriptsyntax as rs
+import Rhino
+
+try:
+    import PlaneAlign  # NumPy best-fit plane alignment (CPython)
+except ImportError:
+    PlaneAlign = None
+
+
+def align_copy_transforms(mesh_id, point_1, target_z):
+    """
+    Copies a mesh object and lays the copy flat, its lowest vertex at
+    target_z.
+
+    Args:
+        mesh_id: Mesh object id.
+        point_1: Panel origin (x, y, z), the pivot of the rotation.
+        target_z: Z of the lowest vertex after alignment.
+
+    Returns:
+        tuple: (new mesh id, source plane at Point 1, transform, inverse).
+            The transforms are Rhino.Geometry.Transform values with
+            PlaneAlign and None without it. All None on failure.
+    """
+    point_1_3d = Rhino.Geometry.Point3d(point_1[0], point_1[1], point_1[2])
+    if PlaneAlign:
+        # Best-fit plane of every vertex; rotation and lowest-Z move in one transform
+        alignment = PlaneAlign.align_mesh_object(mesh_id, point_1, target_z)
+        if not alignment:
+            print("Could not align Mesh!")
+            return None, None, None, None
+        return (alignment.mesh_id, Rhino.Geometry.Plane(point_1_3d, alignment.normal),
+                alignment.transform, alignment.inverse)
+
+    # Calculate the normal of the original Mesh at Point 1
+    mesh_geo = rs.coercemesh(mesh_id)
+    mesh_point = mesh_geo.ClosestMeshPoint(point_1_3d, 0.0)
+    if not mesh_point:
+        print("Could not find closest point on Mesh!")
+        return None, None, None, None
+    normal = mesh_geo.NormalAt(mesh_point)
+    if not normal:
+        print("Could not calculate normal at lowest point!")
+        return None, None, None, None
+    new_mesh_id = rs.CopyObject(mesh_id)
+
+    # Rotate the new Mesh to align with XY plane
+    source_plane = Rhino.Geometry.Plane(point_1_3d, normal)
+    target_plane = Rhino.Geometry.Plane(Rhino.Geometry.Point3d(point_1[0], point_1[1], target_z),
+                                        Rhino.Geometry.Vector3d(0, 0, 1))
+    rs.OrientObject(new_mesh_id,
+                    [source_plane.Origin, source_plane.Origin + source_plane.Normal],
+                    [target_plane.Origin, target_plane.Origin + target_plane.Normal])
+
+    # Move the new Mesh to ensure its lowest point is at target_z
+    new_vertices = rs.MeshVertices(new_mesh_id)
+    if not new_vertices:
+        print("Could not retrieve vertices from new Mesh!")
+        return None, None, None, None
+    new_lowest_z = min(v[2] for v in new_vertices)
+    rs.MoveObject(new_mesh_id, (0, 0, target_z - new_lowest_z))
+
+    # Verify the new Mesh position
+    final_lowest_z = min(v[2] for v in rs.MeshVertices(new_mesh_id))
+    print("New Mesh lowest Z: {:.2f} (should be {:.2f})".format(final_lowest_z, target_z))
+    return new_mesh_id, source_plane, None, None
+
+
+def align_copy(mesh_id, point_1, target_z):
+    """
+    Copies a mesh object and lays the copy flat, its lowest vertex at
+    target_z (see align_copy_transforms).
+
+    Returns:
+        tuple: (new mesh id, source plane at Point 1), or (None, None) on
+            failure.
+    """
+    return align_copy_transforms(mesh_id, point_1, target_z)[:2]
@@ -0,0 +1,273 @@
+"""
+Bar bending schedule from RebarModel centrelines.
+
+RebarGenerator puts its bars on Rebar_D<dia> layers and CurveProcessor names
+its copies Rebar_1_copy_<i>; both keep the centrelines in a RebarModel (saved
+as .npz). Quantities used to come from measuring bars one by one. Here every
+bar of a model is measured and classified in a few array passes:
+
+- length from the centreline segments;
+- shape from the turning angles at the centreline vertices: straight, bent
+  (with its bend count), curved (smooth turning, e.g. along a shell) or
+  closed (loops such as the slab edge rings);
+- bars of the same family, diameter and shape whose cut lengths, rounded up
+  to TOLERANCE, are equal share one bar mark;
+- mass from the bar cross-section and the steel density.
+
+The schedule is written as CSV (one row per mark) and JSON (marks plus
+totals per diameter):
+
+    python BarSchedule.py slab.npz stair.npz --unit-scale 0.001 -o schedule
+
+In Rhino, the generators offer save_schedule() after building their model,
+and document_model() collects the bar curves of a document into a model.
+
+Requires CPython 3 with NumPy.
+"""
+import argparse
+import collections
+import csv
+import json
+import math
+import os
+import re
+import time
+
+import numpy as np
+
+import RebarModel
+
+DENSITY = 7850.0                    # Steel density (kg/m3)
+TOLERANCE = 0.005                   # Cut lengths are rounded up to this (m)
+BEND_ANGLE = math.radians(10.0)     # Vertex turning counted as a bend
+CURVED_ANGLE = math.radians(5.0)    # Smooth turning that makes a bar curved
+SHAPES = ("straight", "bent", "curved", "closed")
+LAYER = re.compile(r"(?:^|::)Rebar_D(\d+(?:\.\d+)?)$")
+NAME = re.compile(r"^Rebar_1(?:_copy_\d+)?$")
+
+Mark = collections.namedtuple("Mark", "mark family diameter shape bends cut_length count total_length unit_mass mass")
+Schedule = collections.namedtuple("Schedule", "marks bar_marks unit_scale density tolerance")
+
+
+def bar_shapes(model, tolerance=0.0):
+    """
+    Classifies every bar by the turning angles at its centreline vertices.
+
+    Args:
+        model: The RebarModel.
+        tolerance: Start-end distance (model units) below which a bar is
+            closed.
+
+    Returns:
+        tuple: (shape, bends) arrays: index into SHAPES and the number of
+            vertices turning more than BEND_ANGLE.
+    """
+    count = len(model)
+    a, b, bar = model.segments()
+    vectors = b - a
+    norms = np.linalg.norm(vectors, axis=1)
+    keep = norms > 0
+    vectors, norms, bar = vectors[keep], norms[keep], bar[keep]
+    pair = bar[1:] == bar[:-1]
+    cosine = np.einsum("ij,ij->i", vectors[1:], vectors[:-1]) / (norms[1:] * norms[:-1])
+    angles = np.where(pair, np.arccos(np.clip(cosine, -1.0, 1.0)), 0.0)
+    owner = bar[1:]
+    bent = angles > BEND_ANGLE
+    bends = np.bincount(owner[bent], minlength=count)
+    smooth = np.bincount(owner, weights=np.where(bent, 0.0, angles), minlength=count)
+
+    starts = model.points[model.offsets[:-1]]
+    ends = model.points[model.offsets[1:] - 1]
+    closed = (np.linalg.norm(ends - starts, axis=1) <= tolerance) & (np.diff(model.offsets) > 3)
+    # The corner where a closed bar meets its start
+    loops = np.nonzero(closed)[0]
+    first = np.searchsorted(bar, loops, side="left")
+    last = np.searchsorted(bar, loops, side="right") - 1
+    cosine = np.einsum("ij,ij->i", vectors[first], vectors[last]) / (norms[first] * norms[last])
+    bends[loops] += np.arccos(np.clip(cosine, -1.0, 1.0)) > BEND_ANGLE
+    shape = np.where(bends > 0, SHAPES.index("bent"), SHAPES.index("straight"))
+    shape = np.where(smooth > CURVED_ANGLE, SHAPES.index("curved"), shape)
+    shape = np.where(closed, SHAPES.index("closed"), shape)
+    return shape.astype(np.int8), bends
+
+
+def schedule(model, unit_scale=1.0, density=DENSITY, tolerance=TOLERANCE):
+    """
+    Builds the bar bending schedule of a model.
+
+    Args:
+        model: The RebarModel (points and diameters in model units).
+        unit_scale: Metres per model unit (0.001 for millimetres).
+        density: Steel density (kg/m3).
+        tolerance: Cut length rounding (m); bars rounding to the same
+            length share a mark.
+
+    Returns:
+        Schedule: marks (list of Mark, lengths in m and diameters in mm,
+            by family, diameter, shape and length) and bar_marks, the index
+            into marks of every bar.
+    """
+    lengths = model.lengths() * unit_scale
+    diameters = model.diameters * unit_scale
+    shape, bends = bar_shapes(model, tolerance / unit_scale)
+    cut = np.ceil(lengths / tolerance - 1e-9).astype(np.int64)
+    keys = np.column_stack([model.group, np.round(diameters * 1e6).astype(np.int64), shape, bends, cut])
+    order = np.lexsort(keys.T[::-1])
+    first = np.ones(len(keys), dtype=bool)
+    first[1:] = (keys[order[1:]] != keys[order[:-1]]).any(axis=1)
+    unique = keys[order[first]]
+    bar_marks = np.empty(len(keys), dtype=np.int64)
+    bar_marks[order] = np.cumsum(first) - 1
+    counts = np.bincount(bar_marks, minlength=len(unique))
+    totals = np.bincount(bar_marks, weights=lengths, minlength=len(unique))
+
+    marks = []
+    numbers = collections.Counter()
+    for (group, diameter, shape_index, bend_count, cut_count), count, total in zip(unique, counts, totals):
+        diameter = float(diameter) * 1e-3
+        numbers[diameter] += 1
+        unit_mass = density * math.pi * (diameter * 1e-3) ** 2 / 4.0
+        marks.append(Mark("D{:g}-{:03d}".format(diameter, numbers[diameter]), model.groups[group], diameter,
+                          SHAPES[shape_index], int(bend_count), round(float(cut_count) * tolerance, 9), int(count), float(total),
+                          unit_mass, unit_mass * float(total)))
+    return Schedule(marks, bar_marks, unit_scale, density, tolerance)
+
+
+def diameter_totals(result):
+    """
+    Returns {diameter (mm): {"bars", "length", "mass"}} summed over the marks.
+    """
+    totals = collections.OrderedDict()
+    for mark in sorted(result.marks, key=lambda m: m.diameter):
+        total = totals.setdefault(mark.diameter, {"bars": 0, "length": 0.0, "mass": 0.0})
+        total["bars"] += mark.count
+        total["length"] += mark.total_length
+        total["mass"] += mark.mass
+    return totals
+
+
+def write_csv(result, path):
+    """Writes one row per mark."""
+    with open(path, "w", newline="") as stream:
+        writer = csv.writer(stream)
+        writer.writerow(["mark", "family", "diameter_mm", "shape", "bends", "cut_length_m", "count",
+                         "total_length_m", "unit_mass_kg_m", "mass_kg"])
+        for m in result.marks:
+            writer.writerow([m.mark, m.family, "{:g}".format(m.diameter), m.shape, m.bends,
+                             "{:.3f}".format(m.cut_length), m.count, "{:.3f}".format(m.total_length),
+                             "{:.3f}".format(m.unit_mass), "{:.2f}".format(m.mass)])
+    return path
+
+
+def write_json(result, path):
+    """Writes the marks plus totals per diameter."""
+    totals = diameter_totals(result)
+    data = {"density": result.density, "tolerance": result.tolerance,
+            "bars": int(sum(m.count for m in result.marks)),
+            "mass": sum(t["mass"] for t in totals.values()),
+            "diameters": [dict(diameter=d, **t) for d, t in totals.items()],
+            "marks": [m._asdict() for m in result.marks]}
+    with open(path, "w") as stream:
+        json.dump(data, stream, indent=1)
+    return path
+
+
+def export_schedule(result, path):
+    """
+    Writes the schedule next to path as both <name>.csv and <name>.json.
+
+    Returns:
+        tuple: (csv path, json path), or None if no path was given.
+    """
+    if not path:
+        return None
+    stem = os.path.splitext(path)[0]
+    return write_csv(result, stem + ".csv"), write_json(result, stem + ".json")
+
+
+def save_schedule(model):
+    """
+    Asks for a file and writes the model's schedule there (Rhino), with the
+    document's units.
+
+    Returns:
+        tuple: (csv path, json path), or None if cancelled.
+    """
+    import rhinoscriptsyntax as rs
+
+    path = rs.SaveFileName("Save bar schedule", "CSV Files (*.csv)|*.csv||")
+    if not path:
+        return None
+    result = schedule(model, rs.UnitScale(4))
+    for diameter, total in diameter_totals(result).items():
+        print("D{:g}: {} bars, {:.1f} m, {:.1f} kg".format(diameter, total["bars"], total["length"], total["mass"]))
+    return export_schedule(result, path)
+
+
+def document_model(doc=None, unit_scale=1.0, copy_diameter=None):
+    """
+    Collects the bar curves of a Rhino document into a RebarModel: curves on
+    Rebar_D<dia> layers (diameter in mm from the layer name) and curves named
+    Rebar_1 / Rebar_1_copy_<i> (diameter copy_diameter, model units). Pipe
+    solids are views of model bars and are not collected.
+
+    Args:
+        doc: The Rhino document. Defaults to scriptcontext.doc.
+        unit_scale: Metres per model unit.
+        copy_diameter: Diameter of the Rebar_1 copies; they are skipped if
+            None.
+
+    Returns:
+        RebarModel.RebarModel: One family per layer, plus "Rebar_1_copy".
+    """
+    import Rhino.Geometry as rg
+    import scriptcontext as sc
+
+    doc = doc or sc.doc
+    bars = collections.OrderedDict()
+    for obj in doc.Objects:
+        curve = obj.Geometry
+        if not isinstance(curve, rg.Curve):
+            continue
+        layer = LAYER.search(doc.Layers[obj.Attributes.LayerIndex].FullPath)
+        if layer:
+            family, diameter = layer.group(0).split("::")[-1], float(layer.group(1)) * 1e-3 / unit_scale
+        elif copy_diameter is not None and NAME.match(obj.Attributes.Name or ""):
+            family, diameter = "Rebar_1_copy", copy_diameter
+        else:
+            continue
+        ok, polyline = curve.TryGetPolyline()
+        if not ok:
+            polyline = curve.ToPolyline(doc.ModelAbsoluteTolerance, doc.ModelAngleToleranceRadians, 0.0, 0.0)
+            polyline = polyline.ToPolyline()
+        bars.setdefault((family, diameter), []).append([(p.X, p.Y, p.Z) for p in polyline])
+
+    model = RebarModel.RebarModel()
+    for (family, diameter), centrelines in bars.items():
+        model.extend(centrelines, diameter, family)
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bar bending schedule of saved rebar models.")
+    parser.add_argument("models", nargs="+", help="RebarModel .npz files")
+    parser.add_argument("-o", "--out", default="schedule", help="Output path without extension")
+    parser.add_argument("--unit-scale", type=float, default=1.0, help="Metres per model unit")
+    parser.add_argument("--density", type=float, default=DENSITY, help="Steel density (kg/m3)")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="Cut length rounding (m)")
+    args = parser.parse_args()
+
+    start = time.time()
+    model = RebarModel.RebarModel()
+    for path in args.models:
+        model.merge(RebarModel.RebarModel.load(path))
+    result = schedule(model, args.unit_scale, args.density, args.tolerance)
+    paths = export_schedule(result, args.out + ".csv")
+    for diameter, total in diameter_totals(result).items():
+        print("D{:g}: {} bars, {:.1f} m, {:.1f} kg".format(diameter, total["bars"], total["length"], total["mass"]))
+    print("{} bars in {} marks -> {} in {:.2f}s".format(len(model), len(result.marks), ", ".join(paths),
+                                                       time.time() - start))
+
+
+if __name__ == "__main__":
+    main()
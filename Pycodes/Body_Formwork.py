@@ -1,5 +1,12 @@
 import rhinoscriptsyntax as rs
 import Rhino
+import AlignMesh
+import RemeshCache
+
+try:
+    import PropTable  # NumPy prop table (CPython); IronPython keeps the text dots
+except ImportError:
+    PropTable = None
 
 #Quadremesh parameters
 def QuadRemesh_LOD(mesh_id,lod):
@@ -14,7 +21,7 @@ def QuadRemesh_LOD(mesh_id,lod):
     qr_params.DetectHardEdges=True
     #qr_params.SymmetryAxis = Rhino.Geometry.QuadRemeshSymmetryAxis.X | Rhino.Geometry.QuadRemeshSymmetryAxis.Y | Rhino.Geometry.QuadRemeshSymmetryAxis.Z
         
-    remeshed = Rhino.Geometry.Mesh.QuadRemesh(mesh,qr_params)
+    remeshed = RemeshCache.cached_quad_remesh(mesh,qr_params)
 
     return remeshed
 
@@ -69,44 +76,10 @@ def process_mesh_with_geometry(original_mesh_id, offset_lowest,lod):
     rs.ObjectName(working_plane, "10m x 10m Working Plane")
     
     # Duplicate the original Mesh and position it 200mm above working plane
-    new_mesh_id = rs.CopyObject(original_mesh_id)
-    
-    # Calculate the normal of the original Mesh at Point 1
-    mesh_geo = rs.coercemesh(original_mesh_id)
-    point_1_3d = Rhino.Geometry.Point3d(point_1[0], point_1[1], point_1[2])
-    mesh_point = mesh_geo.ClosestMeshPoint(point_1_3d, 0.0)
-    if not mesh_point:
-        print("Could not find closest point on Mesh!")
-        return
-    normal = mesh_geo.NormalAt(mesh_point)
-    if not normal:
-        print("Could not calculate normal at lowest point!")
-        return
-    
-    # Define the target XY plane (horizontal) at Z = offset_lowest[2] + 0.2
     target_z = offset_lowest[2] + 0.2
-    target_plane = Rhino.Geometry.Plane(Rhino.Geometry.Point3d(point_1[0], point_1[1], target_z),
-                                        Rhino.Geometry.Vector3d(0, 0, 1))
-    
-    # Rotate the new Mesh to align with XY plane
-    source_plane = Rhino.Geometry.Plane(point_1_3d, normal)
-    rs.OrientObject(new_mesh_id, 
-                    [source_plane.Origin, source_plane.Origin + source_plane.Normal],
-                    [target_plane.Origin, target_plane.Origin + target_plane.Normal])
-    
-    # Move the new Mesh to ensure its lowest point is at target_z
-    new_vertices = rs.MeshVertices(new_mesh_id)
-    if not new_vertices:
-        print("Could not retrieve vertices from new Mesh!")
+    new_mesh_id, source_plane = AlignMesh.align_copy(original_mesh_id, point_1, target_z)
+    if not new_mesh_id:
         return
-    new_lowest_z = min(v[2] for v in new_vertices)
-    translation = (0, 0, target_z - new_lowest_z)
-    rs.MoveObject(new_mesh_id, translation)
-    
-    # Verify the new Mesh position
-    new_vertices_after_move = rs.MeshVertices(new_mesh_id)
-    final_lowest_z = min(v[2] for v in new_vertices_after_move)
-    print("New Mesh lowest Z: {:.2f} (should be {:.2f})".format(final_lowest_z, target_z))
     
     # QuadRemesh the new Mesh with higher quad count and preserve corners
     new_mesh_2 = rs.coercemesh(new_mesh_id,True)
@@ -140,6 +113,12 @@ def process_mesh_with_geometry(original_mesh_id, offset_lowest,lod):
     lowest = min(points, key=lambda pt: pt[2])
     print("New Mesh - Lowest point: ({:.2f}, {:.2f}, {:.2f})".format(lowest[0], lowest[1], lowest[2]))
     
+    # Prop table for every vertex in one pass, exported instead of per-vertex text
+    table_files = None
+    if PropTable:
+        table = PropTable.build_prop_table(points, offset_lowest[2], origin)
+        table_files = PropTable.export_prop_table(table, rs.SaveFileName("Save prop table", "CSV Files (*.csv)|*.csv||"))
+    
     # Create geometry for the new Mesh
     rs.EnableRedraw(False)
     for pt in points:
@@ -167,10 +146,11 @@ def process_mesh_with_geometry(original_mesh_id, offset_lowest,lod):
         large_cylinder = rs.ExtrudeCurveStraight(large_cylinder_base, (0, 0, 0), (0, 0, 0.08))
         rs.DeleteObject(large_cylinder_base)
         
-        # Updated text with smaller size and line breaks
-        text = "X={:.2f}\nY={:.2f}\nZ={:.2f}\nH={:.2f}".format(
-            start_point_new[0], start_point_new[1], start_point_new[2], curve_length)
-        rs.AddText(text, end_point, height=0.06)
+        # Updated text with smaller size and line breaks (only without a prop table)
+        if not table_files:
+            text = "X={:.2f}\nY={:.2f}\nZ={:.2f}\nH={:.2f}".format(
+                start_point_new[0], start_point_new[1], start_point_new[2], curve_length)
+            rs.AddText(text, end_point, height=0.06)
     
     # Label the lowest point
     rs.AddText("Z_min: {:.2f}".format(lowest[2]), lowest, height=0.06)
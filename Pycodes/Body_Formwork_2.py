@@ -1,6 +1,8 @@
 import rhinoscriptsyntax as rs
 import Rhino
 import System.IO
+import RemeshCache
+import AlignMesh
 
 class MeshProcessor:
     """
@@ -16,6 +18,8 @@ class MeshProcessor:
         self.lod = lod
         self.origin = None
         self.offset_lowest = None
+        self.to_aligned = None
+        self.to_project = None
 
     def calculate_new_origin(self):
         """
@@ -50,25 +54,17 @@ class MeshProcessor:
     def align_mesh_to_xy_plane(self):
         """
         Aligns the mesh to the XY plane and moves it to the target Z coordinate.
+
+        With NumPy, the best-fit plane of all vertices gives the rotation and the
+        copy is placed with one transform; to_aligned/to_project keep it and its
+        inverse.
         """
-        new_mesh_id = rs.CopyObject(self.mesh_id)
-        mesh_geo = rs.coercemesh(self.mesh_id)
-        point_1_3d = Rhino.Geometry.Point3d(self.origin[0], self.origin[1], self.origin[2])
-        mesh_point = mesh_geo.ClosestMeshPoint(point_1_3d, 0.0)
-        normal = mesh_geo.NormalAt(mesh_point)
         target_z = self.offset_lowest[2] + 0.2
-        target_plane = Rhino.Geometry.Plane(Rhino.Geometry.Point3d(self.origin[0], self.origin[1], target_z),
-                                            Rhino.Geometry.Vector3d(0, 0, 1))
-        source_plane = Rhino.Geometry.Plane(point_1_3d, normal)
-        rs.OrientObject(new_mesh_id, 
-                        [source_plane.Origin, source_plane.Origin + source_plane.Normal],
-                        [target_plane.Origin, target_plane.Origin + target_plane.Normal])
-        new_vertices = rs.MeshVertices(new_mesh_id)
-        new_lowest_z = min(v[2] for v in new_vertices)
-        translation = (0, 0, target_z - new_lowest_z)
-        rs.MoveObject(new_mesh_id, translation)
+        new_mesh_id, _, to_aligned, to_project = AlignMesh.align_copy_transforms(self.mesh_id, self.origin, target_z)
+        if not new_mesh_id:
+            return None
         self.mesh_id = new_mesh_id
-        print("New Mesh lowest Z: {:.2f} (should be {:.2f})".format(min(v[2] for v in rs.MeshVertices(new_mesh_id)), target_z))
+        self.to_aligned, self.to_project = to_aligned, to_project
 
     def quad_remesh_mesh(self):
         """
@@ -143,7 +139,7 @@ class MeshProcessor:
         qr_params.TargetQuadCount = lod
         qr_params.AdaptiveSize = 50
         qr_params.DetectHardEdges = True
-        remeshed = Rhino.Geometry.Mesh.QuadRemesh(mesh_id, qr_params)
+        remeshed = RemeshCache.cached_quad_remesh(mesh_id, qr_params)
         return remeshed
         
     def create_geometry_and_labels_for_point_plane(self, input_point, input_plane):
@@ -1,6 +1,25 @@
 import rhinoscriptsyntax as rs
 import Rhino
+import System
 import Rhino.Geometry as rg
+from PropStaging import PropStage
+import RemeshCache
+import AlignMesh
+
+try:
+    import GridRemesh  # NumPy structured-grid remesher (CPython)
+except ImportError:
+    GridRemesh = None
+
+try:
+    import PropLayout  # NumPy prop-layout optimizer (CPython)
+except ImportError:
+    PropLayout = None
+
+try:
+    import PropIncremental  # NumPy incremental prop updates (CPython)
+except ImportError:
+    PropIncremental = None
 
 class MeshProcessor:
     """
@@ -13,9 +32,12 @@ class MeshProcessor:
         Initializes the MeshProcessor with a mesh ID and level of detail (LOD).
         """
         self.mesh_id = mesh_id
+        self.source_id = mesh_id
         self.lod = lod
         self.origin = None
         self.offset_lowest = None
+        self.to_aligned = None
+        self.to_project = None
 
     def calculate_new_origin(self):
         """
@@ -51,25 +73,17 @@ class MeshProcessor:
         """
         Aligns the mesh to the XY plane and moves it to the target Z coordinate.
         Creates additional meshes perpendicular to the aligned mesh at its four edges.
+
+        With NumPy, the best-fit plane of all vertices gives the rotation and the
+        copy is placed with one transform; to_aligned/to_project keep it and its
+        inverse.
         """
-        new_mesh_id = rs.CopyObject(self.mesh_id)
-        mesh_geo = rs.coercemesh(self.mesh_id)
-        point_1_3d = rg.Point3d(self.origin[0], self.origin[1], self.origin[2])
-        mesh_point = mesh_geo.ClosestMeshPoint(point_1_3d, 0.0)
-        normal = mesh_geo.NormalAt(mesh_point)
         target_z = self.offset_lowest[2] + 0.2
-        target_plane = rg.Plane(rg.Point3d(self.origin[0], self.origin[1], target_z), rg.Vector3d(0, 0, 1))
-        source_plane = rg.Plane(point_1_3d, normal)
-        rs.OrientObject(new_mesh_id, [source_plane.Origin, source_plane.Origin + source_plane.Normal],
-                        [target_plane.Origin, target_plane.Origin + target_plane.Normal])
-        mesh_object = Rhino.RhinoDoc.ActiveDoc.Objects.Find(new_mesh_id)
-        mesh = mesh_object.Geometry.ToMesh()
-        new_vertices = mesh.Vertices
-        new_lowest_z = min(v.Z for v in new_vertices)
-        translation = (0, 0, target_z - new_lowest_z)
-        rs.MoveObject(new_mesh_id, translation)
+        new_mesh_id, _, to_aligned, to_project = AlignMesh.align_copy_transforms(self.mesh_id, self.origin, target_z)
+        if not new_mesh_id:
+            return None
         self.mesh_id = new_mesh_id
-        print("New Mesh lowest Z: {:.2f} (should be {:.2f})".format(min(v.Z for v in mesh.Vertices), target_z))
+        self.to_aligned, self.to_project = to_aligned, to_project
 
         # Create perpendicular meshes at the four edges
         self.create_perpendicular_meshes(target_z, 0.055)  # Height of 55mm (0.055 meters)
@@ -114,8 +128,8 @@ class MeshProcessor:
             perpendicular_mesh.Normals.ComputeNormals()
             perpendicular_mesh.Compact()
             mesh_id = Rhino.RhinoDoc.ActiveDoc.Objects.AddMesh(perpendicular_mesh)
-            if mesh_id != Rhino.Geometry.Guid.Empty: # Check for valid GUID
-                rs.ObjectName( (mesh_id, "Perpendicular Mesh "+ {i + 1}))
+            if mesh_id != System.Guid.Empty: # Check for valid GUID
+                rs.ObjectName(mesh_id, "Perpendicular Mesh {}".format(i + 1))
             else:
                 print("Failed to create perpendicular mesh ")
 
@@ -131,9 +145,16 @@ class MeshProcessor:
 
         self.mesh_id = quad_mesh if not isinstance(quad_mesh, list) else quad_mesh[0]
 
-    def create_geometry_and_labels(self):
+    def create_geometry_and_labels(self, staged=True, instanced=False):
         """
         Creates geometry (lines, cylinders, spheres) and labels for the mesh.
+
+        Args:
+            staged: Build every prop as in-memory records and add them to the
+                document in one pass (PropStage). When False, each object is
+                created through rhinoscriptsyntax as it is computed.
+            instanced: Place posts, caps and markers as block instances
+                instead of separate breps (staged mode only).
         """
         points = rs.MeshVertices(self.mesh_id)
         if not points:
@@ -143,6 +164,13 @@ class MeshProcessor:
         lowest = min(points, key=lambda pt: pt[2])
         print("New Mesh - Lowest point: ({:.2f}, {:.2f}, {:.2f})".format(lowest[0], lowest[1], lowest[2]))
 
+        if staged or instanced:
+            stage = PropStage(instanced)
+            for index, pt in enumerate(points):
+                stage.add_prop(pt, self.offset_lowest[2], self.origin, key=index)
+            stage.add_text("Z_min: {:.2f}".format(lowest[2]), lowest)
+            return stage.commit()
+
         rs.EnableRedraw(False)
         for pt in points:
             start_point_new = (pt[0] - self.origin[0], pt[1] - self.origin[1], pt[2] - self.origin[2])
@@ -171,6 +199,76 @@ class MeshProcessor:
         rs.AddText("Z_min: {:.2f}".format(lowest[2]), lowest, height=0.06)
         rs.EnableRedraw(True)
 
+    def update_geometry_and_labels(self, tolerance=0.001, instanced=False):
+        """
+        Incremental create_geometry_and_labels for re-runs on an edited panel.
+
+        The previous run's vertices and prop ids are kept in the document user
+        text of the source mesh (PropIncremental). Props whose vertex is still
+        within tolerance are left untouched; only those of moved, new or removed
+        vertices are deleted and recreated.
+
+        Returns:
+            tuple: (props kept, props created), or None.
+        """
+        if PropIncremental is None:
+            self.create_geometry_and_labels(instanced=instanced)
+            return None
+        points = rs.MeshVertices(self.mesh_id)
+        if not points:
+            print("Could not extract points from new Mesh!")
+            return None
+
+        base_z = self.offset_lowest[2]
+        state = PropIncremental.load_state(self.source_id)
+        match, stale = state.diff(points, base_z, self.origin, tolerance)
+        if stale:
+            rs.DeleteObjects(stale)
+
+        lowest = min(points, key=lambda pt: pt[2])
+        stage = PropStage(instanced)
+        for index, pt in enumerate(points):
+            if match[index] < 0:
+                stage.add_prop(pt, base_z, self.origin, key=index)
+        stage.add_text("Z_min: {:.2f}".format(lowest[2]), lowest)
+        ids = stage.commit()
+        state = state.updated(points, match, stage.keys(), ids, base_z, self.origin)
+        PropIncremental.save_state(self.source_id, state)
+
+        kept = int((match >= 0).sum())
+        print("Props kept: {}, recreated: {}".format(kept, len(points) - kept))
+        return kept, len(points) - kept
+
+    def create_optimized_props(self, max_spacing=1.2, max_cantilever=0.3, instanced=False):
+        """
+        Places the fewest props that keep adjacent props within max_spacing and
+        the panel overhang within max_cantilever (PropLayout), instead of one
+        prop per vertex. Props and labels are staged as in
+        create_geometry_and_labels.
+
+        Returns:
+            The prop table (PropTable rows), or None.
+        """
+        if PropLayout is None:
+            print("Optimized prop layout needs NumPy!")
+            return None
+        mesh = rs.coercemesh(self.mesh_id)
+        if not mesh:
+            print("Could not retrieve Mesh!")
+            return None
+
+        vertices = [(pt.X, pt.Y, pt.Z) for pt in mesh.Vertices]
+        faces = [(f.A, f.B, f.C, f.D) for f in mesh.Faces]
+        table = PropLayout.layout_panel(vertices, faces, self.offset_lowest[2], self.origin,
+                                        max_spacing=max_spacing, max_cantilever=max_cantilever)
+        print("Optimized layout: {} props for {} vertices".format(len(table), len(vertices)))
+
+        stage = PropStage(instanced)
+        for row in table:
+            stage.add_prop((row["x"], row["y"], row["z"]), self.offset_lowest[2], self.origin, key=int(row["vertex"]))
+        stage.commit()
+        return table
+
     def create_solid_from_mesh(self):
         """
         Creates a solid from the mesh with a 3mm thickness.
@@ -185,14 +283,25 @@ class MeshProcessor:
 
     def quad_remesh_lod(self, mesh_id, lod):
         """
-        QuadRemeshes a mesh with a specified level of detail (LOD).
+        QuadRemeshes a mesh with a specified level of detail (LOD). A negative
+        LOD resamples a four-sided panel into a structured grid of about -LOD
+        quads instead.
         """
+        if lod < 0:
+            lod = -lod
+            if GridRemesh is None:
+                print("Structured grid needs NumPy, using QuadRemesh")
+            else:
+                try:
+                    return GridRemesh.grid_remesh_mesh(mesh_id, lod)
+                except ValueError as error:
+                    print("Structured grid failed ({}), using QuadRemesh".format(error))
         qr_params = Rhino.Geometry.QuadRemeshParameters()
         qr_params.AdaptiveQuadCount = True
         qr_params.TargetQuadCount = lod
         qr_params.AdaptiveSize = 50
         qr_params.DetectHardEdges = True
-        remeshed = Rhino.Geometry.Mesh.QuadRemesh(mesh_id, qr_params)
+        remeshed = RemeshCache.cached_quad_remesh(mesh_id, qr_params)
         return remeshed
         
     def create_geometry_and_labels_for_point_plane(self, input_point, input_plane):
@@ -238,7 +347,9 @@ class MeshProcessor:
 if __name__ == "__main__":
     rs.EnableRedraw(False)
     original_mesh_id = rs.GetObject("Select a Mesh", rs.filter.mesh)
-    lod = rs.GetInteger("LOD target: ", 50, 0, 100)
+    lod = rs.GetInteger("LOD target (negative: structured grid): ", 50, -100, 100)
+    layout = rs.GetString("Prop layout", "Vertices", ["Vertices", "Incremental", "Optimized"])
+    instanced = rs.GetString("Prop geometry", "Breps", ["Breps", "Blocks"]) == "Blocks"
     if original_mesh_id:
         mesh_processor = MeshProcessor(original_mesh_id, lod)
         mesh_processor.offset_lowest = mesh_processor.calculate_new_origin()
@@ -246,7 +357,12 @@ if __name__ == "__main__":
             mesh_processor.create_working_plane()
             mesh_processor.align_mesh_to_xy_plane()
             mesh_processor.quad_remesh_mesh()
-            mesh_processor.create_geometry_and_labels()
+            if layout == "Optimized":
+                mesh_processor.create_optimized_props(instanced=instanced)
+            elif layout == "Incremental":
+                mesh_processor.update_geometry_and_labels(instanced=instanced)
+            else:
+                mesh_processor.create_geometry_and_labels(instanced=instanced)
             mesh_processor.create_solid_from_mesh()
     
     rs.EnableRedraw(True)
@@ -0,0 +1,242 @@
+"""
+Congruent-panel index.
+
+Many plates from DinhViTam.cut_mesh_into_plates or split_mesh_by_curves are
+rigid-motion copies of one another, yet each goes through remeshing, props
+and the solid offset on its own. This index puts panels that are the same
+shape up to a rotation and translation into one fabrication type:
+
+1. A signature invariant to rigid motion and to the tessellation: perimeter,
+   sqrt(area), the principal extents of the arc-length resampled naked-edge
+   loop and its total turning angle.
+2. Panels are bucketed on the signature within a tolerance; only panels in
+   the same or a neighbouring bucket are compared.
+3. A candidate is confirmed by registering the two boundary loops: Kabsch
+   over every cyclic shift and both directions, refining the best start
+   along the loop, then checking the panel interior against the fitted
+   transform.
+
+Each type then needs one pipeline run. The registration transform (4x4,
+representative -> member) maps its result onto every member.
+
+Requires CPython 3 with NumPy.
+"""
+import collections
+
+import numpy as np
+
+import MeshArrays
+
+TOLERANCE = 0.002       # Max deviation between congruent panels (m)
+SAMPLES = 64            # Arc-length samples along the naked-edge loop
+INTERIOR_SAMPLES = 256  # Vertices checked against the representative surface
+
+Signature = collections.namedtuple("Signature", "area perimeter extents turning boundary")
+PanelType = collections.namedtuple("PanelType", "type_id representative members")
+
+
+def boundary_polyline(vertices, faces):
+    """
+    Returns the longest naked-edge loop as a closed (k + 1, 3) polyline.
+
+    Raises:
+        ValueError: The mesh has no naked edges.
+    """
+    loops = MeshArrays.boundary_loops(faces)
+    if not loops:
+        raise ValueError("Mesh has no naked edges")
+    loop = max(loops, key=len)
+    return vertices[loop + loop[:1]]
+
+
+def resample_closed(polyline, count, start=0.0):
+    """
+    Returns count points spaced evenly by arc length along a closed polyline,
+    beginning start along it.
+    """
+    lengths = np.linalg.norm(np.diff(polyline, axis=0), axis=1)
+    distance = np.concatenate([[0.0], np.cumsum(lengths)])
+    targets = np.mod(start + np.arange(count) * (distance[-1] / count), distance[-1])
+    return np.column_stack([np.interp(targets, distance, polyline[:, k]) for k in range(3)])
+
+
+def signature(vertices, faces, samples=SAMPLES):
+    """
+    Rigid-motion invariant signature of a panel.
+    """
+    vertices = MeshArrays.as_vertices(vertices)
+    faces = MeshArrays.as_faces(faces)
+    polyline = boundary_polyline(vertices, faces)
+    boundary = resample_closed(polyline, samples)
+    extents = np.linalg.svd(boundary - boundary.mean(axis=0), compute_uv=False) / np.sqrt(samples)
+    before = MeshArrays.unitize(boundary - np.roll(boundary, 1, axis=0))
+    after = MeshArrays.unitize(np.roll(boundary, -1, axis=0) - boundary)
+    turning = np.arccos(np.clip(np.einsum("ij,ij->i", before, after), -1.0, 1.0)).sum()
+    perimeter = np.linalg.norm(np.diff(polyline, axis=0), axis=1).sum()
+    return Signature(float(MeshArrays.face_areas(vertices, faces).sum()), float(perimeter), extents,
+                     float(turning), polyline)
+
+
+def features(sig):
+    """Returns the signature as a point in length units for bucketing."""
+    return np.concatenate([[sig.perimeter, np.sqrt(sig.area)], sig.extents])
+
+
+def kabsch(source, target):
+    """
+    Best rotation and translation taking source points onto target points.
+
+    Args:
+        source, target: (..., k, 3) corresponding points; leading axes batch.
+
+    Returns:
+        tuple: ((..., 3, 3) rotations, (..., 3) translations, (...,) RMS).
+    """
+    source_center = source.mean(axis=-2, keepdims=True)
+    target_center = target.mean(axis=-2, keepdims=True)
+    covariance = np.swapaxes(source - source_center, -1, -2) @ (target - target_center)
+    u, _, vt = np.linalg.svd(covariance)
+    flip = np.sign(np.linalg.det(np.swapaxes(vt, -1, -2) @ np.swapaxes(u, -1, -2)))
+    vt = vt.copy()
+    vt[..., 2, :] *= flip[..., None]
+    rotation = np.swapaxes(vt, -1, -2) @ np.swapaxes(u, -1, -2)
+    translation = target_center[..., 0, :] - np.einsum("...ij,...j->...i", rotation, source_center[..., 0, :])
+    moved = np.einsum("...ij,...kj->...ki", rotation, source) + translation[..., None, :]
+    rms = np.sqrt(((moved - target) ** 2).sum(axis=-1).mean(axis=-1))
+    return rotation, translation, rms
+
+
+def register_boundaries(source, target, samples=SAMPLES, rounds=4):
+    """
+    Rigid transform taking the source loop onto the target loop.
+
+    Args:
+        source, target: Closed boundary polylines.
+        rounds: Refinements of the start along the target loop, each 8x finer.
+
+    Returns:
+        tuple: (4x4 transform, RMS distance of the resampled loops).
+    """
+    source_points = resample_closed(source, samples)
+    length = np.linalg.norm(np.diff(target, axis=0), axis=1).sum()
+    spacing = length / samples
+    best = (np.inf, None, None)
+    for loop in (target, target[::-1]):
+        # Every cyclic shift first, then ever finer starts around the best one
+        starts = np.arange(samples) * spacing
+        width = spacing
+        for _ in range(rounds + 1):
+            shifted = np.stack([resample_closed(loop, samples, start) for start in starts])
+            rotation, translation, rms = kabsch(np.broadcast_to(source_points, shifted.shape), shifted)
+            k = int(np.argmin(rms))
+            starts = starts[k] + np.linspace(-width, width, 17)
+            width /= 8.0
+        if rms[k] < best[0]:
+            best = (float(rms[k]), rotation[k], translation[k])
+    xform = np.eye(4)
+    xform[:3, :3] = best[1]
+    xform[:3, 3] = best[2]
+    return xform, best[0]
+
+
+def interior_deviation(source_vertices, xform, target_vertices, target_faces, samples=INTERIOR_SAMPLES):
+    """
+    Returns the largest distance from transformed source vertices (up to
+    samples of them) to the target surface, measured along the target's
+    normal (points that miss fall back to the closest point).
+    """
+    step = max(1, len(source_vertices) // samples)
+    moved = MeshArrays.transform_points(source_vertices[::step], xform)
+    normal = MeshArrays.face_normals(target_vertices, target_faces).sum(axis=0)
+    projected, hit = MeshArrays.intersect_lines(target_vertices, target_faces, moved, normal)
+    distance = np.linalg.norm(projected - moved, axis=1)
+    if not hit.all():
+        distance[~hit] = MeshArrays.closest_points(target_vertices, target_faces, moved[~hit])[3]
+    return float(distance.max()) if len(distance) else 0.0
+
+
+class CongruenceIndex(object):
+    """
+    Groups panels into fabrication types of congruent panels.
+
+    add() returns each panel's type and the transform from the type's
+    representative (the first panel of that shape) onto the panel.
+    """
+
+    def __init__(self, tolerance=TOLERANCE, samples=SAMPLES):
+        self.tolerance = tolerance
+        self.samples = samples
+        self.cell = 10.0 * tolerance
+        self.types = []         # PanelType per type id
+        self.meshes = []        # Representative (vertices, faces, signature) per type id
+        self.buckets = collections.defaultdict(list)
+
+    def __len__(self):
+        return len(self.types)
+
+    def bucket(self, point):
+        """Bucket key: perimeter and sqrt(area) cells."""
+        return tuple(np.floor(point[:2] / self.cell).astype(np.int64))
+
+    def candidates(self, sig):
+        """Type ids in the signature's bucket and its neighbours, closest first."""
+        point = features(sig)
+        key = self.bucket(point)
+        found = set()
+        for i in (-1, 0, 1):
+            for j in (-1, 0, 1):
+                found.update(self.buckets.get((key[0] + i, key[1] + j), ()))
+        gaps = [(np.abs(features(self.meshes[t][2]) - point).max(), t) for t in found]
+        return [t for gap, t in sorted(gaps) if gap <= self.cell]
+
+    def match(self, vertices, faces, sig):
+        """
+        Returns (type id, 4x4 transform) of a congruent type, or (None, None).
+        """
+        for type_id in self.candidates(sig):
+            rep_vertices, rep_faces, rep_sig = self.meshes[type_id]
+            if abs(rep_sig.turning - sig.turning) > 0.25 * np.pi:
+                continue
+            xform, rms = register_boundaries(rep_sig.boundary, sig.boundary, self.samples)
+            if rms > self.tolerance:
+                continue
+            if interior_deviation(rep_vertices, xform, vertices, faces) <= self.tolerance:
+                return type_id, xform
+        return None, None
+
+    def add(self, panel_id, vertices, faces):
+        """
+        Indexes a panel.
+
+        Returns:
+            tuple: (type id, 4x4 transform representative -> panel; identity
+                for a new type).
+        """
+        vertices = MeshArrays.as_vertices(vertices)
+        faces = MeshArrays.as_faces(faces)
+        sig = signature(vertices, faces, self.samples)
+        type_id, xform = self.match(vertices, faces, sig)
+        if type_id is None:
+            type_id, xform = len(self.types), np.eye(4)
+            self.types.append(PanelType(type_id, panel_id, []))
+            self.meshes.append((vertices, faces, sig))
+            self.buckets[self.bucket(features(sig))].append(type_id)
+        self.types[type_id].members.append((panel_id, xform))
+        return type_id, xform
+
+
+def group_panels(panels, tolerance=TOLERANCE):
+    """
+    Groups (vertices, faces) panels into congruent types.
+
+    Args:
+        panels: Iterable of (vertices, faces); the panel id is the position.
+
+    Returns:
+        list: PanelType(type id, representative panel id, [(panel id,
+            4x4 transform representative -> panel)]) per type.
+    """
+    index = CongruenceIndex(tolerance)
+    for panel_id, (vertices, faces) in enumerate(panels):
+        index.add(panel_id, vertices, faces)
+    return index.types
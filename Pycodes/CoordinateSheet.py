@@ -0,0 +1,151 @@
+"""
+Coordinate sheet: setting-out points of every plate in one indexed file.
+
+Process_EditCuttedMesh and addPointOnSurface labelled every NURBS control
+point with its own text object, and Point_Coordinates_onMesh did the same
+for every grid point. Over a zone that meant hundreds of thousands of
+annotations. Instead, the points are written to a .cpts sheet:
+
+- an IndexedFile container tagged "CPTS";
+- one fixed 53-byte record per point: kind (control/grid/edge), u and v
+  index, project X/Y/Z and flattened X/Y/Z;
+- (plate id, record offset, record count) segments in its JSON index.
+
+A reader loads only the index. A page of one plate's points is a single
+seek and read, so a site tablet can look up one plate without loading the
+rest:
+
+    python CoordinateSheet.py zone.cpts --list
+    python CoordinateSheet.py zone.cpts --plate <id> --page 0
+
+Standard library only, so it runs in any Rhino Python.
+"""
+import argparse
+import collections
+import struct
+
+import IndexedFile
+
+MAGIC = b"CPTS"
+VERSION = 1
+RECORD = struct.Struct("<BHH6d")
+PAGE_SIZE = 500
+
+CONTROL = 0     # NURBS control point (u, v) of the control net
+GRID = 1        # Surface grid point (u, v) of the evaluation grid
+EDGE = 2        # Border point u along naked-edge loop v
+
+SheetPoint = collections.namedtuple("SheetPoint", "kind u v x y z flat_x flat_y flat_z")
+
+
+def grid_indices(count_u, count_v):
+    """
+    Returns the (u, v) index of every point of a u-major point grid (the
+    order of rs.SurfacePoints).
+    """
+    return [(u, v) for u in range(count_u) for v in range(count_v)]
+
+
+def projected(points):
+    """
+    Flattened frame of the setting-out labels: the points projected to Z=0.
+    """
+    return [(p[0], p[1], 0.0) for p in points]
+
+
+class SheetWriter(IndexedFile.IndexedWriter):
+    """
+    Appends plates' points to a .cpts sheet; close() writes the index.
+    """
+
+    def __init__(self, path):
+        IndexedFile.IndexedWriter.__init__(self, path, MAGIC, VERSION, RECORD.size)
+
+    def add_plate(self, plate_id, points, indices, kind=CONTROL, flattened=None):
+        """
+        Writes one plate's points.
+
+        Args:
+            plate_id: Plate id (stored as text).
+            points: Project coordinates (x, y, z) per point.
+            indices: (u, v) index per point.
+            kind: CONTROL, GRID or EDGE.
+            flattened: Flattened-frame coordinates per point; defaults to the
+                points projected to Z=0.
+        """
+        if flattened is None:
+            flattened = projected(points)
+        data = b"".join(RECORD.pack(kind, uv[0], uv[1], p[0], p[1], p[2], f[0], f[1], f[2])
+                        for p, uv, f in zip(points, indices, flattened))
+        if not data:
+            return 0
+        return self.add_segment(plate_id, data)
+
+
+class CoordinateSheet(object):
+    """
+    Paged read access to a .cpts sheet.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        segments = IndexedFile.read_index(path, MAGIC, VERSION, "coordinate sheet")["segments"]
+        self.segments = collections.OrderedDict()
+        for plate_id, start, count in segments:
+            self.segments.setdefault(plate_id, []).append((start, count))
+
+    def plates(self):
+        """Returns (plate id, point count) for every plate, in writing order."""
+        return [(plate_id, sum(count for _, count in parts)) for plate_id, parts in self.segments.items()]
+
+    def count(self, plate_id):
+        return sum(count for _, count in self.segments.get(str(plate_id), ()))
+
+    def page_count(self, plate_id, page_size=PAGE_SIZE):
+        return (self.count(plate_id) + page_size - 1) // page_size
+
+    def page(self, plate_id, page=0, page_size=PAGE_SIZE):
+        """
+        Returns one page of a plate's points as SheetPoint rows.
+        """
+        first = page * page_size
+        last = first + page_size
+        rows = []
+        position = 0
+        with open(self.path, "rb") as handle:
+            for start, count in self.segments.get(str(plate_id), ()):
+                low = max(first, position) - position
+                high = min(last, position + count) - position
+                if high > low:
+                    data = IndexedFile.read_records(handle, RECORD.size, start + low, high - low)
+                    rows.extend(SheetPoint(*RECORD.unpack_from(data, k * RECORD.size)) for k in range(high - low))
+                position += count
+        return rows
+
+    def points(self, plate_id):
+        """Returns every point of a plate."""
+        return self.page(plate_id, 0, max(1, self.count(plate_id)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Look up plate points in a coordinate sheet.")
+    parser.add_argument("sheet", help=".cpts file")
+    parser.add_argument("--list", action="store_true", help="List the plates and their point counts")
+    parser.add_argument("--plate", help="Plate id to look up")
+    parser.add_argument("--page", type=int, default=0, help="Page of the plate's points")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help="Points per page")
+    args = parser.parse_args()
+
+    sheet = CoordinateSheet(args.sheet)
+    if args.list or args.plate is None:
+        for plate_id, count in sheet.plates():
+            print("{}\t{}".format(plate_id, count))
+        return
+    print("kind,u,v,x,y,z,flat_x,flat_y,flat_z")
+    for row in sheet.page(args.plate, args.page, args.page_size):
+        print("{},{},{},{:.4f},{:.4f},{:.4f},{:.4f},{:.4f},{:.4f}".format(*row))
+    print("# page {} of {}".format(args.page + 1, sheet.page_count(args.plate, args.page_size)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,35 @@
 import rhinoscriptsyntax as rs
 import Rhino
 
+try:
+    import PlateSplitter  # NumPy grid-binning splitter (CPython)
+except ImportError:
+    PlateSplitter = None
+
 #Ham Toi uu Mesh truoc khi cat
 
 
+# Ham cat Mesh thanh cac o luoi 3m trong mot lan (PlateSplitter, khong tao MP cat)
+# Tra ve danh sach (row, col, mesh), row/col = 0 tai Y/X nho nhat
+def cut_mesh_into_cells(mesh_id, size=3.0):
+    mesh_geo = rs.coercemesh(mesh_id)
+    if not mesh_geo:
+        print("Khong the chuyen Mesh thanh Geometry!")
+        return []
+    cells = PlateSplitter.split_mesh_into_plates(mesh_geo, size)
+    print("So tam: ", len(cells))
+    return cells
+
+
 # Ham cat Mesh thanh cac tam 3m
 def cut_mesh_into_plates(mesh_id):
     if not rs.IsMesh(mesh_id):
         print("Chon Mesh!")
         return
     
+    if PlateSplitter:
+        return [mesh for _, _, mesh in cut_mesh_into_cells(mesh_id)]
+    
     # Tinh tam Mesh va BoundingBox
     bbox = rs.BoundingBox(mesh_id)
     if not bbox:
@@ -74,6 +94,7 @@ def cut_mesh_into_plates(mesh_id):
     #rs.DeleteObject(mesh_id)
     #for fragment in mesh_fragments:
     #    rs.AddMesh(fragment.Vertices, fragment.Faces)
+    return mesh_fragments
     
 
 
@@ -1,5 +1,10 @@
 import rhinoscriptsyntax as rs
 
+try:
+    import StripMesher  # NumPy arc-length strip mesher (CPython)
+except ImportError:
+    StripMesher = None
+
 # Function to split a mesh into smaller meshes using curve division
 def split_mesh_by_curves(mesh_id, segment_length=3.0):
     # Step 1: Duplicate the border of the mesh to get curves
@@ -84,16 +89,36 @@ def split_mesh_by_curves(mesh_id, segment_length=3.0):
     print("Successfully created {} mesh segments!".format(len(meshes)))
     return meshes
 
+# Function to split several meshes at once on vertex/face arrays (StripMesher):
+# no border curves, polylines or planar meshes go through the document
+def split_meshes_by_curves(mesh_ids, segment_length=3.0):
+    if StripMesher is None:
+        return [split_mesh_by_curves(mesh_id, segment_length) for mesh_id in mesh_ids]
+    
+    meshes = [rs.coercemesh(mesh_id) for mesh_id in mesh_ids]
+    strips = StripMesher.split_rhino_meshes(meshes, segment_length)
+    
+    # One mesh per strip, named per source mesh as before
+    results = [[] for _ in mesh_ids]
+    for mesh_index, number, vertices, faces in strips:
+        mesh = rs.AddMesh(vertices, faces)
+        if mesh:
+            rs.ObjectName(mesh, "Mesh_Segment_{}".format(number + 1))
+            results[mesh_index].append(mesh)
+    
+    print("Successfully created {} mesh segments!".format(len(strips)))
+    return results
+
 # Main script
 if __name__ == "__main__":
-    # User selects the mesh
-    mesh_id = rs.GetObject("Select a mesh to split", rs.filter.mesh)
-    if not mesh_id:
+    # User selects the meshes
+    mesh_ids = rs.GetObjects("Select meshes to split", rs.filter.mesh)
+    if not mesh_ids:
         print("No mesh selected!")
         exit()
     
-    # Split the mesh into 3m segments based on curves
+    # Split the meshes into 3m segments based on curves
     segment_length = 3.0  # Length of each segment in meters
-    split_mesh_by_curves(mesh_id, segment_length)
+    split_meshes_by_curves(mesh_ids, segment_length)
     
     print("Completed!")
\ No newline at end of file
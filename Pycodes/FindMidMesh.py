@@ -1,6 +1,15 @@
 import Rhino
 import rhinoscriptsyntax as rs
 import scriptcontext as sc
+import RemeshCache
+try:
+    import MidSurface  # NumPy mid-surface on one shell's topology (CPython)
+except ImportError:
+    MidSurface = None
+try:
+    import ShellCorrespondence  # NumPy/SciPy shared parameter grid for both shells (CPython)
+except ImportError:
+    ShellCorrespondence = None
 
 #Quadremesh parameters
 def QuadRemesh_LOD(mesh_id,lod):
@@ -15,7 +24,7 @@ def QuadRemesh_LOD(mesh_id,lod):
     qr_params.DetectHardEdges=True
     #qr_params.SymmetryAxis = Rhino.Geometry.QuadRemeshSymmetryAxis.X | Rhino.Geometry.QuadRemeshSymmetryAxis.Y | Rhino.Geometry.QuadRemeshSymmetryAxis.Z
     
-    remeshed = Rhino.Geometry.Mesh.QuadRemesh(mesh,qr_params)
+    remeshed = RemeshCache.cached_quad_remesh(mesh,qr_params)
 
     return remeshed
 
@@ -38,19 +47,50 @@ def create_midpoint_mesh():
     face_count2 = rs.coercemesh(mesh2_id).Faces.Count
     target_face_count = int((face_count1 + face_count2) / 2)
     
-    # Apply QuadRemesh to both meshes to get similar topology
-    mesh1_quad = QuadRemesh_LOD(mesh1_id,target_face_count)
-    mesh2_quad = QuadRemesh_LOD(mesh2_id,target_face_count)
-    #mesh1_quad = rs.QuadRemesh(mesh1_id, target_face_count, adaptive_size=0)
-    #mesh2_quad = rs.QuadRemesh(mesh2_id, target_face_count, adaptive_size=0)
+    method = "QuadRemesh"
+    if MidSurface is not None:
+        options = ["Closest", "Grid"] if ShellCorrespondence is not None else ["Closest"]
+        method = rs.GetString("Mid-surface method", "Closest", options) or "Closest"
     
-    if not mesh1_quad or not mesh2_quad:
-        print("QuadRemesh failed")
-        return
+    if method == "Closest":
+        # Midpoint of every vertex of the remeshed first mesh and its closest
+        # point on the second mesh; only the first mesh is remeshed, so the
+        # vertex counts never have to match
+        mesh1_quad = QuadRemesh_LOD(mesh1_id,target_face_count)
+        if not mesh1_quad:
+            print("QuadRemesh failed")
+            return
+        new_mesh, thickness = MidSurface.mid_surface_mesh(rs.coercemesh(mesh1_quad), rs.coercemesh(mesh2_id))
+        print("Shell thickness min {:.4f}, mean {:.4f}, max {:.4f}".format(
+            min(thickness), sum(thickness) / len(thickness), max(thickness)))
+        sc.doc.Objects.AddMesh(new_mesh)
+        sc.doc.Views.Redraw()
+        print("New mesh created from midpoints successfully")
+        return thickness
     
-    # Convert to Rhino mesh objects
-    mesh1 = rs.coercemesh(mesh1_quad)
-    mesh2 = rs.coercemesh(mesh2_quad)
+    if method == "Grid":
+        # Both shells flattened onto one parameter square and resampled on the
+        # same grid: vertex i of both is the same (u, v), no QuadRemesh needed
+        try:
+            mesh1, mesh2 = ShellCorrespondence.resample_rhino_pair(rs.coercemesh(mesh1_id), rs.coercemesh(mesh2_id),
+                                                                   target_face_count)
+        except ValueError as error:
+            print("Grid correspondence failed: {}".format(error))
+            return
+    else:
+        # Apply QuadRemesh to both meshes to get similar topology
+        mesh1_quad = QuadRemesh_LOD(mesh1_id,target_face_count)
+        mesh2_quad = QuadRemesh_LOD(mesh2_id,target_face_count)
+        #mesh1_quad = rs.QuadRemesh(mesh1_id, target_face_count, adaptive_size=0)
+        #mesh2_quad = rs.QuadRemesh(mesh2_id, target_face_count, adaptive_size=0)
+        
+        if not mesh1_quad or not mesh2_quad:
+            print("QuadRemesh failed")
+            return
+        
+        # Convert to Rhino mesh objects
+        mesh1 = rs.coercemesh(mesh1_quad)
+        mesh2 = rs.coercemesh(mesh2_quad)
     
     # Verify vertex counts match after QuadRemesh
     if mesh1.Vertices.Count != mesh2.Vertices.Count:
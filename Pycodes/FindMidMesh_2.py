@@ -1,5 +1,6 @@
 import rhinoscriptsyntax as rs
 import Rhino.Geometry as rg
+import RemeshCache
 
 class MeshProjection:
     def __init__(self, mesh1_id, mesh2_id, lod=50):
@@ -20,7 +21,7 @@ class MeshProjection:
         qr_params.TargetQuadCount = self.lod
         qr_params.AdaptiveSize = 50
         qr_params.DetectHardEdges = True
-        quadremeshed_mesh = rg.Mesh.QuadRemesh(mesh1, qr_params)
+        quadremeshed_mesh = RemeshCache.cached_quad_remesh(mesh1, qr_params)
         return quadremeshed_mesh
 
     def project_points_to_mesh2(self, quadremeshed_mesh):
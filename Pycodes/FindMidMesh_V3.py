@@ -1,5 +1,16 @@
 import rhinoscriptsyntax as rs
 import Rhino.Geometry as rg
+import scriptcontext as sc
+import RemeshCache
+try:
+    import MeshBVH  # NumPy closest-point hierarchy (CPython)
+except ImportError:
+    MeshBVH = None
+try:
+    import ThicknessField  # NumPy/SciPy thickness statistics and regions (CPython)
+except ImportError:
+    ThicknessField = None
+import ScalarField
 
 class MeshProjection:
     def __init__(self, mesh1_id, mesh2_id, lod=50):
@@ -20,7 +31,7 @@ class MeshProjection:
         qr_params.TargetQuadCount = self.lod
         qr_params.AdaptiveSize = 50
         qr_params.DetectHardEdges = True
-        quadremeshed_mesh = rg.Mesh.QuadRemesh(mesh1, qr_params)
+        quadremeshed_mesh = RemeshCache.cached_quad_remesh(mesh1, qr_params)
         return quadremeshed_mesh
 
     def project_points_to_mesh2(self, quadremeshed_mesh):
@@ -31,6 +42,15 @@ class MeshProjection:
         projected_points = []
         projection_lines = []
 
+        if MeshBVH is not None:
+            # One batched query for every vertex instead of a ClosestPoint call each
+            closest = MeshBVH.closest_points_on_rhino_mesh(mesh2, quadremeshed_mesh)
+            for vertex, point in zip(quadremeshed_mesh.Vertices, closest.points.tolist()):
+                projected_point = rg.Point3d(*point)
+                projected_points.append(projected_point)
+                projection_lines.append(rg.Line(rg.Point3d(vertex), projected_point))
+            return projected_points, projection_lines
+
         for vertex in quadremeshed_mesh.Vertices:
             ray = rg.Line(vertex, mesh2.ClosestPoint(vertex))
             projected_point = mesh2.ClosestPoint(vertex)
@@ -52,10 +72,9 @@ class MeshProjection:
 
         min_length = min(line.Length for line in projection_lines) if projection_lines else 0
         for line in projection_lines:
-            if line.Length == min_length:
-                rs.AddLine(line.From, line.To)  # Add shortest lines to the layer
-            else:
-                rs.AddLine(line.From, line.To)
+            line_id = rs.AddLine(line.From, line.To)
+            if line_id and line.Length == min_length:
+                rs.ObjectLayer(line_id, layer_name)  # Add shortest lines to the layer
 
         rs.EnableRedraw(True)  # Re-enable redraw
 
@@ -66,23 +85,54 @@ class MeshProjection:
         for point in projected_points:
             rs.AddPoint(point)
 
-    def create_midpoint_mesh(self, projection_lines):
+    def create_midpoint_mesh(self, projection_lines, quadremeshed_mesh):
         """
-        Creates a mesh from the midpoints of the projection lines.
+        Creates the mid-surface mesh from the midpoints of the projection lines.
+
+        The lines run from the quadremeshed mesh's vertices in order, so the
+        midpoints reuse its faces and keep its topology. Returns the mesh id
+        and the shell thickness (projection line length) per vertex.
         """
         midpoints = [line.PointAt(0.5) for line in projection_lines]
         if len(midpoints) < 3:
-            return  # Need at least 3 points to create a mesh
+            return None, []  # Need at least 3 points to create a mesh
 
         mesh = rg.Mesh()
         for point in midpoints:
             mesh.Vertices.Add(point)
+        mesh.Faces.AddFaces(quadremeshed_mesh.Faces)
+        mesh.Normals.ComputeNormals()
 
-        # Basic triangulation (can be improved with more sophisticated algorithms)
-        for i in range(len(midpoints) - 2):
-            mesh.Faces.AddFace(0, i + 1, i + 2)
+        thickness = [line.Length for line in projection_lines]
+        print("Shell thickness min {:.4f}, mean {:.4f}, max {:.4f}".format(
+            min(thickness), sum(thickness) / len(thickness), max(thickness)))
+        return sc.doc.Objects.AddMesh(mesh), thickness
 
-        rs.AddMesh(mesh)
+    def report_thickness(self, mesh_id, thickness):
+        """
+        Reports the thickness field and colours the mid-surface mesh with it,
+        instead of adding a line per vertex. The regions are located on the
+        mid-surface mesh itself, so their centres lie on the coloured surface.
+        The values can also be saved as a .vfield file for later colouring
+        (ScalarField.apply_vertex_colours).
+        """
+        median = sorted(thickness)[len(thickness) // 2]
+        design = rs.GetReal("Design thickness", round(median, 3))
+        tolerance = rs.GetReal("Thickness tolerance", 0.01, 0.0) if design is not None else None
+        low, high = (design - tolerance, design + tolerance) if tolerance is not None else (None, None)
+
+        report = ThicknessField.panel_report_mesh(str(mesh_id), rs.coercemesh(mesh_id), thickness, low, high)
+        print(ThicknessField.format_report(report))
+        for region in report.regions:
+            print("  {} region: {} vertices, worst {:.4f} near ({:.2f}, {:.2f}, {:.2f})".format(
+                region.kind, region.vertices, region.worst, *region.center))
+
+        rs.MeshVertexColors(mesh_id, ScalarField.colours(thickness, low, high))
+        path = rs.SaveFileName("Save thickness field", "Scalar field (*.vfield)|*.vfield||")
+        if path:
+            with ScalarField.FieldWriter(path, "thickness", low, high) as writer:
+                writer.add(mesh_id, thickness)
+        return report
 
     def run(self):
         """
@@ -90,9 +140,12 @@ class MeshProjection:
         """
         quadremeshed_mesh = self.quadremesh_mesh1()
         projected_points, projection_lines = self.project_points_to_mesh2(quadremeshed_mesh)
-        self.draw_projection_lines(projection_lines)
-        self.create_projected_points(projected_points)
-        self.create_midpoint_mesh(projection_lines)
+        if ThicknessField is None:
+            self.draw_projection_lines(projection_lines)
+            self.create_projected_points(projected_points)
+        mesh_id, thickness = self.create_midpoint_mesh(projection_lines, quadremeshed_mesh)
+        if ThicknessField is not None and mesh_id:
+            self.report_thickness(mesh_id, thickness)
 
 # Get user input for mesh IDs
 mesh1_id = rs.GetObject("Select Mesh 1", 32)
@@ -0,0 +1,288 @@
+"""
+Multi-panel batch mode for the Body_Formwork_3 pipeline.
+
+Runs the MeshProcessor stages (origin detection, alignment, remesh, prop
+table and 3mm solid) on vertex/face arrays for every OBJ/STL panel in a zone,
+fanned out over a process pool. Each panel gets a result bundle folder and
+the zone gets a summary table:
+
+    python FormworkBatch.py panels/ -o results/ --lod -50 --workers 8
+
+The remesh stage is the structured grid (GridRemesh, negative LOD, the
+default). Rhino's QuadRemesh is not available outside Rhino, so a positive
+LOD, or a panel the grid cannot resample, keeps the input tessellation; the
+bundles and the zone summary record which ("remesh": "grid" or "none").
+
+Workers read their own panel file and return a small summary, so the run
+scales with the number of cores. With --congruent, panels are first grouped
+into congruent types (CongruentPanels); only one panel per type runs the
+stages, and its bundle is mapped onto the other members through their
+registration transforms. Requires CPython 3 with NumPy.
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import CongruentPanels
+import GridRemesh
+import MeshArrays
+import PlaneAlign
+import PropLayout
+import PropTable
+
+PANEL_EXTENSIONS = (".obj", ".stl")
+CLEARANCE = 0.2         # Aligned mesh sits 200mm above the working plane
+THICKNESS = 0.003       # 3mm solid
+LOD = -50               # Structured grid remesh (GridRemesh)
+SUMMARY_FIELDS = ["panel_id", "panel", "type", "remesh", "vertices", "faces", "props", "origin_x", "origin_y",
+                  "origin_z", "plane_z", "min_height", "max_height", "seconds"]
+
+
+def panel_paths(sources):
+    """
+    Returns the sorted panel files from a directory, a file or a list of both.
+    """
+    if isinstance(sources, str):
+        sources = [sources]
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            paths.extend(os.path.join(source, name) for name in os.listdir(source)
+                         if name.lower().endswith(PANEL_EXTENSIONS))
+        else:
+            paths.append(source)
+    return sorted(paths)
+
+
+def detect_origin(vertices):
+    """
+    Returns the panel origin: the vertex with the smallest X + Z
+    (MeshProcessor.calculate_new_origin).
+    """
+    return vertices[np.argmin(vertices[:, 0] + vertices[:, 2])]
+
+
+def remesh_panel(vertices, faces, lod):
+    """
+    Remesh stage. A negative LOD resamples four-sided panels into a
+    structured grid (GridRemesh); Rhino's QuadRemesh is not available
+    outside Rhino, so otherwise the input topology is kept.
+
+    Returns:
+        tuple: (vertices, faces, remesh), remesh being "grid" or "none".
+    """
+    if GridRemesh.is_grid_lod(lod):
+        try:
+            return GridRemesh.grid_remesh(vertices, faces, lod) + ("grid",)
+        except ValueError as error:
+            print("{}, keeping the input mesh".format(error))
+    return vertices, faces, "none"
+
+
+def bundle_folder(out_dir, path):
+    """Returns the result bundle folder of a panel file."""
+    return os.path.join(out_dir, os.path.splitext(os.path.basename(path))[0])
+
+
+def write_bundle(path, out_dir, panel_id, type_id, origin, plane_z, remesh, remeshed, remeshed_faces, solid,
+                 solid_faces, table, xform, inverse, start):
+    """
+    Writes a panel's result bundle.
+
+    Returns:
+        dict: The panel's zone summary row.
+    """
+    bundle = bundle_folder(out_dir, path)
+    if not os.path.isdir(bundle):
+        os.makedirs(bundle)
+    MeshArrays.write_obj(os.path.join(bundle, "remeshed.obj"), remeshed, remeshed_faces)
+    MeshArrays.write_obj(os.path.join(bundle, "solid.obj"), solid, solid_faces)
+    PropTable.export_prop_table(table, os.path.join(bundle, "props.csv"))
+    np.savez(os.path.join(bundle, "instances.npz"), **PropTable.instance_transforms(table, plane_z))
+
+    summary = {
+        "panel_id": panel_id,
+        "panel": os.path.basename(bundle),
+        "type": panel_id if type_id is None else type_id,
+        "remesh": remesh,
+        "vertices": len(remeshed),
+        "faces": len(remeshed_faces),
+        "props": len(table),
+        "origin_x": float(origin[0]),
+        "origin_y": float(origin[1]),
+        "origin_z": float(origin[2]),
+        "plane_z": float(plane_z),
+        "min_height": float(table["height"].min()) if len(table) else 0.0,
+        "max_height": float(table["height"].max()) if len(table) else 0.0,
+        "seconds": time.time() - start,
+    }
+    with open(os.path.join(bundle, "panel.json"), "w") as handle:
+        json.dump(dict(summary, source=path, transform=xform.tolist(), inverse=inverse.tolist()), handle, indent=2)
+    return summary
+
+
+def process_panel(path, out_dir, panel_id=0, lod=LOD, max_spacing=None, type_id=None):
+    """
+    Runs every stage for one panel and writes its result bundle.
+
+    Bundle (out_dir/<panel name>/): remeshed.obj, solid.obj, props.csv,
+    props.npy, instances.npz (prop block transforms, see
+    PropTable.instance_transforms) and panel.json. With max_spacing, props come from the
+    PropLayout optimizer instead of one per vertex.
+
+    Returns:
+        dict: The panel's zone summary row.
+    """
+    start = time.time()
+    vertices, faces = MeshArrays.read_mesh(path)
+    origin = detect_origin(vertices)
+    plane_z = origin[2]
+    aligned, xform, inverse = PlaneAlign.align(vertices, origin, plane_z + CLEARANCE, faces)
+    remeshed, remeshed_faces, remesh = remesh_panel(aligned, faces, lod)
+    if max_spacing:
+        table = PropLayout.layout_panel(remeshed, remeshed_faces, plane_z, origin, panel_id, max_spacing)
+    else:
+        table = PropTable.build_prop_table(remeshed, plane_z, origin, panel_id)
+    solid, solid_faces = MeshArrays.solidify(remeshed, remeshed_faces, THICKNESS)
+    return write_bundle(path, out_dir, panel_id, type_id, origin, plane_z, remesh, remeshed, remeshed_faces, solid,
+                        solid_faces, table, xform, inverse, start)
+
+
+def map_panel(path, out_dir, panel_id, reference, registration, type_id):
+    """
+    Writes a panel's bundle by mapping the bundle of a congruent panel onto
+    it, instead of running the stages again.
+
+    Args:
+        reference: Bundle folder of the type's representative.
+        registration: 4x4 transform from the representative onto this panel
+            (project coordinates).
+
+    Returns:
+        dict: The panel's zone summary row.
+    """
+    start = time.time()
+    vertices, faces = MeshArrays.read_mesh(path)
+    origin = detect_origin(vertices)
+    plane_z = origin[2]
+    xform, inverse, _ = PlaneAlign.alignment_transform(vertices, origin, plane_z + CLEARANCE, faces)
+    with open(os.path.join(reference, "panel.json")) as handle:
+        reference_bundle = json.load(handle)
+    reference_inverse = np.array(reference_bundle["inverse"])
+
+    # Representative aligned -> project -> this panel -> this panel aligned
+    mapping = xform @ np.asarray(registration) @ reference_inverse
+    remeshed, remeshed_faces = MeshArrays.read_obj(os.path.join(reference, "remeshed.obj"))
+    solid, solid_faces = MeshArrays.read_obj(os.path.join(reference, "solid.obj"))
+    reference_table = PropTable.load_table(os.path.join(reference, "props.npy"))
+    tops = np.column_stack([reference_table["x"], reference_table["y"], reference_table["z"]])
+    table = PropTable.build_prop_table(MeshArrays.transform_points(tops, mapping), plane_z, origin, panel_id)
+    return write_bundle(path, out_dir, panel_id, type_id, origin, plane_z, reference_bundle["remesh"],
+                        MeshArrays.transform_points(remeshed, mapping), remeshed_faces,
+                        MeshArrays.transform_points(solid, mapping), solid_faces, table, xform, inverse, start)
+
+
+def _process(job):
+    return process_panel(*job)
+
+
+def _map(job):
+    return map_panel(*job)
+
+
+def _run(function, jobs, workers):
+    if workers == 1:
+        return [function(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(function, jobs, chunksize=1))
+
+
+def write_zone_summary(summaries, out_dir):
+    """
+    Writes zone_summary.csv and zone_summary.json.
+    """
+    with open(os.path.join(out_dir, "zone_summary.csv"), "w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(summaries)
+    totals = {
+        "panels": len(summaries),
+        "props": sum(s["props"] for s in summaries),
+        "types": len(set(s["type"] for s in summaries)),
+        "remesh": {method: sum(s["remesh"] == method for s in summaries) for method in ("grid", "none")},
+        "max_height": max([s["max_height"] for s in summaries] or [0.0]),
+        "panel_seconds": sum(s["seconds"] for s in summaries),
+    }
+    with open(os.path.join(out_dir, "zone_summary.json"), "w") as handle:
+        json.dump({"zone": totals, "panels": summaries}, handle, indent=2)
+    return totals
+
+
+def run_batch(sources, out_dir, lod=LOD, workers=None, max_spacing=None, congruent=None):
+    """
+    Processes every panel of a zone across a process pool.
+
+    Args:
+        sources: A directory, a panel file or a list of either.
+        out_dir: Folder for the panel bundles and the zone summary.
+        lod: Remesh level of detail (as MeshProcessor's LOD target);
+            negative for the structured grid, otherwise the input
+            tessellation is kept.
+        workers: Worker processes; None uses every core, 1 runs in-process.
+        max_spacing: Optimize the prop layout for this max prop spacing.
+        congruent: Run the stages once per type of panels congruent within
+            this tolerance and map the result onto the other members.
+
+    Returns:
+        list: The zone summary rows in panel order.
+    """
+    paths = panel_paths(sources)
+    if not paths:
+        print("No OBJ/STL panels found!")
+        return []
+    if not os.path.isdir(out_dir):
+        os.makedirs(out_dir)
+    if not GridRemesh.is_grid_lod(lod):
+        print("LOD {} is not a grid LOD: QuadRemesh needs Rhino, so panels keep their input mesh".format(lod))
+
+    start = time.time()
+    if congruent is None:
+        jobs = [(path, out_dir, panel_id, lod, max_spacing) for panel_id, path in enumerate(paths)]
+        summaries = _run(_process, jobs, workers)
+    else:
+        types = CongruentPanels.group_panels((MeshArrays.read_mesh(path) for path in paths), congruent)
+        print("{} panels in {} congruent types".format(len(paths), len(types)))
+        jobs = [(paths[t.representative], out_dir, t.representative, lod, max_spacing, t.type_id) for t in types]
+        summaries = _run(_process, jobs, workers)
+        jobs = [(paths[panel_id], out_dir, panel_id, bundle_folder(out_dir, paths[t.representative]), xform,
+                 t.type_id) for t in types for panel_id, xform in t.members if panel_id != t.representative]
+        summaries = sorted(summaries + _run(_map, jobs, workers), key=lambda summary: summary["panel_id"])
+    totals = write_zone_summary(summaries, out_dir)
+    elapsed = time.time() - start
+    print("{} panels, {} props in {:.2f}s ({:.1f} panels/s)".format(
+        totals["panels"], totals["props"], elapsed, totals["panels"] / elapsed if elapsed else 0.0))
+    return summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch formwork pipeline for a zone of panels.")
+    parser.add_argument("sources", nargs="+", help="Panel OBJ/STL files or directories")
+    parser.add_argument("-o", "--out", default="formwork_results", help="Output folder")
+    parser.add_argument("--lod", type=int, default=LOD,
+                        help="LOD target (negative: structured grid; positive keeps the input mesh)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--max-spacing", type=float, default=None,
+                        help="Optimize the prop layout for this max spacing (m)")
+    parser.add_argument("--congruent", type=float, default=None,
+                        help="Process congruent panels (within this tolerance, m) once per type")
+    args = parser.parse_args()
+    run_batch(args.sources, args.out, args.lod, args.workers, args.max_spacing, args.congruent)
+
+
+if __name__ == "__main__":
+    main()
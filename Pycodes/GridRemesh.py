@@ -0,0 +1,195 @@
+"""
+Structured-grid remesher for near-rectangular shell panels.
+
+Most panels from DinhViTam.cut_mesh_into_plates are four-sided ~3m x 3m
+patches. For those, this remesher is used instead of QuadRemesh:
+
+1. Find the four corners on the naked-edge loop.
+2. Resample the four sides by arc length.
+3. Fill an N x M Coons patch between the sides.
+4. Project the interior grid points back onto the panel along its normal.
+
+The result is deterministic: a panel with the same LOD always gets the same
+vertex count. Select this mode by passing a negative LOD: -50 means a
+structured grid of about 50 quads.
+
+Requires CPython 3 with NumPy.
+"""
+import numpy as np
+
+import MeshArrays
+import MeshConvert
+
+
+def is_grid_lod(lod):
+    """
+    Returns True if lod selects the structured grid (negative LOD).
+    """
+    return lod is not None and lod < 0
+
+
+def find_corners(vertices, faces):
+    """
+    Returns the four corners of a four-sided panel as positions along its
+    naked-edge loop.
+
+    Returns:
+        tuple: (loop vertex indices, sorted positions of the 4 corners).
+
+    Raises:
+        ValueError: The mesh has no naked-edge loop, or the loop is too short.
+    """
+    loops = MeshArrays.boundary_loops(faces)
+    if not loops:
+        raise ValueError("Mesh has no naked edges")
+    loop = np.array(max(loops, key=len))
+    if len(loop) < 4:
+        raise ValueError("Naked-edge loop has fewer than 4 vertices")
+
+    # Turning angle at each loop vertex, measured over a few neighbours so
+    # that small kinks along a side do not count as corners
+    points = vertices[loop]
+    step = max(1, len(loop) // 40)
+    before = MeshArrays.unitize(points - np.roll(points, step, axis=0))
+    after = MeshArrays.unitize(np.roll(points, -step, axis=0) - points)
+    turning = np.arccos(np.clip(np.einsum("ij,ij->i", before, after), -1.0, 1.0))
+
+    spacing = max(1, len(loop) // 8)
+    corners = []
+    for position in np.argsort(-turning):
+        gaps = [min(abs(position - c), len(loop) - abs(position - c)) for c in corners]
+        if all(gap >= spacing for gap in gaps):
+            corners.append(int(position))
+            if len(corners) == 4:
+                break
+    if len(corners) < 4:
+        raise ValueError("Could not find four corners on the naked edges")
+    return loop, sorted(corners)
+
+
+def panel_sides(vertices, faces):
+    """
+    Splits the naked-edge loop into the four sides of the panel.
+
+    The first corner is the one with the smallest X + Z (the MeshProcessor
+    origin).
+
+    Returns:
+        tuple: (bottom c0->c1, right c1->c2, top c3->c2, left c0->c3) as
+            point arrays.
+    """
+    loop, corners = find_corners(vertices, faces)
+    first = min(range(4), key=lambda k: vertices[loop[corners[k]], 0] + vertices[loop[corners[k]], 2])
+    corners = corners[first:] + corners[:first]
+    loop = np.roll(loop, -corners[0])
+    corners = [(c - corners[0]) % len(loop) for c in corners] + [len(loop)]
+    closed = np.append(loop, loop[0])
+    sides = [vertices[closed[corners[k]:corners[k + 1] + 1]] for k in range(4)]
+    return sides[0], sides[1], sides[2][::-1], sides[3][::-1]
+
+
+def resample(polyline, count):
+    """
+    Returns count + 1 points spaced evenly by arc length along a polyline.
+    """
+    lengths = np.linalg.norm(np.diff(polyline, axis=0), axis=1)
+    distance = np.concatenate([[0.0], np.cumsum(lengths)])
+    targets = np.linspace(0.0, distance[-1], count + 1)
+    return np.column_stack([np.interp(targets, distance, polyline[:, k]) for k in range(3)])
+
+
+def polyline_length(polyline):
+    return float(np.linalg.norm(np.diff(polyline, axis=0), axis=1).sum())
+
+
+def grid_size(lod, length_u, length_v):
+    """
+    Returns (N, M) quads along the two side directions: about lod quads in
+    total, as square as the side lengths allow.
+    """
+    lod = max(1, abs(int(lod)))
+    n = max(1, int(round(np.sqrt(lod * length_u / max(length_v, 1e-12)))))
+    m = max(1, int(round(lod / float(n))))
+    return n, m
+
+
+def coons_patch(bottom, right, top, left):
+    """
+    Bilinearly blended Coons patch through four resampled sides.
+
+    Args:
+        bottom, top: (N + 1, 3) points, running c0->c1 and c3->c2.
+        left, right: (M + 1, 3) points, running c0->c3 and c1->c2.
+
+    Returns:
+        np.ndarray: (N + 1, M + 1, 3) grid points.
+    """
+    u = np.linspace(0.0, 1.0, len(bottom))[:, None, None]
+    v = np.linspace(0.0, 1.0, len(left))[None, :, None]
+    c0, c1, c2, c3 = bottom[0], bottom[-1], top[-1], top[0]
+    ruled = (1 - v) * bottom[:, None] + v * top[:, None] + (1 - u) * left[None, :] + u * right[None, :]
+    corners = (1 - u) * (1 - v) * c0 + u * (1 - v) * c1 + u * v * c2 + (1 - u) * v * c3
+    return ruled - corners
+
+
+def grid_faces(n, m):
+    """
+    Returns the (n * m, 4) quad faces of an (n + 1) x (m + 1) vertex grid.
+    """
+    a = (np.arange(n)[:, None] * (m + 1) + np.arange(m)[None, :]).ravel()
+    return np.column_stack([a, a + m + 1, a + m + 2, a + 1])
+
+
+def grid_remesh(vertices, faces, lod=50):
+    """
+    Resamples a four-sided panel into a structured quad grid.
+
+    Args:
+        vertices: (n, 3) panel vertices.
+        faces: (m, 4) panel faces.
+        lod: Target quad count (the sign is ignored).
+
+    Returns:
+        tuple: ((N + 1) * (M + 1), 3) vertices and (N * M, 4) faces, grid
+            row-major from the origin corner, facing the same way as the panel.
+
+    Raises:
+        ValueError: The panel is not four-sided.
+    """
+    vertices = MeshArrays.as_vertices(vertices)
+    faces = MeshArrays.as_faces(faces)
+    bottom, right, top, left = panel_sides(vertices, faces)
+    n, m = grid_size(lod, 0.5 * (polyline_length(bottom) + polyline_length(top)),
+                     0.5 * (polyline_length(left) + polyline_length(right)))
+    grid = coons_patch(resample(bottom, n), resample(right, m), resample(top, n), resample(left, m))
+
+    # Project the interior along the panel normal; points that miss (folds,
+    # notches) fall back to the closest point
+    source_normal = MeshArrays.face_normals(vertices, faces).sum(axis=0)
+    interior = grid[1:-1, 1:-1].reshape(-1, 3)
+    if len(interior):
+        projected, hit = MeshArrays.intersect_lines(vertices, faces, interior, source_normal)
+        if not hit.all():
+            projected[~hit], _, _, _ = MeshArrays.closest_points(vertices, faces, interior[~hit])
+        grid[1:-1, 1:-1] = projected.reshape(n - 1, m - 1, 3)
+
+    grid = grid.reshape(-1, 3)
+    quads = grid_faces(n, m)
+    if np.dot(MeshArrays.face_normals(grid, quads).sum(axis=0), source_normal) < 0:
+        quads = quads[:, [0, 3, 2, 1]]
+    return grid, quads
+
+
+def grid_remesh_mesh(mesh, lod=50):
+    """
+    grid_remesh for a Rhino.Geometry.Mesh.
+
+    Returns:
+        Rhino.Geometry.Mesh: The structured grid mesh.
+
+    Raises:
+        ValueError: The panel is not four-sided.
+    """
+    vertices, faces = MeshConvert.mesh_arrays(mesh)
+    grid, quads = grid_remesh(vertices, faces, lod)
+    return MeshConvert.rhino_mesh(grid.ravel().tolist(), quads.ravel().tolist())
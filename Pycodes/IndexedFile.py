@@ -0,0 +1,91 @@
+"""
+Indexed record files: the container shared by coordinate sheets (.cpts) and
+scalar fields (.vfield).
+
+- a 16-byte header (magic, version, index offset);
+- fixed-size records, segment after segment;
+- a JSON index of (segment id, record offset, record count) segments plus
+  any format-specific fields, written on close().
+
+Each format only defines its magic, version and record layout. A reader
+loads the index and then reaches a segment with a single seek.
+
+Standard library only, so it runs in any Rhino Python.
+"""
+import json
+import struct
+
+HEADER = struct.Struct("<4sHHQ")
+
+
+class IndexedWriter(object):
+    """
+    Appends segments of records to an indexed file; close() writes the index
+    and its offset in the header.
+    """
+
+    def __init__(self, path, magic, version, record_size, **fields):
+        """
+        Args:
+            path: File to write.
+            magic, version: Format tag and version stored in the header.
+            record_size: Bytes per record.
+            fields: Extra entries of the JSON index.
+        """
+        self.path = path
+        self.magic = magic
+        self.version = version
+        self.record_size = record_size
+        self.fields = fields
+        self.handle = open(path, "wb")
+        self.handle.write(HEADER.pack(magic, version, 0, 0))
+        self.segments = []
+        self.records = 0
+
+    def add_segment(self, segment_id, data):
+        """Writes one segment's packed records; returns the record count."""
+        count = len(data) // self.record_size
+        self.handle.write(data)
+        self.segments.append([str(segment_id), self.records, count])
+        self.records += count
+        return count
+
+    def close(self):
+        if self.handle is None:
+            return
+        index_offset = HEADER.size + self.records * self.record_size
+        self.handle.write(json.dumps(dict(self.fields, segments=self.segments)).encode("utf-8"))
+        self.handle.seek(0)
+        self.handle.write(HEADER.pack(self.magic, self.version, 0, index_offset))
+        self.handle.close()
+        self.handle = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_index(path, magic, version, kind):
+    """
+    Returns the JSON index of an indexed file ({"segments": [...], ...}).
+
+    Raises:
+        ValueError: The file is not a kind file (magic) or is newer than
+            version.
+    """
+    with open(path, "rb") as handle:
+        found, found_version, _, index_offset = HEADER.unpack(handle.read(HEADER.size))
+        if found != magic:
+            raise ValueError("Not a {}: {}".format(kind, path))
+        if found_version > version:
+            raise ValueError("Unsupported {} version {}".format(kind, found_version))
+        handle.seek(index_offset)
+        return json.loads(handle.read().decode("utf-8"))
+
+
+def read_records(handle, record_size, start, count):
+    """Reads count records from record offset start of an open file."""
+    handle.seek(HEADER.size + start * record_size)
+    return handle.read(count * record_size)
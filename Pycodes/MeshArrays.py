@@ -0,0 +1,529 @@
+"""
+Mesh kernels on plain vertex/face arrays.
+
+Vertices are (n, 3) float arrays. Faces follow the Rhino convention: (m, 4)
+int arrays where a triangle repeats its third index (C == D). These helpers
+back the headless engines and the Rhino stand-in in ./headless.
+
+Requires CPython 3 with NumPy.
+"""
+import numpy as np
+
+
+def as_vertices(vertices):
+    """
+    Returns vertices (Point3d list, tuples or an array) as an (n, 3) float array.
+    """
+    if isinstance(vertices, np.ndarray):
+        return vertices.reshape(-1, 3).astype(float)
+    return np.array([(v[0], v[1], v[2]) for v in vertices], dtype=float).reshape(-1, 3)
+
+
+def as_faces(faces):
+    """
+    Returns faces as an (m, 4) int array; 3-column triangles get D = C.
+    """
+    faces = np.asarray(faces, dtype=np.int64)
+    if faces.size == 0:
+        return np.empty((0, 4), dtype=np.int64)
+    if faces.ndim == 1:
+        faces = faces.reshape(1, -1)
+    if faces.shape[1] == 3:
+        faces = np.column_stack([faces, faces[:, 2]])
+    return faces
+
+
+def is_quad(faces):
+    """
+    Returns a boolean mask of the quad faces.
+    """
+    return faces[:, 2] != faces[:, 3]
+
+
+def triangles(faces):
+    """
+    Splits quads along the A-C diagonal.
+
+    Returns:
+        tuple: ((k, 3) triangle array, (k,) index of the source face).
+    """
+    quads = np.nonzero(is_quad(faces))[0]
+    first = faces[:, :3]
+    second = faces[quads][:, [0, 2, 3]]
+    tris = np.concatenate([first, second])
+    source = np.concatenate([np.arange(len(faces)), quads])
+    return tris, source
+
+
+def face_normals(vertices, faces):
+    """
+    Returns area-weighted face normals (cross product of the diagonals).
+    """
+    a, b, c, d = (vertices[faces[:, k]] for k in range(4))
+    return 0.5 * np.cross(c - a, d - b)
+
+
+def face_areas(vertices, faces):
+    """
+    Returns the area of every face.
+    """
+    return np.linalg.norm(face_normals(vertices, faces), axis=1)
+
+
+def face_centers(vertices, faces):
+    """
+    Returns the centroid of every face (triangles average their 3 corners).
+    """
+    quad = is_quad(faces)
+    total = vertices[faces[:, 0]] + vertices[faces[:, 1]] + vertices[faces[:, 2]]
+    total = total + np.where(quad[:, None], vertices[faces[:, 3]], 0.0)
+    return total / np.where(quad, 4.0, 3.0)[:, None]
+
+
+def unitize(vectors):
+    """
+    Returns the vectors scaled to unit length (zero vectors stay zero).
+    """
+    length = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, length, out=np.zeros_like(vectors), where=length > 0)
+
+
+def vertex_normals(vertices, faces):
+    """
+    Returns unit vertex normals averaged from the adjacent face normals.
+    """
+    normals = np.zeros_like(vertices)
+    fn = face_normals(vertices, faces)
+    for k in range(4):
+        corner = faces[:, k]
+        if k == 3:
+            keep = is_quad(faces)
+            np.add.at(normals, corner[keep], fn[keep])
+        else:
+            np.add.at(normals, corner, fn)
+    return unitize(normals)
+
+
+def bounding_box(vertices):
+    """
+    Returns (min corner, max corner) of the vertices.
+    """
+    return vertices.min(axis=0), vertices.max(axis=0)
+
+
+def compact(vertices, faces):
+    """
+    Removes vertices no face refers to and renumbers the faces.
+    """
+    used = np.unique(faces)
+    remap = np.full(len(vertices), -1, dtype=np.int64)
+    remap[used] = np.arange(len(used))
+    return vertices[used], remap[faces]
+
+
+def offset(vertices, faces, distance):
+    """
+    Returns the vertices moved by distance along their vertex normals.
+    """
+    return vertices + distance * vertex_normals(vertices, faces)
+
+
+def solidify(vertices, faces, distance):
+    """
+    Returns a closed shell: the offset surface, the reversed original and
+    side walls along every naked edge loop.
+    """
+    count = len(vertices)
+    top = offset(vertices, faces, distance)
+    bottom = faces[:, [0, 3, 2, 1]]
+    tri = ~is_quad(faces)
+    bottom[tri] = faces[tri][:, [0, 2, 1, 1]]
+    walls = []
+    for loop in boundary_loops(faces):
+        for k, i in enumerate(loop):
+            j = loop[(k + 1) % len(loop)]
+            walls.append((i, j, j + count, i + count))
+    walls = np.array(walls, dtype=np.int64).reshape(-1, 4)
+    return np.vstack([vertices, top]), np.concatenate([faces + count, bottom, walls])
+
+
+def rotation_between(v0, v1):
+    """
+    Returns the 3x3 rotation taking direction v0 onto direction v1.
+    """
+    v0 = np.asarray(v0, dtype=float) / np.linalg.norm(v0)
+    v1 = np.asarray(v1, dtype=float) / np.linalg.norm(v1)
+    axis = np.cross(v0, v1)
+    sin = np.linalg.norm(axis)
+    cos = float(np.dot(v0, v1))
+    if sin < 1e-12:
+        if cos > 0:
+            return np.eye(3)
+        axis = np.cross(v0, np.eye(3)[np.argmin(np.abs(v0))])
+        axis = axis / np.linalg.norm(axis)
+        return 2.0 * np.outer(axis, axis) - np.eye(3)
+    k = np.array([[0, -axis[2], axis[1]], [axis[2], 0, -axis[0]], [-axis[1], axis[0], 0]]) / sin
+    return np.eye(3) + sin * k + (1 - cos) * (k @ k)
+
+
+def transform_points(points, xform):
+    """
+    Applies a 4x4 transform to an (n, 3) point array.
+    """
+    xform = np.asarray(xform, dtype=float)
+    moved = points @ xform[:3, :3].T + xform[:3, 3]
+    w = points @ xform[3, :3] + xform[3, 3]
+    if np.allclose(w, 1.0):
+        return moved
+    return moved / w[:, None]
+
+
+def polygons_to_faces(polygons):
+    """
+    Converts clipped polygons (3 to 5 corners) into Rhino tri/quad faces.
+    """
+    faces = []
+    for poly in polygons:
+        if len(poly) == 3:
+            faces.append((poly[0], poly[1], poly[2], poly[2]))
+        elif len(poly) == 4:
+            faces.append(tuple(poly))
+        else:
+            faces.append((poly[0], poly[1], poly[2], poly[3]))
+            for k in range(3, len(poly) - 1):
+                faces.append((poly[0], poly[k], poly[k + 1], poly[k + 1]))
+    return np.array(faces, dtype=np.int64).reshape(-1, 4)
+
+
+def clip_faces(vertices, faces, distances, tolerance=1e-9):
+    """
+    Clips faces that cross the zero level of a per-vertex signed distance.
+
+    Args:
+        vertices: (n, 3) vertex array.
+        faces: (k, 4) faces that all cross the level.
+        distances: (n,) signed distance of every vertex.
+
+    Returns:
+        tuple: (new vertices appended after the originals, positive-side
+            faces, negative-side faces), indices into the extended array.
+    """
+    new_points = []
+    edge_point = {}
+    positive = []
+    negative = []
+    count = len(vertices)
+
+    def cut(i, j):
+        key = (i, j) if i < j else (j, i)
+        index = edge_point.get(key)
+        if index is None:
+            t = distances[i] / (distances[i] - distances[j])
+            new_points.append(vertices[i] + t * (vertices[j] - vertices[i]))
+            index = count + len(new_points) - 1
+            edge_point[key] = index
+        return index
+
+    for face in faces:
+        corners = list(face[:3]) if face[2] == face[3] else list(face)
+        pos = []
+        neg = []
+        for k, i in enumerate(corners):
+            j = corners[(k + 1) % len(corners)]
+            di, dj = distances[i], distances[j]
+            if di >= -tolerance:
+                pos.append(i)
+            if di <= tolerance:
+                neg.append(i)
+            if (di > tolerance and dj < -tolerance) or (di < -tolerance and dj > tolerance):
+                point = cut(i, j)
+                pos.append(point)
+                neg.append(point)
+        if len(pos) >= 3:
+            positive.append(pos)
+        if len(neg) >= 3:
+            negative.append(neg)
+
+    if new_points:
+        vertices = np.vstack([vertices, np.array(new_points)])
+    return vertices, polygons_to_faces(positive), polygons_to_faces(negative)
+
+
+def split_by_plane(vertices, faces, origin, normal, tolerance=1e-9):
+    """
+    Splits a mesh by a plane.
+
+    Faces wholly on one side are kept as they are; only the faces that cross
+    the plane are clipped.
+
+    Returns:
+        list: (vertices, faces) for the positive and negative side, leaving
+            out a side without faces.
+    """
+    distances = (vertices - np.asarray(origin, dtype=float)) @ unitize(np.asarray(normal, dtype=float))
+    side = np.where(distances > tolerance, 1, np.where(distances < -tolerance, -1, 0))
+    face_side = side[faces]
+    all_pos = (face_side >= 0).all(axis=1)
+    all_neg = (face_side <= 0).all(axis=1) & ~all_pos
+    crossing = ~(all_pos | all_neg)
+
+    extended, pos_clipped, neg_clipped = clip_faces(vertices, faces[crossing], distances, tolerance)
+    pieces = []
+    for kept, clipped in ((faces[all_pos], pos_clipped), (faces[all_neg], neg_clipped)):
+        piece_faces = np.concatenate([kept, clipped])
+        if len(piece_faces):
+            pieces.append(compact(extended, piece_faces))
+    return pieces
+
+
+def boundary_loops(faces):
+    """
+    Returns the naked-edge loops of the mesh as lists of vertex indices.
+    """
+    corners = [faces[:, [0, 1]], faces[:, [1, 2]]]
+    quad = is_quad(faces)
+    corners.append(np.where(quad[:, None], faces[:, [2, 3]], faces[:, [2, 0]]))
+    corners.append(faces[quad][:, [3, 0]])
+    edges = np.concatenate(corners)
+    keys = np.sort(edges, axis=1)
+    keys = keys[:, 0] * (int(faces.max()) + 1) + keys[:, 1]
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    naked = edges[counts[inverse.ravel()] == 1]
+
+    following = dict((int(a), int(b)) for a, b in naked)
+    loops = []
+    while following:
+        start, current = following.popitem()
+        loop = [start]
+        while current != start and current in following:
+            loop.append(current)
+            current = following.pop(current)
+        loops.append(loop)
+    return loops
+
+
+def closest_point_on_triangles(p, a, b, c):
+    """
+    Closest points on triangles (a, b, c) to points p, element-wise.
+
+    All arguments broadcast against each other as (..., 3) arrays.
+
+    Returns:
+        tuple: (closest points, (..., 3) barycentric coordinates).
+    """
+    ab = b - a
+    ac = c - a
+    ap = p - a
+    bp = p - b
+    cp = p - c
+    d1 = np.einsum("...i,...i", ab, ap)
+    d2 = np.einsum("...i,...i", ac, ap)
+    d3 = np.einsum("...i,...i", ab, bp)
+    d4 = np.einsum("...i,...i", ac, bp)
+    d5 = np.einsum("...i,...i", ab, cp)
+    d6 = np.einsum("...i,...i", ac, cp)
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    def ratio(num, den):
+        return np.divide(num, den, out=np.zeros(np.broadcast(num, den).shape), where=den != 0)
+
+    total = va + vb + vc
+    v = ratio(vb, total)
+    w = ratio(vc, total)
+    u = 1.0 - v - w
+
+    # Voronoi regions, applied from lowest to highest priority
+    regions = []
+    t = ratio(d4 - d3, (d4 - d3) + (d5 - d6))
+    regions.append(((va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0), 0.0, 1.0 - t, t))
+    t = ratio(d2, d2 - d6)
+    regions.append(((vb <= 0) & (d2 >= 0) & (d6 <= 0), 1.0 - t, 0.0, t))
+    regions.append(((d6 >= 0) & (d5 <= d6), 0.0, 0.0, 1.0))
+    t = ratio(d1, d1 - d3)
+    regions.append(((vc <= 0) & (d1 >= 0) & (d3 <= 0), 1.0 - t, t, 0.0))
+    regions.append(((d3 >= 0) & (d4 <= d3), 0.0, 1.0, 0.0))
+    regions.append(((d1 <= 0) & (d2 <= 0), 1.0, 0.0, 0.0))
+    for mask, ru, rv, rw in regions:
+        u = np.where(mask, ru, u)
+        v = np.where(mask, rv, v)
+        w = np.where(mask, rw, w)
+
+    bary = np.stack(np.broadcast_arrays(u, v, w), axis=-1)
+    point = bary[..., 0:1] * a + bary[..., 1:2] * b + bary[..., 2:3] * c
+    return point, bary
+
+
+def closest_points(vertices, faces, points, chunk=2000000):
+    """
+    Brute-force closest points on a mesh (every query against every triangle).
+
+    Returns:
+        tuple: (points, face index, barycentrics on that face's triangle,
+            distances).
+    """
+    tris, source = triangles(faces)
+    a, b, c = (vertices[tris[:, k]] for k in range(3))
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    step = max(1, chunk // max(1, len(tris)))
+    closest = np.empty_like(points)
+    face_index = np.empty(len(points), dtype=np.int64)
+    bary = np.empty_like(points)
+    for start in range(0, len(points), step):
+        query = points[start:start + step, None, :]
+        candidates, weights = closest_point_on_triangles(query, a, b, c)
+        best = np.argmin(((candidates - query) ** 2).sum(axis=2), axis=1)
+        rows = np.arange(len(best))
+        closest[start:start + step] = candidates[rows, best]
+        bary[start:start + step] = weights[rows, best]
+        face_index[start:start + step] = best
+    distance = np.linalg.norm(closest - points, axis=1)
+    return closest, source[face_index], bary, distance
+
+
+def intersect_lines(vertices, faces, origins, direction):
+    """
+    Intersects infinite parallel lines (origin + t * direction) with the mesh.
+
+    Triangles are binned on a uniform grid in the plane across direction, so
+    each line is only tested against the triangles in its own cell.
+
+    Returns:
+        tuple: ((n, 3) hit points, (n,) hit mask). The hit nearest each
+            origin is kept.
+    """
+    tris, _ = triangles(faces)
+    origins = np.asarray(origins, dtype=float).reshape(-1, 3)
+    direction = unitize(np.asarray(direction, dtype=float))
+    across = unitize(np.cross(direction, np.eye(3)[np.argmin(np.abs(direction))]))
+    frame = np.column_stack([across, np.cross(direction, across)])
+    flat = vertices @ frame
+    query = origins @ frame
+    a, b, c = (flat[tris[:, k]] for k in range(3))
+    low = np.minimum(np.minimum(a, b), c)
+    high = np.maximum(np.maximum(a, b), c)
+
+    # Cells about one triangle wide; each triangle is listed in every cell its
+    # box overlaps
+    cell = max(float(np.mean(high - low)), 1e-9)
+    corner = np.minimum(flat.min(axis=0), query.min(axis=0))
+    first = np.floor((low - corner) / cell).astype(np.int64)
+    last = np.floor((high - corner) / cell).astype(np.int64)
+    rows = int(max(last[:, 1].max(), np.floor((query[:, 1] - corner[1]) / cell).max())) + 1
+    span = last - first + 1
+    count = span[:, 0] * span[:, 1]
+    listed = np.repeat(np.arange(len(tris)), count)
+    step = np.arange(len(listed)) - np.repeat(np.cumsum(count) - count, count)
+    cells = (first[listed, 0] + step // span[listed, 1]) * rows + first[listed, 1] + step % span[listed, 1]
+    order = np.argsort(cells, kind="stable")
+    cells, listed = cells[order], listed[order]
+
+    query_cell = np.floor((query - corner) / cell).astype(np.int64)
+    query_cell = query_cell[:, 0] * rows + query_cell[:, 1]
+    start = np.searchsorted(cells, query_cell, side="left")
+    found_count = np.searchsorted(cells, query_cell, side="right") - start
+    pair_query = np.repeat(np.arange(len(origins)), found_count)
+    pair_tri = listed[np.repeat(start, found_count) + np.arange(len(pair_query))
+                      - np.repeat(np.cumsum(found_count) - found_count, found_count)]
+
+    # 2D barycentric test of each (line, candidate triangle) pair
+    pa, pb, pc = a[pair_tri], b[pair_tri], c[pair_tri]
+    point = query[pair_query]
+
+    def cross(u, v):
+        return u[:, 0] * v[:, 1] - u[:, 1] * v[:, 0]
+
+    area = cross(pb - pa, pc - pa)
+    valid = np.abs(area) > 1e-18
+    area = np.where(valid, area, 1.0)
+    wa = cross(pb - point, pc - point) / area
+    wb = cross(pc - point, pa - point) / area
+    wc = 1.0 - wa - wb
+    inside = valid & (wa >= -1e-12) & (wb >= -1e-12) & (wc >= -1e-12)
+
+    pair_query, pair_tri = pair_query[inside], pair_tri[inside]
+    weights = np.column_stack([wa[inside], wb[inside], wc[inside]])
+    corners = vertices[tris[pair_tri]]
+    points = np.einsum("pk,pki->pi", weights, corners)
+    distance = np.abs((points - origins[pair_query]) @ direction)
+    nearest = np.lexsort((distance, pair_query))
+    keep = nearest[np.unique(pair_query[nearest], return_index=True)[1]]
+
+    hits = origins.copy()
+    found = np.zeros(len(origins), dtype=bool)
+    hits[pair_query[keep]] = points[keep]
+    found[pair_query[keep]] = True
+    return hits, found
+
+
+def read_obj(path):
+    """
+    Reads the vertices and faces of a Wavefront OBJ file. Polygons with more
+    than four corners are fanned into triangles.
+    """
+    vertices = []
+    polygons = []
+    with open(path) as handle:
+        for line in handle:
+            parts = line.split()
+            if not parts:
+                continue
+            if parts[0] == "v":
+                vertices.append([float(c) for c in parts[1:4]])
+            elif parts[0] == "f":
+                polygons.append([int(p.split("/")[0]) for p in parts[1:]])
+    vertices = np.array(vertices, dtype=float).reshape(-1, 3)
+    faces = []
+    for poly in polygons:
+        poly = [i - 1 if i > 0 else len(vertices) + i for i in poly]
+        if len(poly) == 4:
+            faces.append(poly)
+        else:
+            for k in range(1, len(poly) - 1):
+                faces.append((poly[0], poly[k], poly[k + 1], poly[k + 1]))
+    return vertices, np.array(faces, dtype=np.int64).reshape(-1, 4)
+
+
+def read_stl(path, tolerance=1e-9):
+    """
+    Reads an ASCII or binary STL file; coincident corners are welded.
+    """
+    with open(path, "rb") as handle:
+        data = handle.read()
+    count = int(np.frombuffer(data[80:84], dtype="<u4")[0]) if len(data) >= 84 else 0
+    if len(data) == 84 + 50 * count:
+        record = np.dtype([("normal", "<f4", 3), ("corners", "<f4", (3, 3)), ("attribute", "<u2")])
+        corners = np.frombuffer(data, dtype=record, count=count, offset=84)["corners"].astype(float)
+    else:
+        text = data.decode("ascii", "replace").split()
+        at = [k for k, word in enumerate(text) if word == "vertex"]
+        values = [(float(text[k + 1]), float(text[k + 2]), float(text[k + 3])) for k in at]
+        corners = np.array(values, dtype=float).reshape(-1, 3, 3)
+    points = corners.reshape(-1, 3)
+    keys = np.round(points / tolerance).astype(np.int64) if tolerance else points
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    tris = inverse.reshape(-1, 3)
+    return points[first], np.column_stack([tris, tris[:, 2]])
+
+
+def read_mesh(path):
+    """
+    Reads an OBJ or STL file by extension.
+    """
+    if path.lower().endswith(".stl"):
+        return read_stl(path)
+    return read_obj(path)
+
+
+def write_obj(path, vertices, faces):
+    """
+    Writes vertices and faces as a Wavefront OBJ file.
+    """
+    with open(path, "w") as handle:
+        for v in vertices:
+            handle.write("v {:.6f} {:.6f} {:.6f}\n".format(v[0], v[1], v[2]))
+        for face in faces:
+            corners = face[:3] if face[2] == face[3] else face
+            handle.write("f " + " ".join(str(i + 1) for i in corners) + "\n")
+    return path
@@ -0,0 +1,257 @@
+"""
+Bounding-volume hierarchy for batched closest-point queries on a mesh.
+
+FindMidMesh_V3.project_points_to_mesh2 called mesh2.ClosestPoint twice per
+vertex in a Python loop, and MeshArrays.closest_points tests every query
+against every triangle. This engine builds a hierarchy over the target
+mesh's triangles once:
+
+- The triangles are split top down at the median of each node's longest
+  centroid axis, one vectorized partition per level, down to fixed-size
+  leaves. The result is a complete binary tree of bounding boxes.
+- Every query walks the tree depth first, nearer child first, on its own
+  stack. All queries advance one node per step, so each step is one batch
+  over the active queries. A query's first leaf gives it a close bound, and
+  every node whose box lies beyond the bound is skipped.
+
+Queries are answered in chunks, so memory stays bounded for millions of
+points. Chunks can also be spread over worker processes:
+
+    bvh = MeshBVH.TriangleBVH(vertices, faces)
+    result = bvh.closest_points(points, workers=8)
+
+Requires CPython 3 with NumPy.
+"""
+import collections
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+import MeshArrays
+import MeshConvert
+
+LEAF_SIZE = 8       # Triangles per leaf
+CHUNK = 4096        # Query points per batch
+
+Closest = collections.namedtuple("Closest", "points faces weights distances")
+
+
+def box_distance2(points, low, high):
+    """Squared distance from points to axis-aligned boxes, element-wise."""
+    gap = np.maximum(np.maximum(low - points, points - high), 0.0)
+    return np.einsum("ij,ij->i", gap, gap)
+
+
+def face_weights(bary, second):
+    """
+    Converts triangle barycentrics to weights over the source face's corners
+    (A, B, C, D), as in Rhino's MeshPoint.T. A quad's second triangle is
+    (A, C, D).
+    """
+    weights = np.zeros((len(bary), 4))
+    weights[~second, :3] = bary[~second]
+    weights[np.ix_(np.nonzero(second)[0], [0, 2, 3])] = bary[second]
+    return weights
+
+
+class TriangleBVH(object):
+    """
+    Closest-point hierarchy over the triangles of a (vertices, faces) mesh.
+    """
+
+    def __init__(self, vertices, faces, leaf_size=LEAF_SIZE):
+        self.vertices = MeshArrays.as_vertices(vertices)
+        self.faces = MeshArrays.as_faces(faces)
+        tris, source = MeshArrays.triangles(self.faces)
+        if not len(tris):
+            raise ValueError("Mesh has no faces")
+        corners = self.vertices[tris]
+
+        # Padding slots up to a power-of-two leaf count have no centroid
+        # (NaN sorts last) and an empty box; they reuse the last triangle so
+        # leaf tests stay rectangular. Every node is split at the median of
+        # its longest centroid axis, one level at a time
+        self.leaf_size = int(leaf_size)
+        leaves = 1 << int(np.ceil(np.log2(max(1.0, len(tris) / float(self.leaf_size)))))
+        order = np.arange(leaves * self.leaf_size)
+        centers = np.concatenate([corners.mean(axis=1), np.full((len(order) - len(tris), 3), np.nan)])
+        nodes = 1
+        while nodes < leaves:
+            segments = order.reshape(nodes, -1)
+            center = centers[segments]
+            extent = np.fmax.reduce(center, axis=1) - np.fmin.reduce(center, axis=1)
+            axis = np.argmax(np.nan_to_num(extent, nan=-1.0), axis=1)
+            key = center[np.arange(nodes), :, axis]
+            split = np.argpartition(key, segments.shape[1] // 2, axis=1)
+            order = np.take_along_axis(segments, split, axis=1).ravel()
+            nodes *= 2
+        real = order < len(tris)
+        order = np.where(real, order, len(tris) - 1)
+        self.source = source[order]
+        self.second = order >= len(self.faces)
+        self.a, self.b, self.c = (np.ascontiguousarray(corners[order, k]) for k in range(3))
+
+        # Boxes in heap order: node 1 is the root, node k has children 2k and
+        # 2k + 1, and leaf i is node leaves + i
+        slots = corners[order]
+        self.leaf_count = leaves
+        self.box_low = np.empty((2 * leaves, 3))
+        self.box_high = np.empty((2 * leaves, 3))
+        self.box_low[leaves:] = np.where(real[:, None, None], slots, np.inf).reshape(leaves, -1, 3).min(axis=1)
+        self.box_high[leaves:] = np.where(real[:, None, None], slots, -np.inf).reshape(leaves, -1, 3).max(axis=1)
+        self.depth = 0
+        first = leaves
+        while first > 1:
+            first //= 2
+            self.box_low[first:2 * first] = self.box_low[2 * first:4 * first].reshape(-1, 2, 3).min(axis=1)
+            self.box_high[first:2 * first] = self.box_high[2 * first:4 * first].reshape(-1, 2, 3).max(axis=1)
+            self.depth += 1
+
+    def _test_leaves(self, points, query, leaf):
+        """
+        Tests every triangle of the given leaves against its query point.
+
+        Returns:
+            tuple: (query, squared distance, sorted triangle slot, barycentrics)
+                of the best triangle per (query, leaf) pair.
+        """
+        slot = leaf[:, None] * self.leaf_size + np.arange(self.leaf_size)
+        p = points[query][:, None, :]
+        closest, bary = MeshArrays.closest_point_on_triangles(p, self.a[slot], self.b[slot], self.c[slot])
+        d2 = ((closest - p) ** 2).sum(axis=2)
+        best = np.argmin(d2, axis=1)
+        rows = np.arange(len(best))
+        return query, d2[rows, best], slot[rows, best], bary[rows, best]
+
+    def _query(self, points):
+        """
+        Closest points for one chunk of queries.
+
+        Every query walks the tree depth first, nearer child first, on its own
+        stack; all queries advance one node per step in lockstep. A query's
+        first leaf gives it a bound, and nodes whose box lies beyond the
+        bound are skipped.
+        """
+        count = len(points)
+        best_d2 = np.full(count, np.inf)
+        best_slot = np.zeros(count, dtype=np.int64)
+        best_bary = np.zeros((count, 3))
+        stack = np.zeros((count, self.depth + 2), dtype=np.int64)
+        stack_d2 = np.zeros((count, self.depth + 2))
+        stack[:, 0] = 1
+        top = np.ones(count, dtype=np.int64)
+        active = np.arange(count)
+        while len(active):
+            top[active] -= 1
+            node = stack[active, top[active]]
+            live = stack_d2[active, top[active]] < best_d2[active]
+            query, node = active[live], node[live]
+            leaf = node >= self.leaf_count
+            self._update(points, query[leaf], node[leaf] - self.leaf_count, best_d2, best_slot, best_bary)
+
+            # Push both children, the nearer on top
+            query, node = query[~leaf], node[~leaf]
+            left = 2 * node
+            p = points[query]
+            d2_left = box_distance2(p, self.box_low[left], self.box_high[left])
+            d2_right = box_distance2(p, self.box_low[left + 1], self.box_high[left + 1])
+            swap = d2_right < d2_left
+            t = top[query]
+            stack[query, t] = np.where(swap, left, left + 1)
+            stack_d2[query, t] = np.where(swap, d2_left, d2_right)
+            stack[query, t + 1] = np.where(swap, left + 1, left)
+            stack_d2[query, t + 1] = np.where(swap, d2_right, d2_left)
+            top[query] += 2
+            active = active[top[active] > 0]
+        return self._result(best_d2, best_slot, best_bary)
+
+    def _update(self, points, query, leaf, best_d2, best_slot, best_bary):
+        """Tests one leaf per query and keeps each query's best triangle."""
+        if len(query):
+            tested, d2, slot, bary = self._test_leaves(points, query, leaf)
+            better = d2 < best_d2[tested]
+            tested = tested[better]
+            best_d2[tested], best_slot[tested], best_bary[tested] = d2[better], slot[better], bary[better]
+
+    def _result(self, best_d2, best_slot, best_bary):
+        """Closest points, faces and weights from the best triangle slots."""
+        source = self.source[best_slot]
+        weights = face_weights(best_bary, self.second[best_slot])
+        closest = (best_bary[:, 0:1] * self.a[best_slot] + best_bary[:, 1:2] * self.b[best_slot]
+                   + best_bary[:, 2:3] * self.c[best_slot])
+        return closest, source, weights, np.sqrt(best_d2)
+
+    def closest_points(self, points, chunk=CHUNK, workers=1):
+        """
+        Closest points on the mesh to every query point.
+
+        Args:
+            points: (n, 3) query points.
+            chunk: Queries per batch (bounds memory).
+            workers: Worker processes; 1 runs in-process, None uses every core.
+
+        Returns:
+            Closest: ((n, 3) points, (n,) face indices, (n, 4) weights over
+                each face's corners A, B, C, D, (n,) distances).
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        spans = [(start, min(start + chunk, len(points))) for start in range(0, len(points), chunk)]
+        closest = np.empty_like(points)
+        faces = np.empty(len(points), dtype=np.int64)
+        weights = np.empty((len(points), 4))
+        distances = np.empty(len(points))
+
+        def store(span, result):
+            start, stop = span
+            closest[start:stop], faces[start:stop], weights[start:stop], distances[start:stop] = result
+
+        if workers == 1 or len(spans) < 2:
+            for span in spans:
+                store(span, self._query(points[span[0]:span[1]]))
+        else:
+            limit = 2 * (workers or os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,)) as pool:
+                pending = {}
+                for span in spans:
+                    if len(pending) >= limit:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            store(pending.pop(future), future.result())
+                    pending[pool.submit(_query_chunk, points[span[0]:span[1]])] = span
+                for future, span in pending.items():
+                    store(span, future.result())
+        return Closest(closest, faces, weights, distances)
+
+
+_worker_bvh = None
+
+
+def _init_worker(bvh):
+    """Worker initializer: receives the hierarchy once per process."""
+    global _worker_bvh
+    _worker_bvh = bvh
+
+
+def _query_chunk(points):
+    return _worker_bvh._query(points)
+
+
+def closest_points(vertices, faces, points, chunk=CHUNK, workers=1):
+    """
+    Builds a TriangleBVH and answers one batch of closest-point queries.
+
+    Returns:
+        Closest: See TriangleBVH.closest_points.
+    """
+    return TriangleBVH(vertices, faces).closest_points(points, chunk, workers)
+
+
+def closest_points_on_rhino_mesh(mesh, query_mesh, chunk=CHUNK, workers=1):
+    """
+    closest_points from every vertex of a Rhino.Geometry.Mesh (query_mesh)
+    onto another (mesh).
+    """
+    vertices, faces = MeshConvert.mesh_arrays(mesh)
+    points = MeshConvert.mesh_arrays(query_mesh)[0]
+    return closest_points(vertices, faces, points, chunk, workers)
@@ -0,0 +1,38 @@
+"""
+Conversions between Rhino.Geometry.Mesh and plain vertex/face values.
+
+Shared by the cache, the array engines and the scripts. Only the standard
+library is imported at module level, so it loads under IronPython as well as
+CPython; mesh_arrays imports NumPy when called.
+"""
+
+
+def rhino_mesh(vertices, faces):
+    """
+    Builds a Rhino.Geometry.Mesh from flat x, y, z vertices and flat
+    a, b, c, d faces.
+    """
+    import Rhino
+
+    mesh = Rhino.Geometry.Mesh()
+    for i in range(0, len(vertices), 3):
+        mesh.Vertices.Add(vertices[i], vertices[i + 1], vertices[i + 2])
+    for i in range(0, len(faces), 4):
+        mesh.Faces.AddFace(faces[i], faces[i + 1], faces[i + 2], faces[i + 3])
+    mesh.Normals.ComputeNormals()
+    return mesh
+
+
+def mesh_arrays(mesh):
+    """
+    Vertex and face arrays of a Rhino.Geometry.Mesh (needs NumPy).
+
+    Returns:
+        tuple: ((n, 3) float vertices, (m, 4) int64 faces; triangles repeat
+            their third index).
+    """
+    import numpy as np
+
+    vertices = np.asarray(mesh.Vertices.ToFloatArray(), dtype=float).reshape(-1, 3)
+    faces = np.asarray(mesh.Faces.ToIntArray(False), dtype=np.int64).reshape(-1, 4)
+    return vertices, faces
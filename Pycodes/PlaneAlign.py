@@ -0,0 +1,137 @@
+"""
+Best-fit plane alignment on vertex arrays.
+
+The formwork scripts lay a panel flat 200mm above the working plane. They
+used to take the normal at a single ClosestMeshPoint and then run
+CopyObject, OrientObject and MoveObject, re-reading the vertices in between.
+Here, the least-squares plane (SVD) of every vertex gives the rotation.
+Rotation, placement and the lowest-Z move are folded into one 4x4
+transform, which is applied to the whole array at once (or to the Rhino
+object with a single document call). The inverse is returned with it, so
+results map back to project coordinates without querying the document again.
+
+Requires CPython 3 with NumPy.
+"""
+import collections
+
+import numpy as np
+
+import MeshArrays
+import MeshConvert
+
+Alignment = collections.namedtuple("Alignment", "mesh_id normal transform inverse")
+
+
+def best_fit_plane(vertices, faces=None):
+    """
+    Least-squares plane through the vertices.
+
+    Args:
+        vertices: (n, 3) vertex array.
+        faces: Optional (m, 4) faces; the normal is flipped to agree with
+            them, otherwise it points up (+Z).
+
+    Returns:
+        tuple: (centroid, unit normal).
+    """
+    vertices = MeshArrays.as_vertices(vertices)
+    centroid = vertices.mean(axis=0)
+    _, _, axes = np.linalg.svd(vertices - centroid, full_matrices=False)
+    normal = axes[-1]
+    if faces is not None:
+        reference = MeshArrays.face_normals(vertices, MeshArrays.as_faces(faces)).sum(axis=0)
+    else:
+        reference = np.array([0.0, 0.0, 1.0])
+    if np.dot(normal, reference) < 0:
+        normal = -normal
+    return centroid, normal
+
+
+def rigid_inverse(xform):
+    """
+    Inverse of a rotation + translation 4x4 transform.
+    """
+    inverse = np.eye(4)
+    inverse[:3, :3] = xform[:3, :3].T
+    inverse[:3, 3] = -xform[:3, :3].T @ xform[:3, 3]
+    return inverse
+
+
+def alignment_transform(vertices, origin, target_z, faces=None):
+    """
+    Builds the transform that lays the panel flat.
+
+    The best-fit normal is rotated onto +Z about origin. Origin then moves
+    straight up or down to target_z, and the whole panel shifts so its lowest
+    vertex sits at target_z.
+
+    Returns:
+        tuple: (4x4 transform, 4x4 inverse, best-fit normal).
+    """
+    vertices = MeshArrays.as_vertices(vertices)
+    origin = np.array([origin[0], origin[1], origin[2]], dtype=float)
+    _, normal = best_fit_plane(vertices, faces)
+    rotation = MeshArrays.rotation_between(normal, (0.0, 0.0, 1.0))
+    xform = np.eye(4)
+    xform[:3, :3] = rotation
+    xform[:3, 3] = np.array([origin[0], origin[1], target_z]) - rotation @ origin
+    lowest = (vertices @ rotation[2]).min() + xform[2, 3]
+    xform[2, 3] += target_z - lowest
+    return xform, rigid_inverse(xform), normal
+
+
+def align(vertices, origin, target_z, faces=None):
+    """
+    Lays a panel flat with its lowest vertex at target_z.
+
+    Returns:
+        tuple: (aligned vertices, 4x4 transform, 4x4 inverse).
+    """
+    vertices = MeshArrays.as_vertices(vertices)
+    xform, inverse, _ = alignment_transform(vertices, origin, target_z, faces)
+    return MeshArrays.transform_points(vertices, xform), xform, inverse
+
+
+def rhino_transform(matrix):
+    """
+    Converts a 4x4 array to a Rhino.Geometry.Transform.
+    """
+    import Rhino
+
+    xform = Rhino.Geometry.Transform(1.0)
+    for i in range(4):
+        for j in range(4):
+            xform[i, j] = float(matrix[i, j])
+    return xform
+
+
+def align_mesh_object(mesh_id, origin, target_z, copy=True):
+    """
+    Lays a Rhino mesh object flat with its lowest vertex at target_z, as one
+    document transform.
+
+    Args:
+        mesh_id: Mesh object id.
+        origin: Panel origin (the pivot of the rotation).
+        target_z: Z of the lowest vertex after alignment.
+        copy: Align a copy (True) or the object itself.
+
+    Returns:
+        Alignment: (aligned mesh id, best-fit normal as Vector3d, transform,
+            inverse) with Rhino.Geometry.Transform values, or None on failure.
+    """
+    import Rhino
+    import rhinoscriptsyntax as rs
+    import scriptcontext as sc
+    import System
+
+    mesh = rs.coercemesh(mesh_id)
+    if not mesh:
+        return None
+    vertices, faces = MeshConvert.mesh_arrays(mesh)
+    xform, inverse, normal = alignment_transform(vertices, origin, target_z, faces)
+    aligned_id = sc.doc.Objects.Transform(rs.coerceguid(mesh_id), rhino_transform(xform), not copy)
+    if aligned_id == System.Guid.Empty:
+        return None
+    return Alignment(aligned_id, Rhino.Geometry.Vector3d(*normal), rhino_transform(xform),
+                     rhino_transform(inverse))
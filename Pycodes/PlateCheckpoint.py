@@ -0,0 +1,155 @@
+"""
+Checkpoint store and streaming driver for plate-by-plate pipelines.
+
+Process_EditCuttedMesh runs QuadRemesh, MeshToNurb, border and orientation
+steps for hundreds of plates. If it crashed at plate 300, every earlier
+result was lost. Here, each plate's result goes to its own JSON file as
+soon as the plate finishes. The write is atomic (temp file + rename), so a
+crash can lose at most the plate in progress. A re-run streams through the
+same plates, skips the completed ones and continues from there, reporting
+plates/min as it goes.
+
+Standard library only, so it runs in any Rhino Python.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+
+def plate_key(plate):
+    """
+    Returns a file-safe key for a plate (object id, name or path).
+    """
+    text = str(plate)
+    safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in text)
+    if len(safe) <= 64:
+        return safe
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def default_folder(name="plates"):
+    """
+    Returns <document folder>/<document name>_<name>_checkpoints for the
+    active Rhino document, or a folder in the temp directory for an unsaved
+    document.
+    """
+    try:
+        import rhinoscriptsyntax as rs
+        folder, document = rs.DocumentPath(), rs.DocumentName()
+    except ImportError:
+        folder, document = None, None
+    if folder and document:
+        return os.path.join(folder, "{}_{}_checkpoints".format(os.path.splitext(document)[0], name))
+    return os.path.join(tempfile.gettempdir(), "{}_checkpoints".format(name))
+
+
+class CheckpointStore(object):
+    """
+    One JSON result file per completed plate.
+    """
+
+    def __init__(self, folder=None):
+        self.folder = folder or default_folder()
+        if not os.path.isdir(self.folder):
+            os.makedirs(self.folder)
+
+    def path(self, key):
+        return os.path.join(self.folder, plate_key(key) + ".json")
+
+    def done(self, key):
+        return os.path.isfile(self.path(key))
+
+    def load(self, key):
+        """Returns the stored result of a plate, or None."""
+        try:
+            with open(self.path(key)) as handle:
+                return json.load(handle)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def save(self, key, result):
+        """Writes a plate's result atomically."""
+        path = self.path(key)
+        temp = path + ".tmp"
+        with open(temp, "w") as handle:
+            json.dump(result, handle)
+        try:
+            os.replace(temp, path)
+        except AttributeError:  # IronPython 2.7
+            if os.path.exists(path):
+                os.remove(path)
+            os.rename(temp, path)
+
+    def completed(self):
+        """Returns the keys of every completed plate."""
+        return [name[:-5] for name in os.listdir(self.folder) if name.endswith(".json")]
+
+    def clear(self):
+        for name in os.listdir(self.folder):
+            if name.endswith(".json") or name.endswith(".tmp"):
+                os.remove(os.path.join(self.folder, name))
+
+
+class Throughput(object):
+    """
+    Plates/min over the plates actually processed in this run (resumed
+    plates are counted as done but not timed).
+    """
+
+    def __init__(self, total):
+        self.total = total
+        self.start = time.time()
+        self.processed = 0
+        self.skipped = 0
+
+    def rate(self):
+        minutes = (time.time() - self.start) / 60.0
+        return self.processed / minutes if minutes > 0 else 0.0
+
+    def report(self):
+        done = self.processed + self.skipped
+        rate = self.rate()
+        eta = (self.total - done) / rate if rate > 0 else 0.0
+        return "{}/{} plates ({} resumed), {:.1f} plates/min, ETA {:.1f} min".format(
+            done, self.total, self.skipped, rate, eta)
+
+
+def stream(plates, process, store, restore=None, report=print):
+    """
+    Runs process over plates one at a time, checkpointing every result.
+
+    Args:
+        plates: The plates (object ids or paths), in processing order.
+        process: process(plate) -> JSON-serializable result, or None if the
+            plate failed (failed plates are not checkpointed).
+        store: CheckpointStore.
+        restore: Optional restore(plate, result) -> result, called for a
+            plate completed in an earlier run (e.g. to re-add objects lost in
+            a crash); its return value is checkpointed again if it changed.
+        report: Called with a progress line after every plate.
+
+    Yields:
+        tuple: (plate, result, resumed) in plate order.
+    """
+    plates = list(plates)
+    progress = Throughput(len(plates))
+    for plate in plates:
+        result = store.load(plate)
+        resumed = result is not None
+        if resumed:
+            progress.skipped += 1
+            if restore is not None:
+                restored = restore(plate, result)
+                if restored != result:
+                    store.save(plate, restored)
+                result = restored
+        else:
+            result = process(plate)
+            progress.processed += 1
+            if result is not None:
+                store.save(plate, result)
+        if report:
+            report(progress.report())
+        yield plate, result, resumed
@@ -0,0 +1,167 @@
+"""
+Parallel plate cutting for large shell zones.
+
+DinhViTam.cut_mesh_into_plates runs on one core, even with PlateSplitter.
+Here, the shell's plate grid is divided into strips of whole columns and each
+strip is cut in its own worker process on vertex/face arrays:
+
+    python PlateCutBatch.py roof.obj -o plates/ --strip-cols 4 --workers 8
+
+Every strip is cut on the grid of the whole shell, so the strips' plates
+stitch back into one set whose cell ids (row * cols + col) are unique over
+the zone. A worker only receives the faces that touch its strip, and at most
+two strips per worker are in flight. Worker memory therefore grows with the
+strip size, not the shell size. With an output folder, workers write their
+plates as OBJ files (ready for FormworkBatch) and only return an index row.
+
+Requires CPython 3 with NumPy.
+"""
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+import MeshArrays
+import PlateSplitter
+
+INDEX_FIELDS = ["cell", "row", "col", "vertices", "faces", "file"]
+
+
+def strip_columns(frame, strip_cols):
+    """
+    Returns the (first, stop) column range of every strip.
+    """
+    strip_cols = max(1, int(strip_cols))
+    return [(first, min(first + strip_cols, frame.cols)) for first in range(0, frame.cols, strip_cols)]
+
+
+def face_columns(vertices, faces, frame, tolerance=PlateSplitter.TOLERANCE):
+    """
+    Returns the first and last grid column every face touches.
+    """
+    x = vertices[faces, 0]
+    low = np.floor((x.min(axis=1) + tolerance - frame.x0) / frame.size).astype(np.int64)
+    high = np.floor((x.max(axis=1) - tolerance - frame.x0) / frame.size).astype(np.int64)
+    low = np.clip(low, 0, frame.cols - 1)
+    high = np.clip(np.maximum(high, low), 0, frame.cols - 1)
+    return low, high
+
+
+def strip_mesh(vertices, faces, columns, first, stop):
+    """
+    Returns the compacted (vertices, faces) touching columns [first, stop).
+    """
+    low, high = columns
+    touching = (low < stop) & (high >= first)
+    if not touching.any():
+        return np.empty((0, 3)), np.empty((0, 4), dtype=np.int64)
+    return MeshArrays.compact(vertices, faces[touching])
+
+
+def plate_filename(plate):
+    return "plate_{:05d}_r{:03d}_c{:03d}.obj".format(plate.cell, plate.row, plate.col)
+
+
+def cut_strip(vertices, faces, frame, first, stop):
+    """
+    Cuts one strip on the shell's grid.
+
+    Returns:
+        list: The strip's Plates (only cells in columns [first, stop)).
+    """
+    if not len(faces):
+        return []
+    plates, _ = PlateSplitter.split_into_plates(vertices, faces, frame=frame)
+    return [plate for plate in plates if first <= plate.col < stop]
+
+
+def _cut(job):
+    """Worker entry point: cuts a strip and returns its plates or index rows."""
+    vertices, faces, frame, first, stop, out_dir = job
+    plates = cut_strip(vertices, faces, frame, first, stop)
+    if out_dir is None:
+        return plates
+    rows = []
+    for plate in plates:
+        filename = plate_filename(plate)
+        MeshArrays.write_obj(os.path.join(out_dir, filename), plate.vertices, plate.faces)
+        rows.append({"cell": plate.cell, "row": plate.row, "col": plate.col, "vertices": len(plate.vertices),
+                     "faces": len(plate.faces), "file": filename})
+    return rows
+
+
+def cut_parallel(vertices, faces, size=PlateSplitter.PLATE_SIZE, strip_cols=4, workers=None, out_dir=None):
+    """
+    Cuts a shell into plates, one column strip per worker task.
+
+    Args:
+        vertices: (n, 3) vertex array.
+        faces: (m, 4) faces.
+        size: Plate cell size.
+        strip_cols: Grid columns per strip (bounds each worker's share).
+        workers: Worker processes; None uses every core, 1 runs in-process.
+        out_dir: If given, workers write plate OBJ files and plates.csv
+            indexes them.
+
+    Returns:
+        tuple: (Plates, or index rows with out_dir, in cell id order; GridFrame).
+    """
+    vertices = MeshArrays.as_vertices(vertices)
+    faces = MeshArrays.as_faces(faces)
+    frame = PlateSplitter.grid_frame(vertices, size)
+    columns = face_columns(vertices, faces, frame)
+    if out_dir is not None and not os.path.isdir(out_dir):
+        os.makedirs(out_dir)
+
+    def jobs():
+        for first, stop in strip_columns(frame, strip_cols):
+            strip_vertices, strip_faces = strip_mesh(vertices, faces, columns, first, stop)
+            yield strip_vertices, strip_faces, frame, first, stop, out_dir
+
+    results = []
+    if workers == 1:
+        for job in jobs():
+            results.extend(_cut(job))
+    else:
+        limit = 2 * (workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for job in jobs():
+                if len(pending) >= limit:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results.extend(future.result())
+                pending.add(pool.submit(_cut, job))
+            for future in pending:
+                results.extend(future.result())
+
+    key = (lambda row: row["cell"]) if out_dir is not None else (lambda plate: plate.cell)
+    results.sort(key=key)
+    if out_dir is not None:
+        with open(os.path.join(out_dir, "plates.csv"), "w", newline="") as stream:
+            writer = csv.DictWriter(stream, fieldnames=INDEX_FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+    return results, frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cut a shell mesh into 3m plates across worker processes.")
+    parser.add_argument("mesh", help="Shell OBJ/STL file")
+    parser.add_argument("-o", "--out", default="plates", help="Output folder")
+    parser.add_argument("--size", type=float, default=PlateSplitter.PLATE_SIZE, help="Plate cell size")
+    parser.add_argument("--strip-cols", type=int, default=4, help="Grid columns per worker strip")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    vertices, faces = MeshArrays.read_mesh(args.mesh)
+    start = time.time()
+    rows, frame = cut_parallel(vertices, faces, args.size, args.strip_cols, args.workers, args.out)
+    print("{} plates ({} x {} cells) in {:.2f}s".format(len(rows), frame.cols, frame.rows, time.time() - start))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Single-pass grid splitter for DinhViTam.cut_mesh_into_plates.
+
+The Rhino version splits every fragment by every X plane, then every Y plane,
+so its work grows with fragments x planes. It also adds a 10m x 10m cutter
+surface per plane. Here, the faces are binned into the 3m cell grid in one
+pass. The grid uses the same lines as DinhViTam: centroid + k * 3m in X and
+Y. Only the faces whose X or Y range straddles a grid line are clipped, and
+each line clips just the faces that cross it. The plane-side tests are
+vectorized; nothing is added to the document.
+
+Each cell comes back as one plate fragment with its (row, col) address, with
+row 0 / col 0 at the lowest Y / X, and its cell id row * cols + col. A fragment may hold several disconnected
+pieces if the mesh leaves and re-enters the cell.
+
+Requires CPython 3 with NumPy.
+"""
+import collections
+
+import numpy as np
+
+import MeshArrays
+import MeshConvert
+
+PLATE_SIZE = 3.0    # Cell size of the plate grid (m)
+TOLERANCE = 1e-9    # Vertices this close to a grid line count as on it
+
+Plate = collections.namedtuple("Plate", "cell row col vertices faces")
+GridFrame = collections.namedtuple("GridFrame", "x0 y0 size cols rows")
+
+
+def grid_frame(vertices, size=PLATE_SIZE, center=None):
+    """
+    Returns the plate grid covering the vertices.
+
+    Args:
+        vertices: (n, 3) vertex array.
+        size: Cell size.
+        center: Optional (x, y) the grid lines pass through; defaults to the
+            bounding box centre, as in DinhViTam.
+
+    Returns:
+        GridFrame: Lower-left grid line (x0, y0), cell size and cell counts.
+    """
+    vertices = MeshArrays.as_vertices(vertices)
+    low, high = MeshArrays.bounding_box(vertices)
+    if center is None:
+        center = 0.5 * (low + high)
+    x0 = center[0] + np.floor((low[0] - center[0]) / size) * size
+    y0 = center[1] + np.floor((low[1] - center[1]) / size) * size
+    cols = max(1, int(np.ceil((high[0] - x0) / size)))
+    rows = max(1, int(np.ceil((high[1] - y0) / size)))
+    return GridFrame(float(x0), float(y0), float(size), cols, rows)
+
+
+def cell_address(points, frame):
+    """
+    Returns the (row, col) integer arrays of the cells containing points.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    col = np.floor((points[:, 0] - frame.x0) / frame.size).astype(np.int64)
+    row = np.floor((points[:, 1] - frame.y0) / frame.size).astype(np.int64)
+    return np.clip(row, 0, frame.rows - 1), np.clip(col, 0, frame.cols - 1)
+
+
+def cell_id(row, col, frame):
+    """
+    Returns the cell id (row * cols + col), unique over the whole grid.
+    """
+    return row * frame.cols + col
+
+
+def clip_at_lines(vertices, faces, axis, lines, tolerance=TOLERANCE):
+    """
+    Clips faces at every grid line they cross along one axis.
+
+    Args:
+        vertices: (n, 3) vertex array.
+        faces: (k, 4) faces that may cross the lines.
+        axis: 0 for X lines, 1 for Y lines.
+        lines: Coordinates of the grid lines.
+
+    Returns:
+        tuple: (extended vertices, faces none of which crosses a line).
+    """
+    for line in lines:
+        coordinate = vertices[faces, axis]
+        crossing = (coordinate.min(axis=1) < line - tolerance) & (coordinate.max(axis=1) > line + tolerance)
+        if not crossing.any():
+            continue
+        vertices, positive, negative = MeshArrays.clip_faces(vertices, faces[crossing], vertices[:, axis] - line,
+                                                             tolerance)
+        faces = np.concatenate([faces[~crossing], positive, negative])
+    return vertices, faces
+
+
+def split_into_plates(vertices, faces, size=PLATE_SIZE, center=None, tolerance=TOLERANCE, frame=None):
+    """
+    Splits a mesh into plate fragments on the size x size cell grid.
+
+    Args:
+        vertices: (n, 3) vertex array.
+        faces: (m, 4) faces.
+        size: Cell size.
+        center: Optional (x, y) the grid lines pass through (see grid_frame).
+        frame: Optional GridFrame to cut on instead (e.g. the whole shell's
+            grid when cutting one strip of it); size and center are ignored.
+
+    Returns:
+        tuple: (list of Plate(cell, row, col, vertices, faces) ordered by
+            cell id, GridFrame).
+    """
+    vertices = MeshArrays.as_vertices(vertices)
+    faces = MeshArrays.as_faces(faces)
+    if frame is None:
+        frame = grid_frame(vertices, size, center)
+    size = frame.size
+
+    # Faces whose X and Y ranges stay inside one cell are binned as they are
+    corners = vertices[faces]
+    low = corners.min(axis=1)
+    high = corners.max(axis=1)
+    row, col = cell_address(0.5 * (low + high), frame)
+    cell_x = frame.x0 + col * size
+    cell_y = frame.y0 + row * size
+    inside = ((low[:, 0] >= cell_x - tolerance) & (high[:, 0] <= cell_x + size + tolerance) &
+              (low[:, 1] >= cell_y - tolerance) & (high[:, 1] <= cell_y + size + tolerance))
+
+    # Only the rest is clipped, and only at the lines their range spans
+    crossing = faces[~inside]
+    if len(crossing):
+        span = np.arange(1, max(frame.cols, frame.rows))
+        x_lines = frame.x0 + span[span < frame.cols] * size
+        y_lines = frame.y0 + span[span < frame.rows] * size
+        x_lines = x_lines[(x_lines > low[~inside, 0].min()) & (x_lines < high[~inside, 0].max())]
+        y_lines = y_lines[(y_lines > low[~inside, 1].min()) & (y_lines < high[~inside, 1].max())]
+        vertices, crossing = clip_at_lines(vertices, crossing, 0, x_lines, tolerance)
+        vertices, crossing = clip_at_lines(vertices, crossing, 1, y_lines, tolerance)
+        clipped_row, clipped_col = cell_address(MeshArrays.face_centers(vertices, crossing), frame)
+        faces = np.concatenate([faces[inside], crossing])
+        row = np.concatenate([row[inside], clipped_row])
+        col = np.concatenate([col[inside], clipped_col])
+
+    cell = cell_id(row, col, frame)
+    order = np.argsort(cell, kind="stable")
+    cells, starts = np.unique(cell[order], return_index=True)
+    plates = []
+    for key, group in zip(cells, np.split(order, starts[1:])):
+        plate_vertices, plate_faces = MeshArrays.compact(vertices, faces[group])
+        plates.append(Plate(int(key), int(key // frame.cols), int(key % frame.cols), plate_vertices, plate_faces))
+    return plates, frame
+
+
+def split_mesh_into_plates(mesh, size=PLATE_SIZE):
+    """
+    split_into_plates for a Rhino.Geometry.Mesh.
+
+    Returns:
+        list: (row, col, Rhino.Geometry.Mesh) per plate, ordered by row then col.
+    """
+    vertices, faces = MeshConvert.mesh_arrays(mesh)
+    plates, _ = split_into_plates(vertices, faces, size)
+    return [(plate.row, plate.col, MeshConvert.rhino_mesh(plate.vertices.ravel().tolist(),
+                                                          plate.faces.ravel().tolist()))
+            for plate in plates]
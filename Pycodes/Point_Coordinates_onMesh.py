@@ -1,8 +1,9 @@
 import rhinoscriptsyntax as rs
 import Rhino
+import CoordinateSheet
 
 # 
-def split_mesh_to_grid(mesh_id):
+def split_mesh_to_grid(mesh_id, writer=None):
     # 
     if not rs.IsMesh(mesh_id):
         print("Chon Mesh!")
@@ -26,6 +27,7 @@ def split_mesh_to_grid(mesh_id):
     
     
     points = []
+    indices = []
     
     
     for i in range(u_steps + 1):
@@ -34,19 +36,22 @@ def split_mesh_to_grid(mesh_id):
             v = domain_v[0] + j * v_step_size
             point = rs.EvaluateSurface(nurb_surface, u, v)
             if point:
-                points.append(point)                
-                text = "point.X:" + point.X + "point.Y:" + point.Y + "point.Z:" + point.Z 
-                rs.AddText(text, point, height=0.1)
+                points.append(point)
+                indices.append((i, j))
     
+    # Toa do ghi vao bang toa do (.cpts), khong them Text cho moi diem
+    if writer is not None:
+        writer.add_plate(mesh_id, [(p.X, p.Y, p.Z) for p in points], indices, CoordinateSheet.GRID)
     
+    # Diem bien: u = thu tu diem tren duong bien, v = so thu tu duong bien
     boundary = rs.DuplicateMeshBorder(mesh_id)
     if boundary:
-        edge_points = rs.CurvePoints(boundary)
-        for edge_point in edge_points:            
-            #text = f"({edge_point.X:.2f}, {edge_point.Y:.2f}, {edge_point.Z:.2f})"
-            text = "edge_point.X:" + point.X + "point.Y:" + point.Y + "edge_point.Z:" + edge_point.Z 
-            rs.AddText(text, edge_point, height=0.1)
-        rs.DeleteObject(boundary)  
+        for loop, curve in enumerate(boundary):
+            edge_points = rs.CurvePoints(curve) or []
+            if writer is not None:
+                writer.add_plate(mesh_id, [(p.X, p.Y, p.Z) for p in edge_points],
+                                 [(k, loop) for k in range(len(edge_points))], CoordinateSheet.EDGE)
+        rs.DeleteObjects(boundary)  
     
     
     for i in range(u_steps + 1):
@@ -69,9 +74,14 @@ def main():
         print("Khong co Mesh!")
         return
     
+    path = rs.SaveFileName("Luu bang toa do", "Coordinate sheet (*.cpts)|*.cpts||")
+    if not path:
+        return
+    
     rs.EnableRedraw(False) 
     print("Dang chia Mesh va gan Toa do...")
-    split_mesh_to_grid(mesh_id)
+    with CoordinateSheet.SheetWriter(path) as writer:
+        split_mesh_to_grid(mesh_id, writer)
     rs.EnableRedraw(True)
     print("Finishes!")
 
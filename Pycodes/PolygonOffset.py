@@ -0,0 +1,340 @@
+"""
+Incremental inward offsets of closed planar outlines (slab rebar lines).
+
+RebarGenerator.generate_rebar_curves called rg.Curve.Offset on the whole
+outline once per bar, at distance spacing * i, so every bar re-offset the
+original curve from scratch and the call simply failed once the offset
+collapsed. Here all the bar lines of an outline come from one sweep:
+
+- level 0 is the outline offset by the cover, and each next level is the
+  previous one offset by the spacing, so every step only moves the current
+  polygon;
+- within a step, every vertex moves along its mitre (sharp corners, as
+  CurveOffsetCornerStyle.Sharp) and edges that shrink to nothing are removed
+  in order of the distance at which they vanish;
+- where a reflex corner runs through the opposite side, the polygon is cut
+  at that distance into separate loops and the inverted lobes are dropped;
+- loops whose area vanishes stop cleanly; the sweep ends when none is left.
+
+Outlines are taken in the XY plane (as with rg.Plane.WorldXY); every loop
+keeps the mean Z of its outline. Each outline is offset on its own, as the
+Rhino offsets were.
+
+Requires CPython 3 with NumPy.
+"""
+import collections
+
+import numpy as np
+
+TOLERANCE = 1e-7    # Relative to the outline size: shorter edges / thinner loops vanish
+SLIVER = 10         # Loops narrower than this many tolerances vanish
+BATCH = 1e-2        # Shrinking edges shorter than this fraction of a step are removed together
+
+OffsetLoop = collections.namedtuple("OffsetLoop", "outline level distance points")
+
+
+def signed_area(xy):
+    """Signed area of a closed (n, 2) polygon (positive counter-clockwise)."""
+    x, y = xy[:, 0], xy[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+
+def clean(xy, tolerance):
+    """
+    Removes repeated points, collinear vertices and spikes of a closed (n, 2)
+    polygon (without the closing point).
+    """
+    while len(xy) >= 3:
+        edges = np.roll(xy, -1, axis=0) - xy
+        lengths = np.hypot(edges[:, 0], edges[:, 1])
+        keep = lengths > tolerance
+        if not keep.all():
+            xy = xy[keep]
+            continue
+        before = np.roll(edges, 1, axis=0)
+        cross = before[:, 0] * edges[:, 1] - before[:, 1] * edges[:, 0]
+        straight = np.abs(cross) <= tolerance * (lengths + np.roll(lengths, 1))
+        if not straight.any():
+            break
+        # Drop every other straight vertex per pass, so neighbours are re-tested.
+        even = np.arange(len(xy)) % 2 == 0
+        even[-1] &= len(xy) % 2 == 0
+        drop = straight & even if (straight & even).any() else straight & ~even
+        xy = xy[~drop]
+    return xy
+
+
+def _velocities(xy):
+    """Returns unit edge directions and the mitre velocity of every vertex."""
+    edges = np.roll(xy, -1, axis=0) - xy
+    directions = edges / np.hypot(edges[:, 0], edges[:, 1])[:, None]
+    normals = np.column_stack([-directions[:, 1], directions[:, 0]])
+    before = np.roll(normals, 1, axis=0)
+    denominator = np.maximum(1.0 + np.einsum("ij,ij->i", before, normals), 1e-12)
+    return directions, (before + normals) / denominator[:, None]
+
+
+def _intersect(anchors, directions):
+    """
+    Returns the intersections of consecutive lines (line i - 1 with line i);
+    parallel neighbours give the anchor of line i.
+    """
+    a0, d0 = np.roll(anchors, 1, axis=0), np.roll(directions, 1, axis=0)
+    cross = d0[:, 0] * directions[:, 1] - d0[:, 1] * directions[:, 0]
+    delta = anchors - a0
+    parallel = np.abs(cross) < 1e-12
+    s = (delta[:, 0] * directions[:, 1] - delta[:, 1] * directions[:, 0]) / np.where(parallel, 1.0, cross)
+    return np.where(parallel[:, None], anchors, a0 + s[:, None] * d0)
+
+
+def step(xy, distance, tolerance):
+    """
+    Offsets a counter-clockwise polygon inward by distance.
+
+    Vertices move along their mitres (edge lines move inward at unit speed)
+    from event to event:
+
+    - edge events: the shrinking edge that vanishes first is removed and its
+      neighbours are re-intersected;
+    - split events: if the moved polygon crosses itself, the first crossing
+      distance is found (over the recorded edge events, then by bisection),
+      the polygon is cut into its loops there and each loop goes on with the
+      rest of the distance.
+
+    Returns:
+        list: (k, 2) counter-clockwise loops (empty if the region vanished).
+    """
+    limit = BATCH * distance
+    pending = [(xy, float(distance), True)]
+    loops = []
+    while pending:
+        xy, remaining, check = pending.pop()
+        moves = []
+        xy = clean(xy, tolerance)
+        if not _alive(xy, tolerance):
+            continue
+        while True:
+            directions, velocity = _velocities(xy)
+            lengths = np.einsum("ij,ij->i", np.roll(xy, -1, axis=0) - xy, directions)
+            rates = np.einsum("ij,ij->i", np.roll(velocity, -1, axis=0) - velocity, directions)
+            vanish = np.full(len(xy), np.inf)
+            shrinking = rates < 0
+            vanish[shrinking] = lengths[shrinking] / -rates[shrinking]
+            advance = min(vanish.min(), remaining)
+            moves.append((xy, velocity, advance, remaining))
+            xy = xy + advance * velocity
+            remaining -= advance
+            if remaining <= 0:
+                break
+            # Shrinking edges that are (nearly) gone merge their two vertices;
+            # survivors are re-intersected from their edge lines.
+            gone = shrinking & (lengths + advance * rates <= limit)
+            if gone.sum() > len(xy) - 3:
+                xy = None
+                break
+            xy = _intersect(xy[~gone], directions[~gone])
+            if (np.hypot(*(np.roll(xy, -1, axis=0) - xy).T) <= tolerance).any():
+                xy = clean(xy, tolerance)
+                if len(xy) < 3:
+                    xy = None
+                    break
+
+        if not moves:
+            continue
+        # Polygon after each recorded move (its edge events applied).
+        ends = [move[0] for move in moves[1:]]
+        last, velocity, advance, _ = moves[-1]
+        ends.append(xy if xy is not None else last + advance * velocity)
+        if not check or _crossings(_probe(ends[-1], tolerance)) is None:
+            if xy is not None:
+                loops.append(xy)
+            continue
+
+        # First recorded move that ends crossed, then the crossing distance
+        # within it.
+        low, high = 0, len(moves) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if _crossings(_probe(ends[middle], tolerance)) is None:
+                low = middle + 1
+            else:
+                high = middle
+        start, velocity, advance, left = moves[low]
+        low, high = 0.0, advance
+        resolution = tolerance / max(np.abs(velocity).max(), 1.0)
+        while high - low > resolution:
+            middle = 0.5 * (low + high)
+            if _crossings(_probe(start + middle * velocity, tolerance)) is None:
+                low = middle
+            else:
+                high = middle
+        # A loop split right at the start finishes the step unchecked, so a
+        # crossing the cut left behind cannot stall the sweep.
+        pending.extend((piece, left - high, high > resolution)
+                       for piece in split(start + high * velocity, tolerance))
+    return loops
+
+
+def _probe(xy, tolerance):
+    """Copy of a polygon jittered by the tolerance (same jitter for the same vertex count)."""
+    return xy + np.random.default_rng(len(xy)).uniform(-tolerance, tolerance, xy.shape)
+
+
+def _crossings(xy):
+    """
+    Returns the proper crossings between non-adjacent edges of a closed
+    polygon as (edge a, edge b, parameter on a, parameter on b), found by a
+    sweep over the edges sorted by their lowest X.
+    """
+    n = len(xy)
+    start, end = xy, np.roll(xy, -1, axis=0)
+    low, high = np.minimum(start, end), np.maximum(start, end)
+    order = np.argsort(low[:, 0], kind="stable")
+    stop = np.searchsorted(low[order, 0], high[order, 0], side="right")
+    counts = np.maximum(stop - np.arange(n) - 1, 0)
+    total = int(counts.sum())
+    if not total:
+        return None
+    first = np.repeat(np.arange(n), counts)
+    second = first + 1 + np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    a, b = order[first], order[second]
+    gap = np.abs(a - b)
+    near = (low[a, 1] <= high[b, 1]) & (low[b, 1] <= high[a, 1]) & (gap != 1) & (gap != n - 1)
+    a, b = a[near], b[near]
+    da, db = end[a] - start[a], end[b] - start[b]
+    cross = da[:, 0] * db[:, 1] - da[:, 1] * db[:, 0]
+    delta = start[b] - start[a]
+    valid = cross != 0
+    cross = np.where(valid, cross, 1.0)
+    s = (delta[:, 0] * db[:, 1] - delta[:, 1] * db[:, 0]) / cross
+    t = (delta[:, 0] * da[:, 1] - delta[:, 1] * da[:, 0]) / cross
+    hit = valid & (s > 0) & (s < 1) & (t > 0) & (t < 1)
+    if not hit.any():
+        return None
+    return a[hit], b[hit], s[hit], t[hit]
+
+
+def split(xy, tolerance):
+    """
+    Resolves the self-crossings of a closed polygon.
+
+    The crossings are inserted on both edges and the boundary is walked,
+    switching strands at every crossing; this cuts the polygon into loops
+    that only touch. Counter-clockwise loops are the offset region; the
+    clockwise ones are inverted lobes and are dropped. Crossings are found on
+    a copy jittered by the tolerance, so sides that became collinear (common
+    on rectilinear slabs) resolve like any other crossing; the slivers this
+    leaves are removed by the caller's area test.
+
+    Returns:
+        list: (k, 2) counter-clockwise loops.
+    """
+    probe = _probe(xy, tolerance)
+    found = _crossings(probe)
+    if found is None:
+        return [xy]
+    a, b, s, t = found
+    points = probe[a] + s[:, None] * (np.roll(probe, -1, axis=0)[a] - probe[a])
+
+    # Node sequence: every vertex followed by the crossings on its edge.
+    n = len(xy)
+    half = len(a)
+    keys = np.concatenate([np.arange(n, dtype=float), np.concatenate([a, b]) + np.concatenate([s, t])])
+    order = np.argsort(keys, kind="stable")
+    position = np.concatenate([xy, points, points])[order]
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    copies = rank[n:]
+    twin = np.full(len(order), -1, dtype=np.int64)
+    twin[copies[:half]] = copies[half:]
+    twin[copies[half:]] = copies[:half]
+
+    count = len(order)
+    visited = np.zeros(count, dtype=bool)
+    loops = []
+    for begin in range(count):
+        if visited[begin]:
+            continue
+        loop = []
+        k = begin
+        while not visited[k]:
+            visited[k] = True
+            loop.append(k)
+            k = ((twin[k] if twin[k] >= 0 else k) + 1) % count
+        loop = clean(position[loop], tolerance)
+        if len(loop) >= 3 and signed_area(loop) > 0:
+            loops.append(loop)
+    return loops
+
+
+def _alive(xy, tolerance):
+    """True if the loop is wider than a sliver (mean width above SLIVER tolerances)."""
+    if len(xy) < 3:
+        return False
+    perimeter = np.hypot(*(np.roll(xy, -1, axis=0) - xy).T).sum()
+    return signed_area(xy) > SLIVER * tolerance * perimeter
+
+
+def inward_offsets(points, spacing, start=0.0, count=None, tolerance=None, outline=0):
+    """
+    All inward offsets of one closed outline, from start in steps of spacing.
+
+    Args:
+        points: (n, 2) or (n, 3) outline points (closing point optional,
+            either orientation).
+        spacing: Distance between consecutive offsets.
+        start: Distance of the first offset (e.g. the concrete cover).
+        count: Optional maximum number of levels.
+        tolerance: Edges shorter and loops thinner than this vanish
+            (defaults to TOLERANCE times the outline size).
+        outline: Outline index stored in the results.
+
+    Returns:
+        list: OffsetLoop(outline, level, distance, (k, 3) closed points) for
+            every loop of every level, level by level.
+    """
+    points = np.asarray(points, dtype=float)
+    z = float(points[:, 2].mean()) if points.shape[1] > 2 else 0.0
+    xy = points[:, :2]
+    if len(xy) > 1 and np.allclose(xy[0], xy[-1]):
+        xy = xy[:-1]
+    if tolerance is None:
+        tolerance = TOLERANCE * max(float(np.ptp(xy, axis=0).max()), 1e-12) if len(xy) else TOLERANCE
+    xy = clean(xy, tolerance)
+    if len(xy) < 3:
+        return []
+    if signed_area(xy) < 0:
+        xy = xy[::-1]
+
+    result = []
+    loops = [xy]
+    distance = float(start)
+    move = float(start)
+    level = 0
+    while loops and (count is None or level < count):
+        moved = []
+        for loop in loops:
+            pieces = step(loop, move, tolerance) if move > 0 else split(loop, tolerance)
+            moved.extend(piece for piece in pieces if _alive(piece, tolerance))
+        for loop in moved:
+            closed = np.vstack([loop, loop[:1]])
+            result.append(OffsetLoop(outline, level, distance,
+                                     np.column_stack([closed, np.full(len(closed), z)])))
+        loops = moved
+        distance += spacing
+        move = spacing
+        level += 1
+    return result
+
+
+def offset_outlines(outlines, spacing, start=0.0, count=None, tolerance=None):
+    """
+    inward_offsets for several outlines, each offset on its own.
+
+    Returns:
+        list: OffsetLoop per loop, outline by outline.
+    """
+    result = []
+    for index, points in enumerate(outlines):
+        result.extend(inward_offsets(points, spacing, start, count, tolerance, index))
+    return result
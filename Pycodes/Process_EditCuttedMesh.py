@@ -1,20 +1,27 @@
 import rhinoscriptsyntax as rs
 import Rhino
+import scriptcontext as sc
+import CoordinateSheet
+import MeshConvert
+import PlateCheckpoint
 
 #Ham xu ly Sub-Segment
-def process_sub_segment(mesh_id):
-    # Bước 2: QuadRemesh với Target Quad Count = 500, Adaptive Size = 50%
+# Bước 2: QuadRemesh với Target Quad Count = 500, Adaptive Size = 50%
+def remesh_sub_segment(mesh_id):
     rs.Command(f"-QuadRemesh TargetQuadCount 500 AdaptiveSize 50 _SelID {mesh_id} _Enter")
-    quad_mesh = rs.LastCreatedObjects()[0]  # Lấy mesh vừa tạo
-    
+    created = rs.LastCreatedObjects()
+    return created[0] if created else None  # Lấy mesh vừa tạo
+
+# Bước 3-6 trên lưới đã QuadRemesh; trả về kết quả của tấm để ghi checkpoint
+def finish_sub_segment(mesh_id, quad_mesh):
     # Bước 3: Chuyển Mesh sang NURBS
     nurb_surface = rs.MeshToNurb(quad_mesh)
     if not nurb_surface:
         print(f"Không thể chuyển Mesh {mesh_id} sang NURBS")
-        return
+        return None
     
     # Bước 4: Lấy đường biên bằng DupBorder
-    boundary = rs.DuplicateSurfaceBorder(nurb_surface)
+    boundary = rs.DuplicateSurfaceBorder(nurb_surface) or []
     
     # Bước 5: Duplicate Mesh mới và xoay về mặt phẳng XY, bật Point của NURBS
     # Duplicate Mesh
@@ -32,21 +39,55 @@ def process_sub_segment(mesh_id):
     # Bật Point của NURBS mới
     rs.ObjectShow(nurb_surface)
     rs.Command(f"-EditPtOn _SelID {nurb_surface} _Enter")
-    control_points = rs.SurfacePoints(nurb_surface)
+    control_points = rs.SurfacePoints(nurb_surface) or []
     
-    # Bước 6: Ghi chú tọa độ với Z=0 làm chuẩn
-    if control_points:
-        for pt in control_points:
-            # Tọa độ 2D (chiếu xuống Z=0)
-            pt_2d = (pt.X, pt.Y, 0)
-            # Ghi chú tọa độ gốc (X, Y, Z)
-            text = f"({pt.X:.2f}, {pt.Y:.2f}, {pt.Z:.2f})"
-            rs.AddText(text, pt_2d, height=0.1)
+    # Bước 6: Tọa độ lưới điểm điều khiển (u, v) ghi vào bảng tọa độ ở cuối,
+    # không thêm một Text cho mỗi điểm
+    point_count = rs.SurfacePointCount(nurb_surface) or (len(control_points), 1)
     
     # Xóa đối tượng tạm nếu cần
     # rs.DeleteObject(boundary)  # Uncomment nếu không cần đường biên
+    
+    # Lưu cả lưới QuadRemesh để dựng lại tấm mà không phải QuadRemesh lại
+    quad = rs.coercemesh(quad_mesh)
+    return {
+        "source": str(mesh_id),
+        "quad_mesh": str(quad_mesh),
+        "vertices": list(quad.Vertices.ToFloatArray()),
+        "faces": list(quad.Faces.ToIntArray(False)),
+        "nurb_surface": str(nurb_surface),
+        "boundary": [str(curve) for curve in boundary],
+        "new_mesh": str(new_mesh),
+        "control_points": [[pt.X, pt.Y, pt.Z] for pt in control_points],
+        "point_count": list(point_count),
+    }
 
-# Hàm chính: Chọn các tấm và xử lý
+def process_sub_segment(mesh_id):
+    print(f"Đang xử lý tấm {mesh_id}...")
+    quad_mesh = remesh_sub_segment(mesh_id)
+    if not quad_mesh:
+        print(f"QuadRemesh thất bại cho tấm {mesh_id}")
+        return None
+    return finish_sub_segment(mesh_id, quad_mesh)
+
+# Tấm đã xong ở lần chạy trước: nếu các đối tượng còn trong file thì giữ nguyên,
+# nếu đã mất (crash trước khi lưu file) thì dựng lại từ lưới đã lưu, không QuadRemesh lại
+def restore_sub_segment(mesh_id, result):
+    if all(rs.IsObject(object_id) for object_id in (result["quad_mesh"], result["nurb_surface"], result["new_mesh"])):
+        return result
+    print(f"Dựng lại tấm {mesh_id} từ checkpoint...")
+    quad_mesh = sc.doc.Objects.AddMesh(MeshConvert.rhino_mesh(result["vertices"], result["faces"]))
+    return finish_sub_segment(mesh_id, quad_mesh) or result
+
+# Ghi điểm điều khiển của các tấm vào bảng tọa độ (.cpts), mỗi tấm một đoạn
+def write_coordinate_sheet(path, results):
+    with CoordinateSheet.SheetWriter(path) as writer:
+        for result in results:
+            count_u, count_v = result.get("point_count") or (len(result["control_points"]), 1)
+            writer.add_plate(result["source"], result["control_points"],
+                             CoordinateSheet.grid_indices(count_u, count_v))
+
+# Hàm chính: Chọn các tấm và xử lý từng tấm, ghi checkpoint sau mỗi tấm
 def main():
     # Bước 1: Chọn các tấm (Mesh)
     mesh_ids = rs.GetObjects("Chọn các tấm (Mesh)", rs.filter.mesh)
@@ -54,12 +95,29 @@ def main():
         print("Không có tấm nào được chọn!")
         return
     
+    store = PlateCheckpoint.CheckpointStore(PlateCheckpoint.default_folder("EditCuttedMesh"))
+    if store.completed():
+        mode = rs.GetString("Đã có checkpoint, tiếp tục?", "Resume", ["Resume", "Restart"])
+        if mode == "Restart":
+            store.clear()
+    
     rs.EnableRedraw(False)  # Tắt redraw để tăng tốc
-    for mesh_id in mesh_ids:
-        print(f"Đang xử lý tấm {mesh_id}...")
-        process_sub_segment(mesh_id)
+    failed = 0
+    results = []
+    for mesh_id, result, resumed in PlateCheckpoint.stream(mesh_ids, process_sub_segment, store,
+                                                          restore_sub_segment):
+        if result is None:
+            failed += 1
+        else:
+            results.append(result)
     rs.EnableRedraw(True)
-    print("Hoàn thành!")
+    print(f"Hoàn thành! {failed} tấm lỗi, checkpoint: {store.folder}")
+    
+    # Bước 7: Bảng tọa độ (gốc X, Y, Z và chiếu xuống Z=0) của mọi tấm trong một file
+    path = rs.SaveFileName("Lưu bảng tọa độ", "Coordinate sheet (*.cpts)|*.cpts||")
+    if path:
+        write_coordinate_sheet(path, results)
+        print(f"Bảng tọa độ: {path}")
 
 # Chạy script
 if __name__ == "__main__":
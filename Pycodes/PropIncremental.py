@@ -0,0 +1,126 @@
+"""
+Incremental prop updates for MeshProcessor re-runs.
+
+A re-run after a small panel edit used to delete nothing and regenerate every
+line, post, cap, marker and label. Instead, each run now stores its vertex
+array and the ids it created per vertex in the document user text, keyed by
+the source panel. The next run matches the new vertices to the old ones with
+a SpatialHash within a tolerance. Only props whose vertex moved, appeared or
+disappeared are deleted and recreated; unchanged props stay untouched.
+
+A prop label depends on the working-plane Z and the panel origin, so a change
+to either rebuilds every prop of the panel.
+
+Requires CPython 3 with NumPy.
+"""
+import json
+
+import numpy as np
+
+from SpatialHash import SpatialHash
+
+TOLERANCE = 0.001               # Vertices within 1mm count as unchanged
+STATE_KEY = "FormworkProps:{}"  # Document user text key per source panel
+
+
+def match_vertices(old, new, tolerance=TOLERANCE):
+    """
+    Pairs new vertices with old vertices within tolerance, one to one and
+    closest first.
+
+    Returns:
+        np.ndarray: For each new vertex, the matched old index or -1.
+    """
+    old = np.asarray(old, dtype=float).reshape(-1, 3)
+    new = np.asarray(new, dtype=float).reshape(-1, 3)
+    match = np.full(len(new), -1, dtype=np.int64)
+    if not len(old) or not len(new):
+        return match
+    query, point, distance = SpatialHash(old, tolerance).pairs(new, tolerance)
+    order = np.argsort(distance, kind="stable")
+    query, point = query[order], point[order]
+    first_old = np.unique(point, return_index=True)[1]
+    query, point = query[first_old], point[first_old]
+    first_new = np.unique(query, return_index=True)[1]
+    match[query[first_new]] = point[first_new]
+    return match
+
+
+class PropState(object):
+    """
+    The props one run created for a panel: vertex array, object ids per
+    vertex, the other ids (Z_min label) and the labels' working-plane Z and
+    origin.
+    """
+
+    def __init__(self, vertices=(), ids=(), extra=(), base_z=None, origin=None):
+        self.vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+        self.ids = [list(group) for group in ids]
+        self.extra = list(extra)
+        self.base_z = base_z
+        self.origin = None if origin is None else [float(c) for c in origin[:3]]
+
+    def to_json(self):
+        return json.dumps({"vertices": self.vertices.round(9).tolist(), "ids": self.ids, "extra": self.extra,
+                           "base_z": self.base_z, "origin": self.origin})
+
+    @staticmethod
+    def from_json(text):
+        data = json.loads(text)
+        return PropState(data["vertices"], data["ids"], data["extra"], data["base_z"], data["origin"])
+
+    def same_frame(self, base_z, origin, tolerance=TOLERANCE):
+        """True if labels made for base_z/origin match the stored ones."""
+        if self.base_z is None or self.origin is None:
+            return False
+        return (abs(self.base_z - base_z) <= tolerance and
+                max(abs(a - float(b)) for a, b in zip(self.origin, origin[:3])) <= tolerance)
+
+    def diff(self, vertices, base_z, origin, tolerance=TOLERANCE):
+        """
+        Compares a new run against this state.
+
+        Returns:
+            tuple: (matched old index or -1 per new vertex, ids to delete).
+        """
+        vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+        if self.same_frame(base_z, origin, tolerance):
+            match = match_vertices(self.vertices, vertices, tolerance)
+        else:
+            match = np.full(len(vertices), -1, dtype=np.int64)
+        kept = np.zeros(len(self.vertices), dtype=bool)
+        kept[match[match >= 0]] = True
+        stale = [object_id for index in np.nonzero(~kept)[0] for object_id in self.ids[index]]
+        return match, stale + self.extra
+
+    def updated(self, vertices, match, keys, new_ids, base_z, origin):
+        """
+        Returns the state after a run: kept ids for matched vertices, new ids
+        (grouped by their stage key, the vertex index) for the rest. Ids
+        staged without a key become the extra ids.
+        """
+        grouped = dict((index, []) for index in range(len(match)))
+        extra = []
+        for key, object_id in zip(keys, new_ids):
+            if key is None:
+                extra.append(str(object_id))
+            else:
+                grouped[key].append(str(object_id))
+        ids = [self.ids[old] if old >= 0 else grouped[index] for index, old in enumerate(match)]
+        return PropState(vertices, ids, extra, base_z, origin)
+
+
+def load_state(panel_key):
+    """
+    Returns the stored PropState of a panel, or an empty one.
+    """
+    import rhinoscriptsyntax as rs
+
+    text = rs.GetDocumentUserText(STATE_KEY.format(panel_key))
+    return PropState.from_json(text) if text else PropState()
+
+
+def save_state(panel_key, state):
+    import rhinoscriptsyntax as rs
+
+    rs.SetDocumentUserText(STATE_KEY.format(panel_key), state.to_json())
@@ -0,0 +1,167 @@
+"""
+Prop-layout optimizer.
+
+MeshProcessor puts one prop under every remeshed vertex, so the prop count
+depends on the LOD instead of on the formwork rules. This module instead
+places props on the working plane to satisfy two rules with as few props as
+possible:
+
+- adjacent props are at most max_spacing apart;
+- the panel overhangs the outer props by at most max_cantilever.
+
+The props form rows and columns along the plan axes that need the fewest
+props. For each axis, the line count is the smallest that meets both rules
+over the panel's extent. Props that fall outside an irregular footprint are
+snapped to the nearest panel vertex. Any panel vertex still out of reach gets
+an extra prop. Coverage is checked with a SpatialHash, so a 500-panel zone
+solves in seconds. The output is a PropTable, the same table the labels are built from.
+
+Requires CPython 3 with NumPy.
+"""
+import numpy as np
+
+import MeshArrays
+import PropTable
+from SpatialHash import SpatialHash
+
+MAX_SPACING = 1.2       # Max distance between adjacent props (m)
+MAX_CANTILEVER = 0.3    # Max overhang past the outer props (m)
+TOLERANCE = 0.001       # Spans within 1mm of a rule still pass
+
+
+def line_positions(low, high, max_spacing=MAX_SPACING, max_cantilever=MAX_CANTILEVER):
+    """
+    Returns the fewest prop lines covering [low, high] within both rules.
+    """
+    length = high - low
+    if length <= 2 * max_cantilever + TOLERANCE:
+        return np.array([0.5 * (low + high)])
+    count = int(np.ceil((length - 2 * max_cantilever - TOLERANCE) / max_spacing)) + 1
+    return np.linspace(low + max_cantilever, high - max_cantilever, count)
+
+
+def line_count(length, max_spacing=MAX_SPACING, max_cantilever=MAX_CANTILEVER):
+    """
+    Vectorized len(line_positions()) for an array of extents.
+    """
+    count = np.ceil((length - 2 * max_cantilever - TOLERANCE) / max_spacing) + 1
+    return np.where(length <= 2 * max_cantilever + TOLERANCE, 1, count).astype(np.int64)
+
+
+def plan_axes(points, max_spacing=MAX_SPACING, max_cantilever=MAX_CANTILEVER, step=5.0, edges=None):
+    """
+    Returns (center, 2x2 rows of unit axes) for the prop grid of XY points.
+
+    The candidates are the principal axes, every rotation in step-degree
+    increments and the directions of the given (k, 2) edge vectors. The axes
+    giving the fewest props win, with the smallest bounding rectangle
+    breaking ties.
+    """
+    center = points.mean(axis=0)
+    _, _, principal = np.linalg.svd(points - center, full_matrices=False)
+    angles = [[np.arctan2(principal[0, 1], principal[0, 0])], np.radians(np.arange(0.0, 90.0, step))]
+    if edges is not None and len(edges):
+        directions = np.mod(np.arctan2(edges[:, 1], edges[:, 0]), np.pi / 2)
+        angles.append(directions[np.unique(np.round(directions, 3), return_index=True)[1]])
+    angles = np.concatenate(angles)
+    u = np.column_stack([np.cos(angles), np.sin(angles)])
+    v = np.column_stack([-u[:, 1], u[:, 0]])
+    along = (points - center) @ u.T
+    across = (points - center) @ v.T
+    extent_u = along.max(axis=0) - along.min(axis=0)
+    extent_v = across.max(axis=0) - across.min(axis=0)
+    props = line_count(extent_u, max_spacing, max_cantilever) * line_count(extent_v, max_spacing, max_cantilever)
+    best = np.lexsort((extent_u * extent_v, props))[0]
+    return center, np.array([u[best], v[best]])
+
+
+def reach(max_spacing=MAX_SPACING, max_cantilever=MAX_CANTILEVER):
+    """
+    Returns the largest plan distance from any point of the panel to its
+    nearest prop on a grid that meets both rules.
+    """
+    half = max(0.5 * max_spacing, max_cantilever)
+    return float(np.hypot(half, half))
+
+
+def layout_points(vertices, faces, max_spacing=MAX_SPACING, max_cantilever=MAX_CANTILEVER):
+    """
+    Chooses prop positions for one panel.
+
+    Args:
+        vertices: (n, 3) aligned panel vertices.
+        faces: (m, 4) panel faces.
+
+    Returns:
+        np.ndarray: (k, 3) prop tops on the underside of the panel.
+    """
+    vertices = MeshArrays.as_vertices(vertices)
+    faces = MeshArrays.as_faces(faces)
+    plan = vertices[:, :2]
+    edges = np.concatenate([plan[np.roll(loop, -1)] - plan[loop] for loop in MeshArrays.boundary_loops(faces)]
+                           or [np.empty((0, 2))])
+    center, axes = plan_axes(plan, max_spacing, max_cantilever, edges=edges)
+    local = (plan - center) @ axes.T
+    us = line_positions(local[:, 0].min(), local[:, 0].max(), max_spacing, max_cantilever)
+    vs = line_positions(local[:, 1].min(), local[:, 1].max(), max_spacing, max_cantilever)
+    grid = np.stack(np.meshgrid(us, vs, indexing="ij"), axis=-1).reshape(-1, 2) @ axes + center
+
+    # Drop each grid point vertically onto the panel; the lowest hit is the
+    # underside the prop supports
+    below = vertices[:, 2].min() - 1.0
+    starts = np.column_stack([grid, np.full(len(grid), below)])
+    tops, hit = MeshArrays.intersect_lines(vertices, faces, starts, (0.0, 0.0, 1.0))
+
+    # Grid points off an irregular footprint move to the nearest vertex
+    distance = reach(max_spacing, max_cantilever)
+    vertex_index = SpatialHash(plan, distance)
+    if not hit.all():
+        nearest, _ = vertex_index.nearest(grid[~hit], distance)
+        snapped = vertices[nearest[nearest >= 0]]
+        tops = np.vstack([tops[hit], snapped])
+        tops = tops[np.unique(np.round(tops, 6), axis=0, return_index=True)[1]]
+
+    # Vertices out of reach (notches, narrow arms) get their own prop
+    distance += TOLERANCE
+    if len(tops):
+        _, gap = SpatialHash(tops[:, :2], distance).nearest(plan, distance)
+        uncovered = np.nonzero(np.isinf(gap))[0]
+    else:
+        uncovered = np.arange(len(vertices))
+    extra = []
+    while len(uncovered):
+        point = vertices[uncovered[0]]
+        extra.append(point)
+        far = np.linalg.norm(plan[uncovered] - point[:2], axis=1) > distance
+        uncovered = uncovered[far]
+    if extra:
+        tops = np.vstack([tops, extra])
+    return tops
+
+
+def layout_panel(vertices, faces, plane_z, origin, panel_id=0, max_spacing=MAX_SPACING,
+                 max_cantilever=MAX_CANTILEVER):
+    """
+    Optimized prop table for one panel.
+
+    Returns:
+        numpy.ndarray: PropTable rows, one per prop ("vertex" is the prop index).
+    """
+    tops = layout_points(vertices, faces, max_spacing, max_cantilever)
+    return PropTable.build_prop_table(tops, plane_z, origin, panel_id)
+
+
+def layout_zone(panels, max_spacing=MAX_SPACING, max_cantilever=MAX_CANTILEVER):
+    """
+    Optimized prop table for a zone.
+
+    Args:
+        panels: Iterable of (vertices, faces, plane_z, origin) per panel; the
+            panel id is the position in the iterable.
+
+    Returns:
+        numpy.ndarray: Stacked PropTable rows of every panel.
+    """
+    return PropTable.stack_tables(
+        layout_panel(vertices, faces, plane_z, origin, panel_id, max_spacing, max_cantilever)
+        for panel_id, (vertices, faces, plane_z, origin) in enumerate(panels))
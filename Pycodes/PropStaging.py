@@ -0,0 +1,182 @@
+import Rhino.Geometry as rg
+import scriptcontext as sc
+
+# Prop geometry (units in meters)
+POST_RADIUS = 0.01      # Post: 20mm diameter, from vertex down to working plane
+CAP_RADIUS = 0.02       # Base cap: 40mm diameter
+CAP_HEIGHT = 0.08       # Base cap: 80mm height
+MARKER_RADIUS = 0.01    # Sphere marker at the top of each post
+TEXT_HEIGHT = 0.06      # Label text height
+MIN_HEIGHT = 0.001      # Props this short (at the working plane) get no post
+
+# Block definitions for instanced props: a unit-height post, the base cap and
+# the marker, each defined once at the world origin
+POST_BLOCK = "Prop Post"
+CAP_BLOCK = "Prop Cap"
+MARKER_BLOCK = "Prop Marker"
+
+
+def prop_label(local_point, height):
+    """Returns the X/Y/Z/H label text for one prop."""
+    return "X={:.2f}\nY={:.2f}\nZ={:.2f}\nH={:.2f}".format(
+        local_point[0], local_point[1], local_point[2], height)
+
+
+def coordinate_label(point):
+    """Returns the project coordinate label text for one vertex."""
+    return "X={:.2f}\nY={:.2f}\nZ={:.2f}".format(point[0], point[1], point[2])
+
+
+def placement(point, scale_z=1.0):
+    """Returns the 4x4 row-major transform scaling Z by scale_z, then moving the origin to point."""
+    return ((1.0, 0.0, 0.0, point[0]),
+            (0.0, 1.0, 0.0, point[1]),
+            (0.0, 0.0, scale_z, point[2]),
+            (0.0, 0.0, 0.0, 1.0))
+
+
+def block_geometry(name):
+    """Returns the unit geometry of a prop block definition."""
+    origin = rg.Point3d(0, 0, 0)
+    if name == POST_BLOCK:
+        return [rg.Cylinder(rg.Circle(origin, POST_RADIUS), 1.0).ToBrep(False, False)]
+    if name == CAP_BLOCK:
+        return [rg.Cylinder(rg.Circle(origin, CAP_RADIUS), CAP_HEIGHT).ToBrep(False, False)]
+    return [rg.Sphere(origin, MARKER_RADIUS).ToBrep()]
+
+
+class PropStage:
+    """
+    Collects prop lines, posts, caps, markers and labels as plain records and
+    adds them to the document in a single pass.
+
+    Nothing touches the document until commit() is called, so building the
+    records costs no document round-trips and no temporary circles.
+
+    In instanced mode, posts, caps and markers are block instances of three
+    shared definitions (POST_BLOCK, CAP_BLOCK, MARKER_BLOCK) placed with a
+    scale/translate transform, so the file holds three breps however many
+    props there are.
+    """
+
+    def __init__(self, instanced=False):
+        """
+        Initializes an empty stage.
+
+        Args:
+            instanced: Stage posts, caps and markers as block instances.
+        """
+        self.records = []       # (key, kind, data) in staging order
+        self.instanced = instanced
+        self.document_calls = 0
+        self.flat_props = 0     # Props at the working plane, staged without a post
+
+    def add_prop(self, pt, base_z, origin, key=None, label_coordinates=True):
+        """
+        Stages one prop under a mesh vertex.
+
+        Args:
+            pt: The vertex (x, y, z) the prop supports.
+            base_z: Z of the working plane the prop stands on.
+            origin: The local origin used for the X/Y/Z label.
+            key: Optional key (usually the vertex index) stored with each record.
+            label_coordinates: Also label the vertex with its project coordinates.
+        """
+        top = (pt[0], pt[1], pt[2])
+        base = (pt[0], pt[1], base_z)
+        height = abs(top[2] - base[2])
+        low = min(top, base, key=lambda point: point[2])
+        local = (pt[0] - origin[0], pt[1] - origin[1], pt[2] - origin[2])
+
+        if height > MIN_HEIGHT:
+            self.records.append((key, "line", (top, base)))
+            if self.instanced:
+                self.records.append((key, "instance", (POST_BLOCK, placement(low, height))))
+            else:
+                self.records.append((key, "post", (low, POST_RADIUS, height)))
+        else:
+            # A zero-height post has no geometry (singular block transform)
+            self.flat_props += 1
+        if self.instanced:
+            self.records.append((key, "instance", (MARKER_BLOCK, placement(top))))
+            self.records.append((key, "instance", (CAP_BLOCK, placement(base))))
+        else:
+            self.records.append((key, "sphere", (top, MARKER_RADIUS)))
+            self.records.append((key, "post", (base, CAP_RADIUS, CAP_HEIGHT)))
+        self.records.append((key, "text", (prop_label(local, height), base, TEXT_HEIGHT)))
+        if label_coordinates:
+            self.records.append((key, "text", (coordinate_label(top), top, TEXT_HEIGHT)))
+
+    def add_text(self, text, point, height=TEXT_HEIGHT, key=None):
+        """
+        Stages a single text label.
+        """
+        self.records.append((key, "text", (text, tuple(point), height)))
+
+    def keys(self):
+        """
+        Returns the record keys in staging order (parallel to commit()'s ids).
+        """
+        return [record[0] for record in self.records]
+
+    def block_index(self, doc, name):
+        """
+        Returns the index of a prop block definition, adding it on first use.
+        """
+        definition = doc.InstanceDefinitions.Find(name)
+        if definition is not None:
+            return definition.Index
+        self.document_calls += 1
+        return doc.InstanceDefinitions.Add(name, "Formwork prop", rg.Point3d(0, 0, 0), block_geometry(name))
+
+    def commit(self, doc=None):
+        """
+        Adds every staged record to the document in one undoable pass.
+
+        Args:
+            doc: The Rhino document. Defaults to scriptcontext.doc.
+
+        Returns:
+            list: Object ids in staging order.
+        """
+        doc = doc or sc.doc
+        redraw = doc.Views.RedrawEnabled
+        doc.Views.RedrawEnabled = False
+        undo_record = doc.BeginUndoRecord("Stage props")
+        dimstyle = doc.DimStyles.Current
+        blocks = {}
+        ids = []
+        for key, kind, data in self.records:
+            if kind == "line":
+                top, base = data
+                object_id = doc.Objects.AddLine(rg.Point3d(*top), rg.Point3d(*base))
+            elif kind == "post":
+                base, radius, height = data
+                circle = rg.Circle(rg.Point3d(*base), radius)
+                surface = rg.Surface.CreateExtrusion(circle.ToNurbsCurve(), rg.Vector3d(0, 0, height))
+                object_id = doc.Objects.AddSurface(surface)
+            elif kind == "instance":
+                name, matrix = data
+                if name not in blocks:
+                    blocks[name] = self.block_index(doc, name)
+                xform = rg.Transform(1.0)
+                for i in range(4):
+                    for j in range(4):
+                        xform[i, j] = matrix[i][j]
+                object_id = doc.Objects.AddInstanceObject(blocks[name], xform)
+            elif kind == "sphere":
+                center, radius = data
+                object_id = doc.Objects.AddSphere(rg.Sphere(rg.Point3d(*center), radius))
+            else:
+                text, point, height = data
+                plane = rg.Plane(rg.Point3d(*point), rg.Vector3d.ZAxis)
+                entity = rg.TextEntity.Create(text, plane, dimstyle, False, 0, 0)
+                entity.TextHeight = height
+                object_id = doc.Objects.AddText(entity)
+            self.document_calls += 1
+            ids.append(object_id)
+        doc.EndUndoRecord(undo_record)
+        doc.Views.RedrawEnabled = redraw
+        if self.flat_props:
+            print("{} props at the working plane staged without a post".format(self.flat_props))
+        return ids
@@ -0,0 +1,153 @@
+"""
+Vectorized support-prop table.
+
+Computes the X/Y/Z (relative to the panel origin) and height H of every prop
+in one NumPy pass over the remeshed vertex array, instead of one text dot per
+vertex. The table can be written to CSV for site teams and to a binary .npy
+file for reloading without Rhino.
+
+Requires CPython 3 with NumPy (Rhino 8 "#! python3" scripts or plain Python).
+"""
+import os
+
+import numpy as np
+
+PROP_DTYPE = np.dtype([
+    ("panel_id", "i4"),
+    ("vertex", "i4"),
+    ("local_x", "f8"),
+    ("local_y", "f8"),
+    ("local_z", "f8"),
+    ("x", "f8"),
+    ("y", "f8"),
+    ("z", "f8"),
+    ("height", "f8"),
+])
+
+CSV_FORMAT = ["%d", "%d"] + ["%.4f"] * 7
+MIN_HEIGHT = 0.001      # Props this short (at the working plane) get no post
+
+
+def as_points(points):
+    """
+    Returns points (Point3d list, tuples or an array) as an (n, 3) float array.
+    """
+    if isinstance(points, np.ndarray):
+        return points.reshape(-1, 3).astype(float)
+    return np.array([(pt[0], pt[1], pt[2]) for pt in points], dtype=float).reshape(-1, 3)
+
+
+def build_prop_table(vertices, plane_z, origin, panel_id=0):
+    """
+    Builds the prop table for one panel.
+
+    Args:
+        vertices: The remeshed vertices, (n, 3) array or list of points.
+        plane_z: Z of the working plane the props stand on.
+        origin: The panel origin (Point 1) used for the local coordinates.
+        panel_id: Id written to every row of this panel.
+
+    Returns:
+        numpy.ndarray: Structured array with PROP_DTYPE, one row per vertex.
+    """
+    points = as_points(vertices)
+    local = points - np.asarray(origin, dtype=float)[:3]
+
+    table = np.empty(len(points), dtype=PROP_DTYPE)
+    table["panel_id"] = panel_id
+    table["vertex"] = np.arange(len(points))
+    table["local_x"], table["local_y"], table["local_z"] = local.T
+    table["x"], table["y"], table["z"] = points.T
+    table["height"] = np.abs(points[:, 2] - plane_z)
+    return table
+
+
+def stack_tables(tables):
+    """
+    Concatenates the tables of several panels into one.
+    """
+    tables = list(tables)
+    if not tables:
+        return np.empty(0, dtype=PROP_DTYPE)
+    return np.concatenate(tables)
+
+
+def prop_labels(table):
+    """
+    Returns the X/Y/Z/H label text of every row, matching the Rhino text dots.
+    """
+    return ["X={:.2f}\nY={:.2f}\nZ={:.2f}\nH={:.2f}".format(*row) for row in
+            zip(table["local_x"], table["local_y"], table["local_z"], table["height"])]
+
+
+def instance_transforms(table, plane_z, min_height=MIN_HEIGHT):
+    """
+    Builds the block-instance transforms of every prop in one pass.
+
+    The post block is a unit-height cylinder at the origin, scaled in Z by
+    the prop height and moved to the lower end of the prop, so a vertex below
+    the working plane does not get a mirrored post; the cap moves to the
+    base and the marker to the top (see PropStaging). Props no taller than
+    min_height would get a singular post transform: like PropStage.add_prop,
+    they get a cap and a marker but no post.
+
+    Returns:
+        dict: {"cap", "marker": (n, 4, 4) arrays, one per row, "post":
+            (m, 4, 4) array, row-major like Rhino.Geometry.Transform, and
+            "post_rows": (m,) the table rows that have a post}.
+    """
+    count = len(table)
+    top = np.column_stack([table["x"], table["y"], table["z"]])
+    base = top.copy()
+    base[:, 2] = plane_z
+    post_rows = np.nonzero(table["height"] > min_height)[0]
+    low = base[post_rows]
+    low[:, 2] = np.minimum(top[post_rows, 2], plane_z)
+
+    transforms = {"post_rows": post_rows}
+    for name, point, scale in (("post", low, table["height"][post_rows]),
+                               ("cap", base, np.ones(count)),
+                               ("marker", top, np.ones(count))):
+        xform = np.tile(np.eye(4), (len(point), 1, 1))
+        xform[:, 2, 2] = scale
+        xform[:, :3, 3] = point
+        transforms[name] = xform
+    return transforms
+
+
+def write_csv(table, path):
+    """
+    Writes the table as CSV with a header row.
+    """
+    columns = np.column_stack([table[name] for name in PROP_DTYPE.names])
+    np.savetxt(path, columns, fmt=CSV_FORMAT, delimiter=",",
+               header=",".join(PROP_DTYPE.names), comments="")
+    return path
+
+
+def save_table(table, path):
+    """
+    Writes the table as a binary .npy file.
+    """
+    np.save(path, table, allow_pickle=False)
+    return path
+
+
+def load_table(path):
+    """
+    Loads a table written by save_table().
+    """
+    return np.load(path, allow_pickle=False)
+
+
+def export_prop_table(table, path):
+    """
+    Writes the table next to path as both <name>.csv and <name>.npy.
+
+    Returns:
+        tuple: (csv path, npy path), or None if no path was given.
+    """
+    if not path:
+        return None
+    stem = os.path.splitext(path)[0]
+    return write_csv(table, stem + ".csv"), save_table(table, stem + ".npy")
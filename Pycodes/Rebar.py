@@ -1,5 +1,9 @@
 import rhinoscriptsyntax as rs
 import Rhino.Geometry as rg
+try:
+    import PolygonOffset  # NumPy single-sweep inward offsets (CPython)
+except ImportError:
+    PolygonOffset = None
 
 class RebarGenerator:
     """Generates rebar curves around a mesh."""
@@ -28,7 +32,7 @@ class RebarGenerator:
         """Retrieves and validates the mesh object."""
         self.mesh = rs.coercemesh(self.mesh_id)
         if not self.mesh:
-            print "Invalid mesh input."
+            print("Invalid mesh input.")
             return False
         return True
 
@@ -36,7 +40,7 @@ class RebarGenerator:
         """Extracts the boundary curves from the mesh."""
         self.boundary_curves = self.mesh.GetOutlines(rg.Plane.WorldXY)
         if not self.boundary_curves:
-            print "Could not extract boundary curves from the mesh."
+            print("Could not extract boundary curves from the mesh.")
             return False
         return True
 
@@ -69,6 +73,8 @@ class RebarGenerator:
         
     def generate_rebar_curves(self):
         """Generates rebar curves along the offset curves with specified spacing."""
+        if PolygonOffset is not None:
+            return self.generate_rebar_polylines()
         for curve in self.offset_curves:
             self.rebar_curves.append(curve)
             length = curve.GetLength()
@@ -89,6 +95,17 @@ class RebarGenerator:
                             self.rebar_curves.append(new_curves[0])
         return True
 
+    def generate_rebar_polylines(self):
+        """
+        Generates every rebar line of the mesh outlines in one inward sweep
+        (PolygonOffset): the offset at offset_distance, then one more per
+        spacing until the slab region vanishes. Bars are (k, 3) point arrays.
+        """
+        outlines = [[(p.X, p.Y, p.Z) for p in polyline] for polyline in self.boundary_curves]
+        loops = PolygonOffset.offset_outlines(outlines, self.spacing, self.offset_distance)
+        self.rebar_curves = [loop.points for loop in loops]
+        print("{} rebar lines from {} outlines".format(len(loops), len(outlines)))
+        return True
 
     def create_rebar_layer(self):
         """Creates the rebar layer if it doesn't exist."""
@@ -99,10 +116,10 @@ class RebarGenerator:
     def add_rebar_to_layer(self):
         """Adds the generated rebar curves to the layer."""
         for curve in self.rebar_curves:
-            curve_id = rs.AddCurve(curve)
+            curve_id = rs.AddPolyline(curve.tolist()) if PolygonOffset is not None else rs.AddCurve(curve)
             if curve_id:
                 rs.ObjectLayer(curve_id, self.layer_name)
-        print "Rebar curves created on layer:", self.layer_name
+        print("Rebar curves created on layer:", self.layer_name)
         return True
 
     def run(self):
@@ -111,7 +128,7 @@ class RebarGenerator:
             return
         if not self.extract_boundary_curves():
             return
-        if not self.create_offset_curves():
+        if PolygonOffset is None and not self.create_offset_curves():
             return
         if not self.generate_rebar_curves():
             return
@@ -0,0 +1,317 @@
+"""
+Clash detection between rebar and formwork props.
+
+CurveProcessor's rebar (RebarModel) and MeshProcessor's prop posts (PropTable)
+are generated independently, so clashes used to turn up on site. Both are
+capsules here: a bar is one capsule per centreline segment with the bar
+radius, a post runs from its working-plane base to its top with the post
+radius.
+
+1. Capsules are cut into pieces no longer than the hash cell.
+2. The second set's pieces are binned into every cell of a uniform 3D grid
+   their radius-grown bounding box touches (SpatialHash.cell_keys), sorted
+   by key.
+3. The first set's pieces look up the cells of their own grown boxes, in
+   chunks. A candidate pair is kept in one cell only: the lowest cell shared
+   by both boxes.
+4. Candidates get the exact segment-segment distance; pairs closer than the
+   radius sum (plus an optional clearance) clash, and the worst piece pair
+   is reported per bar and prop.
+
+    python RebarClash.py rebar.npz results/panel_* --prop-radius 0.01 -o clashes.csv
+
+Prop tables are in their panel's aligned frame, while the bars are in project
+coordinates. The CLI therefore takes FormworkBatch bundle folders: each
+panel's props are built on its plane_z and mapped back to project
+coordinates with the panel.json inverse before hashing.
+
+Requires CPython 3 with NumPy.
+"""
+import argparse
+import collections
+import csv
+import json
+import os
+import time
+
+import numpy as np
+
+import MeshArrays
+import PropTable
+import RebarModel
+from SpatialHash import cell_keys
+
+PROP_RADIUS = 0.01      # Post radius (m), as PropStaging.POST_RADIUS
+CHUNK = 200000          # First-set cell entries looked up per pass
+EPSILON = 1e-12
+
+Capsules = collections.namedtuple("Capsules", "a b radius owner")
+Clashes = collections.namedtuple("Clashes", "first second penetration point")
+
+
+def bar_capsules(model):
+    """One capsule per centreline segment of a RebarModel; owner is the bar."""
+    a, b, bar = model.segments()
+    return Capsules(a, b, model.diameters[bar] / 2.0, bar)
+
+
+def prop_capsules(table, plane_z, radius=PROP_RADIUS, transform=None):
+    """
+    One capsule per PropTable row, between the working plane and the prop's
+    vertex (either may be the lower end, as in PropTable.instance_transforms).
+
+    Args:
+        table: PropTable rows, in the frame plane_z belongs to.
+        plane_z: Z of the working plane, scalar or per row.
+        radius: Post radius.
+        transform: Optional 4x4 transform applied to both ends, e.g. a
+            panel's inverse alignment back to project coordinates.
+    """
+    top = np.column_stack([table["x"], table["y"], table["z"]])
+    low, high = top.copy(), top.copy()
+    low[:, 2] = np.minimum(table["z"], plane_z)
+    high[:, 2] = np.maximum(table["z"], plane_z)
+    if transform is not None:
+        low, high = MeshArrays.transform_points(low, transform), MeshArrays.transform_points(high, transform)
+    return Capsules(low, high, np.full(len(table), float(radius)), np.arange(len(table)))
+
+
+def bundle_props(folder, radius=PROP_RADIUS):
+    """
+    Prop table and project-coordinate capsules of a FormworkBatch bundle
+    (props.npy in the aligned frame, plane_z and inverse from panel.json).
+
+    Returns:
+        tuple: (table, Capsules).
+    """
+    with open(os.path.join(folder, "panel.json")) as handle:
+        panel = json.load(handle)
+    table = PropTable.load_table(os.path.join(folder, "props.npy"))
+    return table, prop_capsules(table, panel["plane_z"], radius, np.array(panel["inverse"]))
+
+
+def segment_distance(p1, q1, p2, q2):
+    """
+    Exact distance between segments p1-q1 and p2-q2, row by row.
+
+    Returns:
+        tuple: (distances, s, t), the closest points being p1 + s (q1 - p1)
+            and p2 + t (q2 - p2).
+    """
+    d1, d2, r = q1 - p1, q2 - p2, p1 - p2
+    a = np.einsum("ij,ij->i", d1, d1)
+    e = np.einsum("ij,ij->i", d2, d2)
+    f = np.einsum("ij,ij->i", d2, r)
+    c = np.einsum("ij,ij->i", d1, r)
+    b = np.einsum("ij,ij->i", d1, d2)
+    point_a = a <= EPSILON
+    point_e = e <= EPSILON
+    safe_a = np.where(point_a, 1.0, a)
+    safe_e = np.where(point_e, 1.0, e)
+    denom = a * e - b * b
+    parallel = denom <= EPSILON * np.maximum(a * e, EPSILON)
+    s = np.where(parallel, 0.0, np.clip((b * f - c * e) / np.where(parallel, 1.0, denom), 0.0, 1.0))
+    t = (b * s + f) / safe_e
+    s = np.where(t < 0.0, np.clip(-c / safe_a, 0.0, 1.0), np.where(t > 1.0, np.clip((b - c) / safe_a, 0.0, 1.0), s))
+    t = np.clip(t, 0.0, 1.0)
+    # Degenerate segments
+    s = np.where(point_a, 0.0, np.where(point_e, np.clip(-c / safe_a, 0.0, 1.0), s))
+    t = np.where(point_e, 0.0, np.where(point_a, np.clip(f / safe_e, 0.0, 1.0), t))
+    gap = (p1 + s[:, None] * d1) - (p2 + t[:, None] * d2)
+    return np.sqrt(np.einsum("ij,ij->i", gap, gap)), s, t
+
+
+def split_capsules(capsules, length):
+    """
+    Cuts capsules into pieces no longer than length.
+
+    Returns:
+        Capsules: The pieces; owner is the index of the source capsule.
+    """
+    a, b = capsules.a, capsules.b
+    pieces = np.maximum(np.ceil(np.linalg.norm(b - a, axis=1) / length), 1).astype(np.int64)
+    source = np.repeat(np.arange(len(a)), pieces)
+    step = np.arange(len(source)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    t0 = (step / pieces[source])[:, None]
+    t1 = ((step + 1) / pieces[source])[:, None]
+    d = (b - a)[source]
+    return Capsules(a[source] + t0 * d, a[source] + t1 * d, capsules.radius[source], source)
+
+
+class CapsuleHash(object):
+    """
+    Capsule pieces binned into every grid cell their grown box touches.
+    """
+
+    def __init__(self, capsules, cell, origin):
+        self.pieces = split_capsules(capsules, cell)
+        self.cell = float(cell)
+        self.origin = np.asarray(origin, dtype=float)
+        self.low, high = self.cell_ranges(self.pieces, 0.0)
+        piece, cells = self.enumerate_cells(self.low, high)
+        keys = cell_keys(cells)
+        order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[order]
+        self.sorted_pieces = piece[order]
+
+    def cell_ranges(self, pieces, clearance):
+        """Lowest and highest cell of every piece's box, grown by its radius."""
+        grow = (pieces.radius + clearance)[:, None]
+        low = np.minimum(pieces.a, pieces.b) - grow
+        high = np.maximum(pieces.a, pieces.b) + grow
+        return (np.floor((low - self.origin) / self.cell).astype(np.int64),
+                np.floor((high - self.origin) / self.cell).astype(np.int64))
+
+    @staticmethod
+    def enumerate_cells(low, high):
+        """Returns (piece, cell) for every cell of every piece's cell range."""
+        size = high - low + 1
+        counts = size.prod(axis=1)
+        piece = np.repeat(np.arange(len(low)), counts)
+        local = np.arange(len(piece)) - np.repeat(np.cumsum(counts) - counts, counts)
+        size = size[piece]
+        cells = low[piece].copy()
+        cells[:, 2] += local % size[:, 2]
+        local //= size[:, 2]
+        cells[:, 1] += local % size[:, 1]
+        cells[:, 0] += local // size[:, 1]
+        return piece, cells
+
+    def query(self, capsules, clearance=0.0, chunk=CHUNK):
+        """
+        Returns every (query piece, hashed piece) pair closer than the sum of
+        their radii plus clearance.
+
+        Args:
+            capsules: Query Capsules.
+            clearance: Extra distance counted as a clash.
+            chunk: Query cell entries per pass.
+
+        Returns:
+            tuple: (query pieces as Capsules, query piece indices, hashed
+                piece indices, distances, points); points are the midpoints
+                between the closest points.
+        """
+        pieces = split_capsules(capsules, self.cell)
+        low, high = self.cell_ranges(pieces, clearance)
+        counts = (high - low + 1).prod(axis=1)
+        ends = np.cumsum(counts)
+        found = []
+        start = 0
+        while start < len(pieces.a):
+            stop = max(int(np.searchsorted(ends, ends[start] - counts[start] + chunk, side="right")), start + 1)
+            piece, cells = self.enumerate_cells(low[start:stop], high[start:stop])
+            piece += start
+            keys = cell_keys(cells)
+            first = np.searchsorted(self.sorted_keys, keys, side="left")
+            count = np.searchsorted(self.sorted_keys, keys, side="right") - first
+            entry = np.repeat(np.arange(len(keys)), count)
+            position = np.repeat(first - np.cumsum(count) + count, count) + np.arange(len(entry))
+            query, other = piece[entry], self.sorted_pieces[position]
+            # Each pair once: in the lowest cell both ranges share
+            own = (cells[entry] == np.maximum(low[query], self.low[other])).all(axis=1)
+            query, other = query[own], other[own]
+            p2, q2 = self.pieces.a[other], self.pieces.b[other]
+            distance, s, t = segment_distance(pieces.a[query], pieces.b[query], p2, q2)
+            near = distance < pieces.radius[query] + self.pieces.radius[other] + clearance
+            query, other, s, t = query[near], other[near], s[near], t[near]
+            point = 0.5 * (pieces.a[query] + s[:, None] * (pieces.b[query] - pieces.a[query])
+                           + p2[near] + t[:, None] * (q2[near] - p2[near]))
+            found.append((query, other, distance[near], point))
+            start = stop
+        if not found:
+            empty = np.empty(0, dtype=np.int64)
+            return pieces, empty, empty, np.empty(0), np.empty((0, 3))
+        return (pieces,) + tuple(np.concatenate(column) for column in zip(*found))
+
+
+def auto_cell(first, second):
+    """
+    Cell size: the plan spacing of the second set's capsules, but at least
+    twice the largest reach between two capsules.
+    """
+    points = np.concatenate([second.a, second.b])
+    extent = points.max(axis=0) - points.min(axis=0)
+    spacing = np.sqrt(max(extent[0] * extent[1], EPSILON) / max(len(second.a), 1))
+    return max(spacing, 2.0 * (first.radius.max() + second.radius.max()))
+
+
+def clashes(first, second, cell=None, clearance=0.0, chunk=CHUNK):
+    """
+    Clashes between two capsule sets, one row per (first owner, second
+    owner) pair with the deepest penetration.
+
+    Args:
+        first: Query Capsules (the larger set, e.g. bar_capsules).
+        second: Hashed Capsules (e.g. prop_capsules).
+        cell: Hash cell size. Defaults to auto_cell().
+        clearance: Extra distance counted as a clash; penetration is then
+            negative for pairs that are close but not touching.
+        chunk: Query cell entries per pass.
+
+    Returns:
+        Clashes: first and second owner ids, penetration depth (radius sum
+            minus distance) and the (n, 3) clash point, deepest first.
+    """
+    if not len(first.a) or not len(second.a):
+        empty = np.empty(0, dtype=np.int64)
+        return Clashes(empty, empty, np.empty(0), np.empty((0, 3)))
+    cell = cell or auto_cell(first, second)
+    origin = np.minimum(first.a.min(axis=0), second.a.min(axis=0))
+    hashed = CapsuleHash(second, cell, origin)
+    pieces, query, other, distance, point = hashed.query(first, clearance, chunk)
+    owner_first = first.owner[pieces.owner[query]]
+    owner_second = second.owner[hashed.pieces.owner[other]]
+    penetration = pieces.radius[query] + hashed.pieces.radius[other] - distance
+    order = np.lexsort((-penetration, owner_second, owner_first))
+    pairs = np.column_stack([owner_first, owner_second])[order]
+    keep = np.ones(len(order), dtype=bool)
+    keep[1:] = (pairs[1:] != pairs[:-1]).any(axis=1)
+    order = order[keep]
+    order = order[np.argsort(-penetration[order], kind="stable")]
+    return Clashes(owner_first[order], owner_second[order], penetration[order], point[order])
+
+
+def write_csv(result, path, first_names=None, second_names=None):
+    """Writes one row per clash, with optional names for both sets' ids."""
+    with open(path, "w", newline="") as stream:
+        writer = csv.writer(stream)
+        writer.writerow(["first", "first_name", "second", "second_name", "penetration", "x", "y", "z"])
+        for first, second, penetration, point in zip(*result):
+            writer.writerow([first, first_names[first] if first_names else "", second,
+                             second_names[second] if second_names else "", "{:.5f}".format(penetration)]
+                            + ["{:.4f}".format(v) for v in point])
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clashes between rebar models and prop tables.")
+    parser.add_argument("rebar", help="RebarModel .npz file")
+    parser.add_argument("bundles", nargs="+", help="FormworkBatch panel bundle folders")
+    parser.add_argument("-o", "--out", default="clashes.csv", help="Clash report CSV")
+    parser.add_argument("--prop-radius", type=float, default=PROP_RADIUS, help="Post radius (model units)")
+    parser.add_argument("--clearance", type=float, default=0.0, help="Extra distance counted as a clash")
+    parser.add_argument("--cell", type=float, default=None, help="Hash cell size (model units)")
+    args = parser.parse_args()
+
+    start = time.time()
+    model = RebarModel.RebarModel.load(args.rebar)
+    for folder in args.bundles:
+        if not os.path.isfile(os.path.join(folder, "panel.json")):
+            parser.error("{} is not a panel bundle (no panel.json to map its props to project coordinates)"
+                         .format(folder))
+    panels = [bundle_props(folder, args.prop_radius) for folder in args.bundles]
+    table = PropTable.stack_tables(panel[0] for panel in panels)
+    posts = Capsules(*(np.concatenate([panel[1][k] for panel in panels]) for k in range(3)),
+                     owner=np.arange(len(table)))
+    result = clashes(bar_capsules(model), posts, args.cell, args.clearance)
+    bars = model.names(range(len(model)))
+    props = ["{}:{}".format(panel, vertex) for panel, vertex in zip(table["panel_id"], table["vertex"])]
+    write_csv(result, args.out, bars, props)
+    print("{} bars x {} props: {} clashes (deepest {:.4f}) -> {} in {:.2f}s".format(
+        len(model), len(table), len(result.first), result.penetration.max() if len(result.first) else 0.0,
+        args.out, time.time() - start))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Concrete cover check of rebar against the shell surfaces.
+
+Rebar_3 lays its bars out from a 25 mm rs.MeshOffset of the shell, but once
+the bars are projected and arrayed nothing checked that they still keep the
+cover. Here every bar centreline of a RebarModel is sampled and the samples
+are measured against the inner and outer shell meshes with batched MeshBVH
+queries (one prebuilt hierarchy per shell):
+
+- the distance is signed with the normal of the closest face, each shell
+  being oriented towards the other one (the concrete side), so a bar poking
+  through a surface, or lying outside both, gets a negative cover; a single
+  shell is oriented so that most samples lie on its positive side;
+- cover is the distance minus the bar radius, and a bar's cover is its
+  smallest sample cover over both shells;
+- bars below the required cover are violations, and every bar family
+  (Rebar_D<dia> layer) gets a summary.
+
+    python RebarCover.py rebar.npz inner.obj --outer outer.obj --cover 0.025 -o cover
+
+Requires CPython 3 with NumPy.
+"""
+import argparse
+import collections
+import csv
+import json
+import time
+
+import numpy as np
+
+import MeshArrays
+import MeshBVH
+import MeshConvert
+import RebarModel
+
+COVER = 0.025       # Required cover (model units)
+STEP = 0.1          # Sample spacing along the centrelines (model units)
+PROBES = 1000       # Vertices of the other shell used to orient a shell
+
+Cover = collections.namedtuple("Cover", "cover shell point violation")
+
+
+def sample_centrelines(model, step):
+    """
+    Points every step (at most) along every bar centreline, vertices
+    included.
+
+    Returns:
+        tuple: ((n, 3) points, (n,) bar index), in bar order.
+    """
+    a, b, bar = model.segments()
+    pieces = np.maximum(np.ceil(np.linalg.norm(b - a, axis=1) / step), 1).astype(np.int64)
+    source = np.repeat(np.arange(len(a)), pieces)
+    t = (np.arange(len(source)) - np.repeat(np.cumsum(pieces) - pieces, pieces)) / pieces[source]
+    points = a[source] + t[:, None] * (b - a)[source]
+    # Append each bar's last vertex after its samples
+    ends = model.offsets[1:] - 1
+    owner = np.concatenate([bar[source], np.arange(len(model))])
+    order = np.argsort(owner, kind="stable")
+    return np.concatenate([points, model.points[ends]])[order], owner[order]
+
+
+class CoverCheck(object):
+    """
+    Cover of bars against one or more shells (inner, outer).
+    """
+
+    def __init__(self, shells, cover=COVER, step=STEP, chunk=MeshBVH.CHUNK, workers=1):
+        """
+        Args:
+            shells: Sequence of (name, vertices, faces).
+            cover: Required cover (model units).
+            step: Sample spacing along the centrelines.
+            chunk: Queries per batch.
+            workers: Worker processes for the queries.
+        """
+        self.names = [name for name, _, _ in shells]
+        self.bvhs = [MeshBVH.TriangleBVH(vertices, faces) for _, vertices, faces in shells]
+        self.normals = [MeshArrays.unitize(MeshArrays.face_normals(bvh.vertices, bvh.faces)) for bvh in self.bvhs]
+        self.cover = float(cover)
+        self.step = float(step)
+        self.chunk = chunk
+        self.workers = workers
+        self.orientation = [None] * len(self.bvhs)
+        if len(self.bvhs) > 1:
+            for index, bvh in enumerate(self.bvhs):
+                other = self.bvhs[(index + 1) % len(self.bvhs)].vertices
+                probes = other[np.linspace(0, len(other) - 1, min(PROBES, len(other))).astype(np.int64)]
+                self.orientation[index] = np.median(self._sides(index, probes)[0])
+
+    def _sides(self, index, points):
+        """(n,) side (+1 / -1) of points along shell index's normals, and distances."""
+        closest = self.bvhs[index].closest_points(points, self.chunk, self.workers)
+        side = np.einsum("ij,ij->i", points - closest.points, self.normals[index][closest.faces])
+        return np.where(side < 0.0, -1.0, 1.0), closest.distances
+
+    def signed_distances(self, points):
+        """(n, shells) signed distance from points to every shell."""
+        distances = np.empty((len(points), len(self.bvhs)))
+        for index, orientation in enumerate(self.orientation):
+            sign, distance = self._sides(index, points)
+            if (orientation if orientation is not None else np.median(sign)) < 0.0:
+                sign = -sign
+            distances[:, index] = sign * distance
+        return distances
+
+    def run(self, model):
+        """
+        Returns the Cover of every bar: smallest cover, the shell index it
+        was found against, the (3,) centreline point and the violation flag.
+        """
+        points, bar = sample_centrelines(model, self.step)
+        covers = self.signed_distances(points) - (model.diameters[bar] / 2.0)[:, None]
+        shell = np.argmin(covers, axis=1)
+        covers = covers[np.arange(len(points)), shell]
+        order = np.lexsort((covers, bar))
+        worst = order[np.searchsorted(bar[order], np.arange(len(model)))]
+        return Cover(covers[worst], shell[worst], points[worst], covers[worst] < self.cover)
+
+
+def family_summary(model, result, cover=COVER):
+    """
+    Returns one summary per bar family: bars, violations, smallest and mean
+    bar cover and the 5th percentile.
+    """
+    summary = []
+    for index, family in enumerate(model.groups):
+        members = model.group == index
+        if not members.any():
+            continue
+        covers = result.cover[members]
+        summary.append({"family": family, "diameter": float(model.diameters[members].max()),
+                        "bars": int(members.sum()), "violations": int(result.violation[members].sum()),
+                        "min": float(covers.min()), "mean": float(covers.mean()),
+                        "p5": float(np.percentile(covers, 5)), "required": cover})
+    return summary
+
+
+def write_report(model, result, shells, base, cover=COVER):
+    """
+    Writes <base>_bars.csv (one row per bar) and <base>_summary.json.
+
+    Returns:
+        tuple: (csv path, json path).
+    """
+    names = model.names(range(len(model)))
+    with open(base + "_bars.csv", "w", newline="") as stream:
+        writer = csv.writer(stream)
+        writer.writerow(["bar", "name", "diameter", "cover", "shell", "x", "y", "z", "violation"])
+        for index, (bar_cover, shell, point, violation) in enumerate(zip(*result)):
+            writer.writerow([index, names[index], "{:g}".format(model.diameters[index]), "{:.5f}".format(bar_cover),
+                             shells[shell]] + ["{:.4f}".format(v) for v in point] + [int(violation)])
+    with open(base + "_summary.json", "w") as stream:
+        json.dump(family_summary(model, result, cover), stream, indent=1)
+    return base + "_bars.csv", base + "_summary.json"
+
+
+def rhino_shell(name, mesh):
+    """(name, vertices, faces) of a Rhino.Geometry.Mesh, for CoverCheck."""
+    return (name,) + MeshConvert.mesh_arrays(mesh)
+
+
+def format_summary(s):
+    return "{}: {} bars, {} below {:g} cover, min {:.4f}, p5 {:.4f}, mean {:.4f}".format(
+        s["family"], s["bars"], s["violations"], s["required"], s["min"], s["p5"], s["mean"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concrete cover of rebar models against shell meshes.")
+    parser.add_argument("rebar", help="RebarModel .npz file")
+    parser.add_argument("inner", help="Inner shell OBJ/STL file")
+    parser.add_argument("--outer", default=None, help="Outer shell OBJ/STL file")
+    parser.add_argument("--cover", type=float, default=COVER, help="Required cover (model units)")
+    parser.add_argument("--step", type=float, default=STEP, help="Sample spacing along the bars")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for the queries")
+    parser.add_argument("-o", "--out", default="cover", help="Output path without extension")
+    args = parser.parse_args()
+
+    start = time.time()
+    model = RebarModel.RebarModel.load(args.rebar)
+    shells = [("inner",) + tuple(MeshArrays.read_mesh(args.inner))]
+    if args.outer:
+        shells.append(("outer",) + tuple(MeshArrays.read_mesh(args.outer)))
+    check = CoverCheck(shells, args.cover, args.step, workers=args.workers)
+    result = check.run(model)
+    paths = write_report(model, result, check.names, args.out, args.cover)
+    for summary in family_summary(model, result, args.cover):
+        print(format_summary(summary))
+    print("{} bars, {} violations -> {} in {:.2f}s".format(len(model), int(result.violation.sum()),
+                                                          ", ".join(paths), time.time() - start))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""
+Rebar as centreline records instead of document solids.
+
+CurveProcessor.array_rebar trimmed curve_2, extruded a circle along the piece
+and capped it for every bar, and RebarGenerator.add_rebar_to_layer built a
+brep per bar, so a 50,000-bar slab meant 50,000 breps in the document. A
+RebarModel keeps every bar as a centreline polyline plus a diameter in a few
+flat arrays:
+
+- points (N, 3): every bar's centreline vertices, bar after bar;
+- offsets (m + 1,): bar i is points[offsets[i]:offsets[i + 1]];
+- diameters (m,) and group (m,): the bar's diameter and an index into
+  groups, the bar family's name ("Rebar_D10", "Rebar_1_copy").
+
+Lengths, bounding boxes and capsule segments come straight from the arrays,
+so schedules, clash checks and exports never touch the document. Pipe solids
+are built by add_pipes() only for the bars someone asks to see.
+
+Requires CPython 3 with NumPy.
+"""
+import numpy as np
+
+TOLERANCE = 1e-9    # Bars shorter than this (model units) are dropped
+
+
+def _ranges(starts, counts):
+    """Concatenated arange(start, start + count) for every (start, count)."""
+    counts = np.asarray(counts, dtype=np.int64)
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    first = np.cumsum(counts) - counts
+    return np.arange(total, dtype=np.int64) - np.repeat(first - np.asarray(starts, dtype=np.int64), counts)
+
+
+class RebarModel(object):
+    """
+    Bars as centreline-plus-diameter records (see the module docstring).
+    """
+
+    def __init__(self, points=None, offsets=None, diameters=None, group=None, groups=None):
+        self.points = np.zeros((0, 3)) if points is None else np.asarray(points, dtype=float).reshape(-1, 3)
+        self.offsets = np.zeros(1, dtype=np.int64) if offsets is None else np.asarray(offsets, dtype=np.int64)
+        count = len(self.offsets) - 1
+        self.diameters = np.zeros(count) if diameters is None else np.asarray(diameters, dtype=float)
+        self.group = np.zeros(count, dtype=np.int32) if group is None else np.asarray(group, dtype=np.int32)
+        self.groups = list(groups or (["Rebar"] if count else []))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self):
+        """Bytes held by the arrays."""
+        return self.points.nbytes + self.offsets.nbytes + self.diameters.nbytes + self.group.nbytes
+
+    def group_index(self, name):
+        """Index of a bar family, added if new."""
+        if name not in self.groups:
+            self.groups.append(name)
+        return self.groups.index(name)
+
+    def extend(self, centrelines, diameters, group="Rebar"):
+        """
+        Appends bars.
+
+        Args:
+            centrelines: Sequence of (k, 3) point arrays (k >= 2), or a
+                (points, offsets) pair in the model's own layout.
+            diameters: One diameter for all the bars, or one per bar.
+            group: Bar family name.
+
+        Returns:
+            range: Indices of the new bars.
+        """
+        if isinstance(centrelines, tuple):
+            points, offsets = centrelines
+            points = np.asarray(points, dtype=float).reshape(-1, 3)
+            offsets = np.asarray(offsets, dtype=np.int64)
+        else:
+            centrelines = [np.asarray(c, dtype=float).reshape(-1, 3) for c in centrelines]
+            points = np.concatenate(centrelines) if centrelines else np.zeros((0, 3))
+            offsets = np.concatenate([[0], np.cumsum([len(c) for c in centrelines], dtype=np.int64)])
+        first = len(self)
+        count = len(offsets) - 1
+        self.offsets = np.concatenate([self.offsets, offsets[1:] - offsets[0] + len(self.points)])
+        self.points = np.concatenate([self.points, points[offsets[0]:offsets[-1]]])
+        self.diameters = np.concatenate([self.diameters, np.broadcast_to(np.asarray(diameters, dtype=float), (count,))])
+        self.group = np.concatenate([self.group, np.full(count, self.group_index(group), dtype=np.int32)])
+        return range(first, first + count)
+
+    def merge(self, other):
+        """Appends every bar of another model, keeping its families."""
+        first = len(self)
+        families = np.array([self.group_index(name) for name in other.groups], dtype=np.int32)
+        self.offsets = np.concatenate([self.offsets, other.offsets[1:] + len(self.points)])
+        self.points = np.concatenate([self.points, other.points])
+        self.diameters = np.concatenate([self.diameters, other.diameters])
+        self.group = np.concatenate([self.group, families[other.group]])
+        return range(first, len(self))
+
+    def centreline(self, index):
+        """Bar index's (k, 3) centreline points."""
+        return self.points[self.offsets[index]:self.offsets[index + 1]]
+
+    def centrelines(self):
+        """Every bar's centreline, as views into points."""
+        return np.split(self.points, self.offsets[1:-1])
+
+    def numbers(self):
+        """Every bar's number within its family, in model order."""
+        numbers = np.zeros(len(self), dtype=np.int64)
+        for index in range(len(self.groups)):
+            members = self.group == index
+            numbers[members] = np.arange(np.count_nonzero(members))
+        return numbers
+
+    def names(self, indices):
+        """Names of the given bars: family plus number ("Rebar_1_copy_12")."""
+        numbers = self.numbers()
+        return ["{}_{}".format(self.groups[self.group[i]], numbers[i]) for i in indices]
+
+    def segments(self):
+        """
+        Returns (a, b, bar): the start and end of every centreline segment
+        and the bar it belongs to, i.e. the capsule axes for clash checks.
+        """
+        counts = np.diff(self.offsets)
+        keep = np.ones(len(self.points), dtype=bool)
+        keep[self.offsets[1:] - 1] = False
+        starts = np.nonzero(keep)[0]
+        return self.points[starts], self.points[starts + 1], np.repeat(np.arange(len(self)), counts - 1)
+
+    def lengths(self):
+        """Centreline length of every bar."""
+        a, b, bar = self.segments()
+        return np.bincount(bar, weights=np.linalg.norm(b - a, axis=1), minlength=len(self))
+
+    def bounds(self):
+        """(m, 2, 3) min/max corner of every bar's centreline."""
+        if not len(self):
+            return np.zeros((0, 2, 3))
+        starts = self.offsets[:-1]
+        return np.stack([np.minimum.reduceat(self.points, starts), np.maximum.reduceat(self.points, starts)], axis=1)
+
+    def subset(self, indices):
+        """Returns a new model with the given bars, in the given order."""
+        indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+        counts = np.diff(self.offsets)[indices]
+        points = self.points[_ranges(self.offsets[indices], counts)]
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        return RebarModel(points, offsets, self.diameters[indices], self.group[indices], self.groups)
+
+    def save(self, path):
+        """Writes the model to a .npz file."""
+        np.savez_compressed(path, points=self.points, offsets=self.offsets, diameters=self.diameters,
+                            group=self.group, groups=np.array(self.groups))
+
+    @staticmethod
+    def load(path):
+        with np.load(path) as data:
+            return RebarModel(data["points"], data["offsets"], data["diameters"], data["group"],
+                              [str(g) for g in data["groups"]])
+
+
+def windows_along(path, starts, length):
+    """
+    Cuts windows out of a polyline by arc length: window i runs from
+    starts[i] to min(starts[i] + length, path length). Windows shorter than
+    TOLERANCE are dropped.
+
+    Args:
+        path: (k, 3) polyline points.
+        starts: Arc-length start of every window.
+        length: Window length.
+
+    Returns:
+        tuple: (points, offsets) of the windows, in RebarModel's layout, and
+            the indices of the starts that were kept.
+    """
+    path = np.asarray(path, dtype=float).reshape(-1, 3)
+    cumulative = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(path, axis=0), axis=1))])
+    a = np.clip(np.asarray(starts, dtype=float), 0.0, cumulative[-1])
+    b = np.minimum(a + length, cumulative[-1])
+    kept = np.nonzero(b - a > TOLERANCE)[0]
+    a, b = a[kept], b[kept]
+
+    def point_at(s):
+        segment = np.clip(np.searchsorted(cumulative, s, side="right") - 1, 0, len(path) - 2)
+        span = cumulative[segment + 1] - cumulative[segment]
+        t = np.where(span > 0, (s - cumulative[segment]) / np.where(span > 0, span, 1.0), 0.0)
+        return path[segment] + t[:, None] * (path[segment + 1] - path[segment])
+
+    # Path vertices strictly inside each window
+    first = np.searchsorted(cumulative, a, side="right")
+    last = np.searchsorted(cumulative, b, side="left")
+    inner = np.maximum(last - first, 0)
+    counts = inner + 2
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    points = np.empty((int(offsets[-1]), 3))
+    points[offsets[:-1]] = point_at(a)
+    points[offsets[1:] - 1] = point_at(b)
+    interior = np.ones(len(points), dtype=bool)
+    interior[offsets[:-1]] = False
+    interior[offsets[1:] - 1] = False
+    points[interior] = path[_ranges(first, inner)]
+    return (points, offsets), kept
+
+
+def parse_selection(text, count):
+    """
+    Bar indices from a selection string: "all", "none"/"" or comma-separated
+    indices and inclusive ranges ("0-9, 15, 40-42"). "40-" runs to the last
+    bar and reversed ranges ("9-0") are accepted. Out-of-range indices are
+    ignored.
+
+    Raises:
+        ValueError: Listing the tokens that are not indices or ranges.
+    """
+    text = (text or "").strip().lower()
+    if text == "all":
+        return np.arange(count)
+    indices = []
+    bad = []
+    for part in text.replace(" ", "").split(","):
+        if not part or part == "none":
+            continue
+        low, dash, high = part.partition("-")
+        if not low.isdigit() or not (high.isdigit() or not high):
+            bad.append(part)
+            continue
+        low = int(low)
+        high = int(high) if high else (count - 1 if dash else low)
+        low, high = min(low, high), max(low, high)
+        indices.extend(range(max(low, 0), min(high, count - 1) + 1))
+    if bad:
+        raise ValueError("Not a bar index or range: {}".format(", ".join(bad)))
+    return np.unique(np.array(indices, dtype=np.int64))
+
+
+def ask_selection(message, count):
+    """
+    Asks for bars to show (Rhino) until the answer parses; cancelling
+    selects none.
+
+    Returns:
+        numpy.ndarray: Bar indices, see parse_selection.
+    """
+    import rhinoscriptsyntax as rs
+
+    while True:
+        text = rs.GetString("{} (all, none or e.g. 0-9,15,40-; {} bars)".format(message, count), "none")
+        if text is None:
+            return np.zeros(0, dtype=np.int64)
+        try:
+            return parse_selection(text, count)
+        except ValueError as error:
+            print(error)
+
+
+def pipe_breps(model, indices, tolerance=0.001, angle_tolerance=0.0174533):
+    """
+    Capped pipe breps of the given bars (Rhino.Geometry), one list per bar
+    (empty if the pipe failed).
+    """
+    import Rhino.Geometry as rg
+
+    breps = []
+    for index in indices:
+        rail = rg.PolylineCurve([rg.Point3d(*point) for point in model.centreline(index)])
+        pipes = rg.Brep.CreatePipe(rail, model.diameters[index] / 2.0, False, rg.PipeCapMode.Flat, True,
+                                   tolerance, angle_tolerance)
+        breps.append(list(pipes or []))
+    return breps
+
+
+def add_pipes(model, indices, layer=None, doc=None):
+    """
+    Adds pipe solids of the given bars to the document in one undoable pass,
+    named after the bars (RebarModel.names).
+
+    Args:
+        model: The RebarModel.
+        indices: Bars to build.
+        layer: Layer full path for the solids. Defaults to the current layer.
+        doc: The Rhino document. Defaults to scriptcontext.doc.
+
+    Returns:
+        list: Object ids of the added solids.
+    """
+    import scriptcontext as sc
+
+    doc = doc or sc.doc
+    indices = [int(i) for i in indices]
+    breps = pipe_breps(model, indices, doc.ModelAbsoluteTolerance, doc.ModelAngleToleranceRadians)
+    layer_index = doc.Layers.FindByFullPath(layer, -1) if layer else -1
+    redraw = doc.Views.RedrawEnabled
+    doc.Views.RedrawEnabled = False
+    undo_record = doc.BeginUndoRecord("Show rebar")
+    ids = []
+    for name, pipes in zip(model.names(indices), breps):
+        for brep in pipes:
+            attributes = doc.CreateDefaultAttributes()
+            attributes.Name = name
+            if layer_index >= 0:
+                attributes.LayerIndex = layer_index
+            ids.append(doc.Objects.AddBrep(brep, attributes))
+    doc.EndUndoRecord(undo_record)
+    doc.Views.RedrawEnabled = redraw
+    doc.Views.Redraw()
+    return ids
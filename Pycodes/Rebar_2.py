@@ -1,5 +1,17 @@
 import rhinoscriptsyntax as rs
 import Rhino.Geometry as rg
+try:
+    import PolygonOffset  # NumPy single-sweep inward offsets (CPython)
+except ImportError:
+    PolygonOffset = None
+try:
+    import RebarModel  # NumPy centreline rebar model (CPython)
+except ImportError:
+    RebarModel = None
+try:
+    import BarSchedule  # NumPy bar bending schedule (CPython)
+except ImportError:
+    BarSchedule = None
 
 class RebarGenerator:
     """Generates rebar solids around a mesh."""
@@ -22,13 +34,14 @@ class RebarGenerator:
         self.boundary_curves = []
         self.offset_curves = []
         self.rebar_solids = []  # Changed to store solids
+        self.rebar_model = None  # Centreline records of the rebar lines (RebarModel)
         self.layer_name = "Rebar_D" + str(self.rebar_diameter)
 
     def get_mesh(self):
         """Retrieves and validates the mesh object."""
         self.mesh = rs.coercemesh(self.mesh_id)
         if not self.mesh:
-            print "Invalid mesh input."
+            print("Invalid mesh input.")
             return False
         return True
 
@@ -36,7 +49,7 @@ class RebarGenerator:
         """Extracts the boundary curves from the mesh."""
         self.boundary_curves = self.mesh.GetOutlines(rg.Plane.WorldXY)
         if not self.boundary_curves:
-            print "Could not extract boundary curves from the mesh."
+            print("Could not extract boundary curves from the mesh.")
             return False
         return True
 
@@ -64,6 +77,8 @@ class RebarGenerator:
 
     def generate_rebar_curves(self):
         """Generates rebar solids along the offset curves with specified spacing."""
+        if PolygonOffset is not None:
+            return self.generate_rebar_polylines()
         for curve in self.offset_curves:
             self.rebar_solids.append(curve) #add the initial offset curve.
             length = curve.GetLength()
@@ -84,6 +99,18 @@ class RebarGenerator:
                             self.rebar_solids.append(new_curves[0])
         return True
 
+    def generate_rebar_polylines(self):
+        """
+        Generates every rebar line of the mesh outlines in one inward sweep
+        (PolygonOffset): the offset at offset_distance, then one more per
+        spacing until the slab region vanishes. Bars are (k, 3) point arrays.
+        """
+        outlines = [[(p.X, p.Y, p.Z) for p in polyline] for polyline in self.boundary_curves]
+        loops = PolygonOffset.offset_outlines(outlines, self.spacing, self.offset_distance)
+        self.rebar_solids = [loop.points for loop in loops]
+        print("{} rebar lines from {} outlines".format(len(loops), len(outlines)))
+        return True
+
     def create_rebar_layer(self):
         """Creates the rebar layer if it doesn't exist."""
         if not rs.IsLayer(self.layer_name):
@@ -92,7 +119,11 @@ class RebarGenerator:
 
     def add_rebar_to_layer(self):
         """Adds the generated rebar solids to the layer."""
+        if PolygonOffset is not None and RebarModel is not None:
+            return self.add_rebar_model()
         for curve in self.rebar_solids:
+            if PolygonOffset is not None:
+                curve = rg.PolylineCurve([rg.Point3d(*point) for point in curve])
             circle = rg.Circle(rg.Plane.WorldXY, curve.GetEndPoint(), self.rebar_diameter / 2.0)
             extrusion = rg.Extrusion.CreateFromCurve(circle.ToNurbsCurve(), rg.ExtrusionDirection.ZAxis, curve.GetLength(), True) #Extrude along the curve.
             if extrusion:
@@ -101,7 +132,32 @@ class RebarGenerator:
                     solid_id = rs.AddBrep(brep)
                     if solid_id:
                         rs.ObjectLayer(solid_id, self.layer_name)
-        print "Rebar solids created on layer:", self.layer_name
+        print("Rebar solids created on layer:", self.layer_name)
+        return True
+
+    def add_rebar_model(self):
+        """
+        Keeps the rebar lines as a RebarModel (centreline plus diameter) and
+        builds solids on the layer only for the bars the user asks to see;
+        the model and its bar schedule can be saved.
+        """
+        self.rebar_model = RebarModel.RebarModel()
+        self.rebar_model.extend(self.rebar_solids, self.rebar_diameter, self.layer_name)
+        count = len(self.rebar_model)
+        print("{} rebars recorded ({} KB)".format(count, self.rebar_model.nbytes // 1024))
+
+        indices = RebarModel.ask_selection("Rebars to show as solids", count)
+        if len(indices):
+            RebarModel.add_pipes(self.rebar_model, indices, self.layer_name)
+            print("{} of {} rebars shown as solids on layer: {}".format(len(indices), count, self.layer_name))
+
+        path = rs.SaveFileName("Save rebar model", "Rebar model (*.npz)|*.npz||")
+        if path:
+            self.rebar_model.save(path)
+            print("Rebar model saved to", path)
+
+        if BarSchedule is not None:
+            BarSchedule.save_schedule(self.rebar_model)
         return True
 
     def run(self):
@@ -110,7 +166,7 @@ class RebarGenerator:
             return
         if not self.extract_boundary_curves():
             return
-        if not self.create_offset_curves():
+        if PolygonOffset is None and not self.create_offset_curves():
             return
         if not self.generate_rebar_curves():
             return
@@ -1,21 +1,32 @@
+import os
+
 import rhinoscriptsyntax as rs
 import Rhino.Geometry as rg
+try:
+    import PolygonOffset  # NumPy single-sweep inward offsets (CPython)
+except ImportError:
+    PolygonOffset = None
+try:
+    import RebarCover  # NumPy cover check against the shells (CPython)
+    import RebarModel
+except ImportError:
+    RebarCover = None
 
 
 def get_mesh(mesh_id):
     """Retrieves and validates the mesh object."""
     mesh = rs.coercemesh(mesh_id)
     if not mesh:
-        print "Invalid mesh input."
+        print("Invalid mesh input.")
         return
-    print "get_mesh_OK"
+    print("get_mesh_OK")
     return mesh
 def offset_mesh(mesh,distance=0.025):
     offset_mesh = rs.MeshOffset(mesh, distance)
     if not offset_mesh:
         print("Could not Offset Mesh")
         return
-    print "Offset_mesh_Method_OK"
+    print("Offset_mesh_Method_OK")
     return offset_mesh
 
 
@@ -23,9 +34,9 @@ def extract_boundary_curves(mesh):
     """Extracts the boundary curves from the mesh."""
     boundary_curves = rs.MeshOutline(mesh) #mesh.GetOutlines(rg.Plane.WorldXY)
     if not boundary_curves:
-        print "Could not extract boundary curves from the mesh."
+        print("Could not extract boundary curves from the mesh.")
         return
-    print "extract_boundary_curves_OK"
+    print("extract_boundary_curves_OK")
     return boundary_curves
 
 def create_offset_curves(boundary_curves, offset_distance=25.0):
@@ -49,11 +60,24 @@ def create_offset_curves(boundary_curves, offset_distance=25.0):
                     offset_curves = rg.Curve.Offset(simplified_curve, rg.Plane.WorldXY, offset_distance, rs.UnitSystem(rs.UnitScale()), rg.CurveOffsetCornerStyle.Sharp)
                     if offset_curves and len(offset_curves) > 0:
                         offset_curves.append(offset_curves[0])
-    print "create_offset_curves_OK"
+    print("create_offset_curves_OK")
     return offset_curves
 
+def generate_rebar_polylines(offset_curves, spacing=150.0):
+    """
+    Generates the rebar lines of every curve in one inward sweep
+    (PolygonOffset): the curve itself, then one offset per spacing until the
+    region vanishes. Returns the bars as (k, 3) point arrays.
+    """
+    outlines = [[(p.X, p.Y, p.Z) for p in rs.CurvePoints(curve)] for curve in offset_curves]
+    loops = PolygonOffset.offset_outlines(outlines, spacing)
+    print("generate_rebar_polylines_OK: {} rebar lines".format(len(loops)))
+    return [loop.points for loop in loops]
+
 def generate_rebar_curves(offset_curves, spacing=150.0):
     """Generates rebar solids along the offset curves with specified spacing."""
+    if PolygonOffset is not None:
+        return generate_rebar_polylines(offset_curves, spacing)
     rebar_solids = []
     for curve in offset_curves:
         rebar_solids.append(curve) #add the initial offset curve.
@@ -73,13 +97,42 @@ def generate_rebar_curves(offset_curves, spacing=150.0):
                     new_curves = rg.Curve.Offset(curve, rg.Plane.WorldXY, spacing * i, rs.UnitSystem(rs.UnitScale()), rg.CurveOffsetCornerStyle.Sharp)
                     if new_curves and len(new_curves)>0:
                         rebar_solids.append(new_curves[0])
-    print "generate_rebar_curves_OK"
+    print("generate_rebar_curves_OK")
     return rebar_solids    
 
+def check_cover(mesh, rebar_curves, diameter=0.01, cover=0.025, step=0.1):
+    """
+    Checks the cover of the rebar lines ((k, 3) point arrays) against the
+    shell (inner) and an optional outer shell mesh, prints a summary per
+    diameter layer and offers to save the per-bar report.
+
+    diameter, cover and the sample step are in metres and are scaled to the
+    document units.
+    """
+    scale = rs.UnitScale(4)  # Metres per model unit
+    diameter, cover, step = diameter / scale, cover / scale, step / scale
+    shells = [RebarCover.rhino_shell("inner", mesh)]
+    outer_id = rs.GetObject("Select the outer shell mesh for the cover check (Enter to skip)", 32)
+    if outer_id:
+        shells.append(RebarCover.rhino_shell("outer", rs.coercemesh(outer_id)))
+    model = RebarModel.RebarModel()
+    model.extend(rebar_curves, diameter, "Rebar_D{:g}".format(diameter * scale * 1000.0))
+    check = RebarCover.CoverCheck(shells, cover, step=step)
+    result = check.run(model)
+    for summary in RebarCover.family_summary(model, result, cover):
+        print(RebarCover.format_summary(summary))
+    path = rs.SaveFileName("Save cover report", "CSV Files (*.csv)|*.csv||")
+    if path:
+        RebarCover.write_report(model, result, check.names, os.path.splitext(path)[0], cover)
+    print("check_cover_OK")
+    return result
+
 
 mesh_id = rs.GetObject("Select mesh", 32)
 mesh = get_mesh(mesh_id)
 offset_mesh = offset_mesh(mesh,0.025)
 boundary_curves = extract_boundary_curves(offset_mesh)
 #offset_curves = create_offset_curves(boundary_curves,25)
-rebar_curves = generate_rebar_curves(boundary_curves,100)
\ No newline at end of file
+rebar_curves = generate_rebar_curves(boundary_curves,100)
+if RebarCover is not None and PolygonOffset is not None and rebar_curves:
+    check_cover(mesh, rebar_curves)
@@ -2,6 +2,14 @@
 # Purpose: Project a curve, extrude a circle along curve_1, and array rebars along curve_2
 import rhinoscriptsyntax as rs
 import Rhino
+try:
+    import RebarModel  # NumPy centreline rebar model (CPython)
+except ImportError:
+    RebarModel = None
+try:
+    import BarSchedule  # NumPy bar bending schedule (CPython)
+except ImportError:
+    BarSchedule = None
 
 class CurveProcessor:
     def __init__(self):
@@ -14,6 +22,7 @@ class CurveProcessor:
         self.curve_2 = None          # New curve for array
         self.circle_1 = None         # Circle at start of curve_1
         self.rebar_length = None     # Length of original Rebar_1
+        self.rebar_model = None      # Centrelines of the Rebar_1 copies (RebarModel)
 
     def select_objects(self):
         """Prompt user to select a curve and a mesh for projection."""
@@ -81,6 +90,8 @@ class CurveProcessor:
 
     def array_rebar(self):
         """Array rebars along curve_2 with equal distances of 100mm, following curve_2."""
+        if RebarModel is not None:
+            return self.array_rebar_model()
         if not self.curve_2 or not self.rebar_length:
             print("Curve_2 or rebar length not defined for array.")
             return False
@@ -132,6 +143,53 @@ class CurveProcessor:
         rs.EnableRedraw(True)
         return True
 
+    def array_rebar_model(self):
+        """
+        Records the rebars along curve_2 as centrelines in a RebarModel instead
+        of document solids: copy i is the piece of curve_2 from i * spacing to
+        i * spacing + rebar_length, cut from one polyline of curve_2 within the
+        model tolerances.
+        """
+        if not self.curve_2 or not self.rebar_length:
+            print("Curve_2 or rebar length not defined for array.")
+            return False
+        
+        curve_2_length = rs.CurveLength(self.curve_2)
+        if not curve_2_length:
+            print("Could not determine length of curve_2.")
+            return False
+        
+        num_rebars = int(curve_2_length / self.array_spacing) + 1
+        doc = Rhino.RhinoDoc.ActiveDoc
+        rail = rs.coercecurve(self.curve_2).ToPolyline(doc.ModelAbsoluteTolerance, doc.ModelAngleToleranceRadians, 0.0, 0.0)
+        if not rail:
+            print("Could not convert curve_2 to a polyline.")
+            return False
+        
+        starts = [i * self.array_spacing for i in range(num_rebars)]
+        windows, _ = RebarModel.windows_along([(p.X, p.Y, p.Z) for p in rail.ToPolyline()], starts, self.rebar_length)
+        self.rebar_model = RebarModel.RebarModel()
+        self.rebar_model.extend(windows, 2.0 * self.radius, "Rebar_1_copy")
+        print("{} Rebar_1 copies recorded along curve_2 ({} KB)".format(
+            len(self.rebar_model), self.rebar_model.nbytes // 1024))
+        return True
+
+    def show_rebar(self):
+        """Builds solids for the Rebar_1 copies the user asks to see, then offers to save the model and its bar schedule."""
+        count = len(self.rebar_model)
+        indices = RebarModel.ask_selection("Rebar_1 copies to show as solids", count)
+        if len(indices):
+            RebarModel.add_pipes(self.rebar_model, indices)
+            print("{} of {} Rebar_1 copies shown as solids".format(len(indices), count))
+        
+        path = rs.SaveFileName("Save rebar model", "Rebar model (*.npz)|*.npz||")
+        if path:
+            self.rebar_model.save(path)
+            print("Rebar model saved to", path)
+        
+        if BarSchedule is not None:
+            BarSchedule.save_schedule(self.rebar_model)
+
     def run(self):
         """Execute the full workflow."""
         if not self.select_objects():
@@ -144,6 +202,8 @@ class CurveProcessor:
         
         if self.select_curve_for_array():
             self.array_rebar()
+            if self.rebar_model is not None:
+                self.show_rebar()
         
         print("Process completed. Created: curve_1, Circle_1, Rebar_1, and Rebar_1 copies along curve_2")
 
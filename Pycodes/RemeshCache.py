@@ -0,0 +1,316 @@
+"""
+Content-addressed on-disk cache for QuadRemesh results.
+
+QuadRemesh is the slowest step of the formwork scripts, and the same panel is
+remeshed again on every run. Entries are keyed by a hash of the input
+vertex/face arrays plus the remesh parameters and hold the remeshed
+vertex/face arrays, so an unchanged panel skips remeshing entirely:
+
+    remeshed = RemeshCache.cached_quad_remesh(mesh, qr_params)
+
+The cache folder is ~/.quadremesh_cache (or $QUADREMESH_CACHE). The least
+recently used entries are evicted once the folder grows past MAX_BYTES.
+Hit/miss counts are kept in memory and added to stats.json once per run (at
+summary() or exit), under a lock file, so sessions sharing the folder do not
+lose each other's counts. Only the standard library is used, so it runs under
+IronPython as well as CPython.
+"""
+import array
+import atexit
+import errno
+import hashlib
+import json
+import os
+import struct
+import time
+
+import MeshConvert
+
+CACHE_DIR = os.environ.get("QUADREMESH_CACHE", os.path.join(os.path.expanduser("~"), ".quadremesh_cache"))
+MAX_BYTES = 512 * 1024 * 1024   # 512MB
+ENTRY_EXTENSION = ".qrm"
+STATS_FILE = "stats.json"
+LOCK_TIMEOUT = 5.0              # Seconds to wait for the stats lock
+STALE_LOCK = 60.0               # A lock older than this is left over from a crash
+
+_MAGIC = b"QRM1"
+_HEADER = struct.Struct("<4sII")   # magic, vertex count, face count
+_default = None
+
+
+def _flat_bytes(values, typecode, dtype):
+    """Little-endian bytes of a flat or (n, k) sequence; NumPy arrays skip the copy loop."""
+    if hasattr(values, "astype"):
+        return values.astype(dtype).tobytes()
+    values = array.array(typecode, values)
+    return values.tobytes() if hasattr(values, "tobytes") else values.tostring()
+
+
+def _from_bytes(typecode, data):
+    values = array.array(typecode)
+    if hasattr(values, "frombytes"):
+        values.frombytes(data)
+    else:
+        values.fromstring(data)
+    return values
+
+
+def _replace(source, target):
+    """os.replace for IronPython 2.7."""
+    if hasattr(os, "replace"):
+        os.replace(source, target)
+        return
+    if os.path.exists(target):
+        os.remove(target)
+    os.rename(source, target)
+
+
+def remesh_key(vertices, faces, target_quad_count, adaptive_size=50, detect_hard_edges=True,
+               adaptive_quad_count=True):
+    """
+    Returns the cache key for a remesh input.
+
+    Args:
+        vertices: Flat x, y, z values or an (n, 3) array.
+        faces: Flat a, b, c, d indices (triangles repeat c) or an (m, 4) array.
+        target_quad_count, adaptive_size, detect_hard_edges, adaptive_quad_count:
+            The QuadRemeshParameters that change the result.
+
+    Returns:
+        str: Hex digest.
+    """
+    digest = hashlib.sha1()
+    digest.update(_flat_bytes(vertices, "d", "<f8"))
+    digest.update(_flat_bytes(faces, "i", "<i4"))
+    parameters = "{}|{}|{}|{}".format(int(target_quad_count), float(adaptive_size),
+                                      bool(detect_hard_edges), bool(adaptive_quad_count))
+    digest.update(parameters.encode("ascii"))
+    return digest.hexdigest()
+
+
+class RemeshCache(object):
+    def __init__(self, folder=CACHE_DIR, max_bytes=MAX_BYTES):
+        """
+        Opens (and creates) a cache folder.
+
+        Args:
+            folder: Cache folder.
+            max_bytes: Size limit; least recently used entries are evicted past it.
+        """
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.pending = {}       # Counters not yet added to stats.json
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+        atexit.register(self.flush)
+
+    def path(self, key):
+        return os.path.join(self.folder, key + ENTRY_EXTENSION)
+
+    def get(self, key):
+        """
+        Returns (vertices, faces) as flat arrays ('d' and 'i') for key, or
+        None on a miss. A hit marks the entry as recently used.
+        """
+        path = self.path(key)
+        try:
+            with open(path, "rb") as handle:
+                data = handle.read()
+        except (IOError, OSError):
+            self._record("misses")
+            return None
+        # A short or damaged entry (e.g. from a crash mid-write) is a miss;
+        # another process may already have removed it
+        valid = len(data) >= _HEADER.size
+        if valid:
+            magic, vertex_count, face_count = _HEADER.unpack_from(data)
+            vertex_end = _HEADER.size + vertex_count * 24
+            valid = magic == _MAGIC and len(data) == vertex_end + face_count * 16
+        if not valid:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self._record("misses")
+            return None
+        os.utime(path, None)
+        self._record("hits")
+        return _from_bytes("d", data[_HEADER.size:vertex_end]), _from_bytes("i", data[vertex_end:])
+
+    def put(self, key, vertices, faces):
+        """
+        Stores remeshed vertices (flat x, y, z) and faces (flat a, b, c, d)
+        under key, then evicts down to max_bytes.
+        """
+        vertex_bytes = _flat_bytes(vertices, "d", "<f8")
+        face_bytes = _flat_bytes(faces, "i", "<i4")
+        path = self.path(key)
+        temp = "{}.{}.tmp".format(path, os.getpid())
+        with open(temp, "wb") as handle:
+            handle.write(_HEADER.pack(_MAGIC, len(vertex_bytes) // 24, len(face_bytes) // 16))
+            handle.write(vertex_bytes)
+            handle.write(face_bytes)
+        _replace(temp, path)
+        self.evict()
+
+    def entries(self):
+        """Returns [(last used, size, path)] for every entry, oldest first."""
+        entries = []
+        for name in os.listdir(self.folder):
+            if name.endswith(ENTRY_EXTENSION):
+                path = os.path.join(self.folder, name)
+                info = os.stat(path)
+                entries.append((info.st_mtime, info.st_size, path))
+        entries.sort()
+        return entries
+
+    def size(self):
+        return sum(entry[1] for entry in self.entries())
+
+    def evict(self):
+        """Removes least recently used entries until the cache fits max_bytes."""
+        entries = self.entries()
+        total = sum(entry[1] for entry in entries)
+        evicted = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+        if evicted:
+            self._record("evictions", evicted)
+        return evicted
+
+    def clear(self):
+        for _, _, path in self.entries():
+            os.remove(path)
+        self.pending = {}
+        with self._stats_lock():
+            self._save_stats({})
+
+    def _load_stats(self):
+        try:
+            with open(os.path.join(self.folder, STATS_FILE)) as handle:
+                return json.load(handle)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def stats(self):
+        """Returns the hit/miss/eviction counters, this run's included."""
+        stats = self._load_stats()
+        for counter, count in self.pending.items():
+            stats[counter] = stats.get(counter, 0) + count
+        return stats
+
+    def flush(self):
+        """Adds this run's counters to stats.json."""
+        if not self.pending:
+            return
+        with self._stats_lock():
+            stats = self._load_stats()
+            for counter, count in self.pending.items():
+                stats[counter] = stats.get(counter, 0) + count
+            stats["updated"] = time.time()
+            self._save_stats(stats)
+        self.pending = {}
+
+    def summary(self):
+        self.flush()
+        stats = self.stats()
+        hits, misses = stats.get("hits", 0), stats.get("misses", 0)
+        rate = 100.0 * hits / (hits + misses) if hits + misses else 0.0
+        return "QuadRemesh cache: {} hits, {} misses ({:.0f}% hit rate), {} evictions, {:.1f} MB".format(
+            hits, misses, rate, stats.get("evictions", 0), self.size() / 1048576.0)
+
+    def _record(self, counter, count=1):
+        self.pending[counter] = self.pending.get(counter, 0) + count
+
+    def _stats_lock(self):
+        return _FileLock(os.path.join(self.folder, STATS_FILE + ".lock"))
+
+    def _save_stats(self, stats):
+        path = os.path.join(self.folder, STATS_FILE)
+        temp = "{}.{}.tmp".format(path, os.getpid())
+        with open(temp, "w") as handle:
+            json.dump(stats, handle)
+        _replace(temp, path)
+
+
+class _FileLock(object):
+    """
+    Exclusive lock file (os.O_EXCL), shared by every process using a cache
+    folder. A lock older than STALE_LOCK is taken over; after LOCK_TIMEOUT
+    the update goes ahead unlocked rather than blocking the script.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.handle = None
+
+    def __enter__(self):
+        deadline = time.time() + LOCK_TIMEOUT
+        while True:
+            try:
+                self.handle = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                return self
+            except OSError as error:
+                if error.errno != errno.EEXIST:
+                    return self
+            try:
+                if time.time() - os.stat(self.path).st_mtime > STALE_LOCK:
+                    os.remove(self.path)
+                    continue
+            except OSError:
+                continue
+            if time.time() > deadline:
+                return self
+            time.sleep(0.01)
+
+    def __exit__(self, *exc_info):
+        if self.handle is not None:
+            os.close(self.handle)
+            self.handle = None
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+def default_cache():
+    """Returns the shared cache in CACHE_DIR."""
+    global _default
+    if _default is None:
+        _default = RemeshCache()
+    return _default
+
+
+def cached_quad_remesh(mesh, parameters, cache=None):
+    """
+    Rhino.Geometry.Mesh.QuadRemesh(mesh, parameters) through the cache.
+
+    Args:
+        mesh: Rhino.Geometry.Mesh to remesh.
+        parameters: Rhino.Geometry.QuadRemeshParameters.
+        cache: RemeshCache to use (default: default_cache()).
+
+    Returns:
+        Rhino.Geometry.Mesh: The remeshed mesh, or None if QuadRemesh failed.
+    """
+    import Rhino
+
+    cache = cache or default_cache()
+    key = remesh_key(mesh.Vertices.ToFloatArray(), mesh.Faces.ToIntArray(False), parameters.TargetQuadCount,
+                     parameters.AdaptiveSize, parameters.DetectHardEdges, parameters.AdaptiveQuadCount)
+    cached = cache.get(key)
+    if cached is not None:
+        return MeshConvert.rhino_mesh(*cached)
+
+    remeshed = Rhino.Geometry.Mesh.QuadRemesh(mesh, parameters)
+    if remeshed:
+        vertices = [c for pt in remeshed.Vertices.ToPoint3dArray() for c in (pt.X, pt.Y, pt.Z)]
+        cache.put(key, vertices, remeshed.Faces.ToIntArray(False))
+    return remeshed
@@ -0,0 +1,98 @@
+"""
+Per-vertex scalar field files, loadable as mesh vertex colours.
+
+ThicknessField writes one value per mesh vertex (thickness, clearance, ...)
+for every panel of a zone into a single .vfield file:
+
+- an IndexedFile container tagged "VFLD";
+- one little-endian float32 record per vertex, panel after panel;
+- the field's name and colour range stored in the JSON index next to the
+  (panel id, value offset, value count) segments.
+
+read_values() loads one panel's values with a single seek.
+apply_vertex_colours() maps them onto a mesh object's vertex colours through
+a blue-green-red ramp, so a panel shows its field without any line or text
+objects.
+
+Standard library only, so it runs in any Rhino Python.
+"""
+import struct
+
+import IndexedFile
+
+MAGIC = b"VFLD"
+VERSION = 1
+VALUE = struct.Struct("<f")
+
+
+class FieldWriter(IndexedFile.IndexedWriter):
+    """
+    Appends panels' per-vertex values to a .vfield file; close() writes the
+    index.
+    """
+
+    def __init__(self, path, name="value", low=None, high=None):
+        IndexedFile.IndexedWriter.__init__(self, path, MAGIC, VERSION, VALUE.size, name=name, low=low, high=high)
+
+    def add(self, panel_id, values):
+        """Writes one panel's values (vertex order)."""
+        values = [float(v) for v in values]
+        return self.add_segment(panel_id, struct.pack("<{}f".format(len(values)), *values))
+
+
+def read_index(path):
+    """
+    Returns the field's index: {"name", "low", "high", "segments"}.
+    """
+    return IndexedFile.read_index(path, MAGIC, VERSION, "scalar field file")
+
+
+def read_values(path, panel_id, index=None):
+    """
+    Returns one panel's values as a list of floats, or None if the panel is
+    not in the file.
+    """
+    index = index or read_index(path)
+    with open(path, "rb") as handle:
+        for segment_id, start, count in index["segments"]:
+            if segment_id == str(panel_id):
+                return list(struct.unpack("<{}f".format(count), IndexedFile.read_records(handle, VALUE.size, start, count)))
+    return None
+
+
+def ramp(value, low, high):
+    """
+    Blue (low) - green - red (high) colour of a value, as an (r, g, b) tuple.
+    """
+    t = 0.5 if high <= low else min(1.0, max(0.0, (value - low) / float(high - low)))
+    if t < 0.5:
+        return (0, int(round(510 * t)), int(round(255 * (1.0 - 2.0 * t))))
+    return (int(round(255 * (2.0 * t - 1.0))), int(round(510 * (1.0 - t))), 0)
+
+
+def colours(values, low=None, high=None):
+    """Returns the ramp colour of every value (range defaults to min/max)."""
+    low = min(values) if low is None else low
+    high = max(values) if high is None else high
+    return [ramp(v, low, high) for v in values]
+
+
+def apply_vertex_colours(mesh_id, path, panel_id=None, low=None, high=None):
+    """
+    Colours a mesh object's vertices with a panel's values from a .vfield
+    file (panel id defaults to the mesh id). The range defaults to the one
+    stored in the file, then to the panel's min/max.
+
+    Returns:
+        bool: True if the panel was found and matches the mesh's vertex count.
+    """
+    import rhinoscriptsyntax as rs
+
+    index = read_index(path)
+    values = read_values(path, mesh_id if panel_id is None else panel_id, index)
+    if values is None or len(values) != rs.MeshVertexCount(mesh_id):
+        return False
+    low = index.get("low") if low is None else low
+    high = index.get("high") if high is None else high
+    rs.MeshVertexColors(mesh_id, colours(values, low, high))
+    return True
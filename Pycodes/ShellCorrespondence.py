@@ -0,0 +1,198 @@
+"""
+Parameter-domain correspondence between the inner and outer shells.
+
+FindMidMesh.create_midpoint_mesh paired mesh1.Vertices[i] with
+mesh2.Vertices[i]. That only works when QuadRemesh gives both shells the same
+vertex order, so the script was re-run with different face counts until it
+did. Here both shells are mapped onto one parameter domain instead:
+
+1. The naked-edge loop of each shell is split at its four corners
+   (GridRemesh.find_corners) and laid on the unit square by arc length. The
+   outer shell's corners are matched to the inner shell's by position.
+2. The interior is flattened harmonically: cotangent weights (clamped
+   positive, so the map cannot fold) and one sparse solve per shell with
+   the boundary fixed.
+3. Both shells are sampled on the same (u, v) grid. Each grid point is
+   located in the flattened triangles (MeshBVH on the flat mesh), and its
+   barycentric weights carry it back onto the 3D shell.
+
+Vertex i of the two resampled shells is the same (u, v), at any resolution,
+so paired-vertex operations (midpoints, thickness) need no QuadRemesh.
+
+Requires CPython 3 with NumPy and SciPy.
+"""
+import collections
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import linalg
+
+import GridRemesh
+import MeshArrays
+import MeshBVH
+import MeshConvert
+
+MIN_WEIGHT = 1e-8   # Floor for cotangent weights (obtuse triangles)
+
+Correspondence = collections.namedtuple("Correspondence", "inner outer faces shape")
+
+
+def square_boundary(vertices, faces, reference=None):
+    """
+    Lays a four-sided panel's naked-edge loop on the unit square.
+
+    Args:
+        vertices, faces: Panel mesh.
+        reference: Optional (4, 3) corner points of the matching panel; the
+            loop's start corner and direction are chosen to match them. By
+            default the first corner has the smallest X + Z, as in
+            GridRemesh.panel_sides.
+
+    Returns:
+        tuple: (boundary vertex indices, (k, 2) boundary (u, v), (4, 3)
+            corner points in square order (0,0), (1,0), (1,1), (0,1)).
+    """
+    loop, corners = GridRemesh.find_corners(vertices, faces)
+    count = len(loop)
+    options = []
+    for reverse in (False, True):
+        walk = loop[::-1] if reverse else loop
+        positions = sorted((count - 1 - c) % count for c in corners) if reverse else list(corners)
+        for shift in range(4):
+            start = positions[shift:] + positions[:shift]
+            options.append((walk, start))
+    if reference is None:
+        walk, start = min(options[:4], key=lambda o: vertices[o[0][o[1][0]], 0] + vertices[o[0][o[1][0]], 2])
+    else:
+        reference = np.asarray(reference, dtype=float)
+        walk, start = min(options, key=lambda o: np.linalg.norm(vertices[o[0][o[1]]] - reference, axis=1).sum())
+
+    walk = np.roll(walk, -start[0])
+    ends = [(c - start[0]) % count for c in start] + [count]
+    square = np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0], [0.0, 0.0]])
+    closed = np.append(walk, walk[0])
+    uv = []
+    for k in range(4):
+        side = vertices[closed[ends[k]:ends[k + 1] + 1]]
+        length = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(side, axis=0), axis=1))])
+        t = (length / max(length[-1], 1e-12))[:-1, None]
+        uv.append(square[k] + t * (square[k + 1] - square[k]))
+    return walk, np.concatenate(uv), vertices[walk[ends[:4]]]
+
+
+def cotangent_weights(vertices, faces):
+    """
+    Returns the symmetric sparse matrix of clamped cotangent edge weights.
+    """
+    tris, _ = MeshArrays.triangles(faces)
+    rows, cols, weights = [], [], []
+    for k in range(3):
+        i, j, o = tris[:, k], tris[:, (k + 1) % 3], tris[:, (k + 2) % 3]
+        e1 = vertices[i] - vertices[o]
+        e2 = vertices[j] - vertices[o]
+        sine = np.linalg.norm(np.cross(e1, e2), axis=1)
+        cot = np.einsum("ij,ij->i", e1, e2) / np.maximum(sine, 1e-12)
+        rows += [i, j]
+        cols += [j, i]
+        weights += [0.5 * cot, 0.5 * cot]
+    n = len(vertices)
+    matrix = sparse.coo_matrix((np.concatenate(weights), (np.concatenate(rows), np.concatenate(cols))),
+                               shape=(n, n)).tocsr()
+    matrix.data = np.maximum(matrix.data, MIN_WEIGHT)
+    return matrix
+
+
+def flatten(vertices, faces, reference=None):
+    """
+    Boundary-anchored harmonic map of a four-sided panel onto the unit square.
+
+    Returns:
+        tuple: ((n, 2) (u, v) per vertex (NaN for vertices no face uses),
+            (4, 3) corner points in square order).
+    """
+    vertices = MeshArrays.as_vertices(vertices)
+    faces = MeshArrays.as_faces(faces)
+    boundary, boundary_uv, corners = square_boundary(vertices, faces, reference)
+    uv = np.full((len(vertices), 2), np.nan)
+    uv[boundary] = boundary_uv
+
+    used = np.zeros(len(vertices), dtype=bool)
+    used[faces.ravel()] = True
+    fixed = np.zeros(len(vertices), dtype=bool)
+    fixed[boundary] = True
+    free = np.nonzero(used & ~fixed)[0]
+    if len(free):
+        weights = cotangent_weights(vertices, faces)
+        laplacian = sparse.diags(np.asarray(weights.sum(axis=1)).ravel()) - weights
+        system = laplacian[free][:, free].tocsc()
+        rhs = -(laplacian[free][:, boundary] @ boundary_uv)
+        solve = linalg.factorized(system)
+        uv[free] = np.column_stack([solve(rhs[:, 0]), solve(rhs[:, 1])])
+    return uv, corners
+
+
+def sample(vertices, faces, uv, grid_uv):
+    """
+    Returns the points of the shell at the given (u, v) parameters.
+    """
+    flat = np.column_stack([np.nan_to_num(uv), np.zeros(len(uv))])
+    query = np.column_stack([grid_uv, np.zeros(len(grid_uv))])
+    located = MeshBVH.closest_points(flat, faces, query)
+    return np.einsum("nk,nki->ni", located.weights, vertices[faces[located.faces]])
+
+
+def resample_pair(inner_vertices, inner_faces, outer_vertices, outer_faces, lod=None, shape=None):
+    """
+    Resamples both shells on one grid over their shared parameter domain.
+
+    Args:
+        inner_vertices, inner_faces: Inner shell (a four-sided panel).
+        outer_vertices, outer_faces: Outer shell (any tessellation).
+        lod: Target quad count (GridRemesh.grid_size), used if shape is None;
+            defaults to the inner shell's face count.
+        shape: (N, M) quads along u and v.
+
+    Returns:
+        Correspondence: ((N + 1) * (M + 1), 3) inner and outer grid points
+            (vertex i of both at the same (u, v)), (N * M, 4) faces shared by
+            both, and (N, M).
+    """
+    inner_vertices = MeshArrays.as_vertices(inner_vertices)
+    inner_faces = MeshArrays.as_faces(inner_faces)
+    outer_vertices = MeshArrays.as_vertices(outer_vertices)
+    outer_faces = MeshArrays.as_faces(outer_faces)
+    inner_uv, corners = flatten(inner_vertices, inner_faces)
+    outer_uv, _ = flatten(outer_vertices, outer_faces, corners)
+
+    if shape is None:
+        lod = len(inner_faces) if lod is None else lod
+        shape = GridRemesh.grid_size(lod, 0.5 * (np.linalg.norm(corners[1] - corners[0])
+                                                 + np.linalg.norm(corners[2] - corners[3])),
+                                     0.5 * (np.linalg.norm(corners[3] - corners[0])
+                                            + np.linalg.norm(corners[2] - corners[1])))
+    n, m = shape
+    u, v = np.meshgrid(np.linspace(0.0, 1.0, n + 1), np.linspace(0.0, 1.0, m + 1), indexing="ij")
+    grid_uv = np.column_stack([u.ravel(), v.ravel()])
+    inner = sample(inner_vertices, inner_faces, inner_uv, grid_uv)
+    outer = sample(outer_vertices, outer_faces, outer_uv, grid_uv)
+
+    quads = GridRemesh.grid_faces(n, m)
+    if np.dot(MeshArrays.face_normals(inner, quads).sum(axis=0),
+              MeshArrays.face_normals(inner_vertices, inner_faces).sum(axis=0)) < 0:
+        quads = quads[:, [0, 3, 2, 1]]
+    return Correspondence(inner, outer, quads, (n, m))
+
+
+def resample_rhino_pair(inner, outer, lod=None):
+    """
+    resample_pair for Rhino.Geometry.Mesh shells.
+
+    Returns:
+        tuple: (inner, outer) Rhino.Geometry.Mesh grids with the same
+            topology and vertex order.
+    """
+    arrays = [MeshConvert.mesh_arrays(mesh) for mesh in (inner, outer)]
+    result = resample_pair(arrays[0][0], arrays[0][1], arrays[1][0], arrays[1][1], lod)
+    faces = result.faces.ravel().tolist()
+    return (MeshConvert.rhino_mesh(result.inner.ravel().tolist(), faces),
+            MeshConvert.rhino_mesh(result.outer.ravel().tolist(), faces))
@@ -0,0 +1,104 @@
+"""
+Uniform-grid spatial hash for 2D or 3D point arrays.
+
+Points are binned into cubic cells and sorted by cell key, so a radius query
+only visits the cells around each query point. Every query is answered in
+one vectorized pass per neighbouring cell offset; there are no Python loops
+over points.
+
+Requires CPython 3 with NumPy.
+"""
+import itertools
+
+import numpy as np
+
+_BITS = 21                     # Bits per axis in a cell key (3 axes fit in int64)
+_OFFSET = 1 << (_BITS - 1)
+
+
+def cell_keys(cells):
+    """Returns the int64 key of (n, 2) or (n, 3) integer cell coordinates."""
+    keys = np.zeros(len(cells), dtype=np.int64)
+    for axis in range(cells.shape[1]):
+        keys = (keys << _BITS) | (cells[:, axis] + _OFFSET)
+    return keys
+
+
+class SpatialHash(object):
+    def __init__(self, points, cell):
+        """
+        Bins points into a uniform grid.
+
+        Args:
+            points: (n, 2) or (n, 3) point array.
+            cell: Cell size; queries are fastest with radius <= cell.
+        """
+        self.points = np.asarray(points, dtype=float)
+        self.cell = float(cell)
+        self.dims = self.points.shape[1]
+        self.origin = self.points.min(axis=0) if len(self.points) else np.zeros(self.dims)
+        keys = self.keys(self.points)
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+
+    def __len__(self):
+        return len(self.points)
+
+    def cells(self, points):
+        """Returns the integer cell coordinates of points."""
+        return np.floor((np.asarray(points, dtype=float) - self.origin) / self.cell).astype(np.int64)
+
+    def keys(self, points, offset=None):
+        """Returns the int64 cell key of points (optionally shifted by a cell offset)."""
+        cells = self.cells(points)
+        if offset is not None:
+            cells = cells + offset
+        return cell_keys(cells)
+
+    def pairs(self, queries, radius):
+        """
+        Returns every (query, point) pair closer than radius.
+
+        Returns:
+            tuple: (query indices, point indices, distances), grouped by cell
+                offset (not sorted).
+        """
+        queries = np.asarray(queries, dtype=float).reshape(-1, self.dims)
+        reach = int(np.ceil(radius / self.cell))
+        found_query, found_point, found_distance = [], [], []
+        for offset in itertools.product(range(-reach, reach + 1), repeat=self.dims):
+            keys = self.keys(queries, np.array(offset))
+            start = np.searchsorted(self.sorted_keys, keys, side="left")
+            count = np.searchsorted(self.sorted_keys, keys, side="right") - start
+            if not count.any():
+                continue
+            query = np.repeat(np.arange(len(queries)), count)
+            position = np.repeat(start - np.cumsum(count) + count, count) + np.arange(len(query))
+            point = self.order[position]
+            distance = np.linalg.norm(self.points[point] - queries[query], axis=1)
+            near = distance <= radius
+            found_query.append(query[near])
+            found_point.append(point[near])
+            found_distance.append(distance[near])
+        if not found_query:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0)
+        return np.concatenate(found_query), np.concatenate(found_point), np.concatenate(found_distance)
+
+    def nearest(self, queries, radius):
+        """
+        Returns the nearest point within radius of every query.
+
+        Returns:
+            tuple: (point index or -1, distance or inf) per query.
+        """
+        queries = np.asarray(queries, dtype=float).reshape(-1, self.dims)
+        index = np.full(len(queries), -1, dtype=np.int64)
+        distance = np.full(len(queries), np.inf)
+        query, point, gap = self.pairs(queries, radius)
+        if len(query):
+            order = np.lexsort((gap, query))
+            first = order[np.unique(query[order], return_index=True)[1]]
+            index[query[first]] = point[first]
+            distance[query[first]] = gap[first]
+        return index, distance
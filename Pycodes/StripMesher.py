@@ -0,0 +1,211 @@
+"""
+Vectorized arc-length strip mesher for split_mesh_by_curves.
+
+DivideCurve_3000Length.split_mesh_by_curves queries every border curve, then
+divides the bottom and top curves and builds one polyline and one planar
+mesh per segment through the document. This module does the same on arrays:
+
+- The bottom and top border polylines are resampled by cumulative arc
+  length into the same number of divisions
+  (min(int(length / 3m) + 1) of the two).
+- Every strip quad between consecutive division points is emitted at once
+  as one vertex/face array with per-strip ids.
+
+Many meshes are handled in one call. Their polylines are laid end to end on
+one arc-length axis, so a single np.interp resamples all of them.
+
+Requires CPython 3 with NumPy.
+"""
+import collections
+
+import numpy as np
+
+import GridRemesh
+import MeshArrays
+import MeshConvert
+
+SEGMENT_LENGTH = 3.0    # Strip width along the border (m)
+LEVEL_TOLERANCE = 0.001  # Border curves within 1mm of the lowest Z count as lowest
+
+Strips = collections.namedtuple("Strips", "vertices faces strip_ids mesh_ids")
+
+
+def polyline_lengths(polylines):
+    """Returns the arc length of every polyline."""
+    return np.array([np.linalg.norm(np.diff(p, axis=0), axis=1).sum() for p in polylines])
+
+
+def division_counts(bottom_lengths, top_lengths, segment_length=SEGMENT_LENGTH):
+    """
+    Returns the number of divisions per mesh, paired between bottom and top
+    as in split_mesh_by_curves.
+    """
+    bottom = (np.asarray(bottom_lengths) / segment_length).astype(np.int64) + 1
+    top = (np.asarray(top_lengths) / segment_length).astype(np.int64) + 1
+    return np.minimum(bottom, top)
+
+
+def divide_polylines(polylines, counts):
+    """
+    Divides every polyline into counts[i] equal arc-length segments in one pass.
+
+    Args:
+        polylines: Sequence of (k_i, 3) point arrays.
+        counts: Divisions per polyline.
+
+    Returns:
+        np.ndarray: (sum(counts + 1), 3) division points, polyline after
+            polyline.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    points = np.concatenate(polylines)
+    sizes = np.array([len(p) for p in polylines])
+    first = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    # Local arc length per point; polylines are laid end to end with a unit
+    # gap so that one monotonic axis covers all of them
+    steps = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    steps = np.concatenate([[0.0], steps])
+    steps[first] = 0.0
+    local = np.cumsum(steps)
+    local -= np.repeat(local[first], sizes)
+    lengths = local[first + sizes - 1]
+    offsets = np.concatenate([[0.0], np.cumsum(lengths + 1.0)[:-1]])
+    axis = local + np.repeat(offsets, sizes)
+
+    owner = np.repeat(np.arange(len(counts)), counts + 1)
+    group_start = np.cumsum(counts + 1) - (counts + 1)
+    fraction = (np.arange(len(owner)) - group_start[owner]) / counts[owner]
+    targets = offsets[owner] + fraction * lengths[owner]
+    return np.column_stack([np.interp(targets, axis, points[:, k]) for k in range(3)])
+
+
+def strip_mesh(bottoms, tops, segment_length=SEGMENT_LENGTH, rows=1):
+    """
+    Meshes the strips between paired bottom and top border polylines.
+
+    Args:
+        bottoms, tops: Sequences of (k, 3) polylines, one pair per mesh,
+            running in the same direction.
+        segment_length: Target strip width along the borders.
+        rows: Quads per strip from bottom to top.
+
+    Returns:
+        Strips: (vertices, (f, 4) faces, strip id per face, mesh index per
+            face). Strip ids run over all meshes; strip s of mesh m is the
+            strip between divisions s and s + 1.
+    """
+    bottoms = [np.asarray(p, dtype=float).reshape(-1, 3) for p in bottoms]
+    tops = [np.asarray(p, dtype=float).reshape(-1, 3) for p in tops]
+    counts = division_counts(polyline_lengths(bottoms), polyline_lengths(tops), segment_length)
+    bottom = divide_polylines(bottoms, counts)
+    top = divide_polylines(tops, counts)
+
+    # rows + 1 levels between each pair of division points
+    levels = np.linspace(0.0, 1.0, rows + 1)
+    vertices = (bottom[:, None] * (1.0 - levels[None, :, None]) + top[:, None] * levels[None, :, None])
+    vertices = vertices.reshape(-1, 3)
+
+    # Strip quads: division k to k + 1 of the same mesh, level j to j + 1
+    point_mesh = np.repeat(np.arange(len(counts)), counts + 1)
+    start = np.nonzero(point_mesh[:-1] == point_mesh[1:])[0]
+    level = np.arange(rows)
+    a = (start[:, None] * (rows + 1) + level[None, :]).ravel()
+    b = a + rows + 1
+    faces = np.column_stack([a, b, b + 1, a + 1])
+    strip_ids = np.repeat(np.arange(len(start)), rows)
+    return Strips(vertices, faces, strip_ids, point_mesh[start][strip_ids])
+
+
+def vector_area(loop):
+    """Area vector of a closed polyline (last point repeats the first)."""
+    centered = loop - loop[:-1].mean(axis=0)
+    return 0.5 * np.cross(centered[:-1], centered[1:]).sum(axis=0)
+
+
+def align_loop(loop, reference):
+    """
+    Orients a closed loop like reference (same turning about their common
+    axis, by the sign of their area vectors) and rolls it to start at its
+    vertex closest to the start of reference, so strips between the two do
+    not twist.
+
+    Args:
+        loop, reference: Closed (k, 3) polylines, last point repeating the
+            first, as boundary loops come out of border_polylines.
+
+    Returns:
+        np.ndarray: The aligned loop, closed.
+    """
+    if np.dot(vector_area(loop), vector_area(reference)) < 0:
+        loop = loop[::-1]
+    ring = loop[:-1]
+    start = int(np.argmin(np.linalg.norm(ring - reference[0], axis=1)))
+    ring = np.roll(ring, -start, axis=0)
+    return np.concatenate([ring, ring[:1]])
+
+
+def border_polylines(vertices, faces, tolerance=LEVEL_TOLERANCE):
+    """
+    Picks the bottom and top border polylines of a mesh as
+    split_mesh_by_curves does: the longest of the lowest loops and the
+    highest loop, by the Z of their arc-length midpoint. A mesh with a
+    single naked-edge loop is split at its four corners into the bottom and
+    top sides instead.
+
+    Returns:
+        tuple: (bottom, top) polylines running in the same direction.
+    """
+    vertices = MeshArrays.as_vertices(vertices)
+    faces = MeshArrays.as_faces(faces)
+    loops = [vertices[loop + loop[:1]] for loop in MeshArrays.boundary_loops(faces)]
+    if len(loops) == 1:
+        bottom, _, top, _ = GridRemesh.panel_sides(vertices, faces)
+    else:
+        middles = np.array([GridRemesh.resample(loop, 2)[1, 2] for loop in loops])
+        lengths = polyline_lengths(loops)
+        lowest = np.nonzero(np.abs(middles - middles.min()) < tolerance)[0]
+        bottom = loops[lowest[np.argmax(lengths[lowest])]]
+        top = align_loop(loops[int(np.argmax(middles))], bottom)
+    if GridRemesh.resample(bottom, 2)[1, 2] > GridRemesh.resample(top, 2)[1, 2]:
+        bottom, top = top, bottom
+    return bottom, top
+
+
+def split_meshes(meshes, segment_length=SEGMENT_LENGTH, rows=1):
+    """
+    strip_mesh for many (vertices, faces) meshes in one call.
+
+    Returns:
+        Strips: See strip_mesh; mesh ids index into meshes.
+    """
+    pairs = [border_polylines(vertices, faces) for vertices, faces in meshes]
+    return strip_mesh([p[0] for p in pairs], [p[1] for p in pairs], segment_length, rows)
+
+
+def strip_pieces(strips):
+    """
+    Yields (mesh index, strip number within its mesh, vertices, faces) per
+    strip of a Strips result.
+    """
+    order = np.argsort(strips.strip_ids, kind="stable")
+    ids, starts = np.unique(strips.strip_ids[order], return_index=True)
+    first_strip = {}
+    for strip_id, group in zip(ids, np.split(order, starts[1:])):
+        mesh_index = int(strips.mesh_ids[group[0]])
+        number = strip_id - first_strip.setdefault(mesh_index, strip_id)
+        vertices, faces = MeshArrays.compact(strips.vertices, strips.faces[group])
+        yield mesh_index, int(number), vertices, faces
+
+
+def split_rhino_meshes(meshes, segment_length=SEGMENT_LENGTH, rows=1):
+    """
+    split_meshes for Rhino.Geometry.Mesh objects.
+
+    Returns:
+        list: (mesh index, strip number, vertex tuples, face tuples) per strip,
+            ready for rs.AddMesh.
+    """
+    arrays = [MeshConvert.mesh_arrays(mesh) for mesh in meshes]
+    return [(mesh_index, number, [tuple(p) for p in vertices.tolist()], [tuple(f) for f in faces.tolist()])
+            for mesh_index, number, vertices, faces in strip_pieces(split_meshes(arrays, segment_length, rows))]
@@ -0,0 +1,198 @@
+"""
+Shell thickness / clearance field over whole roof zones.
+
+MeshProjection.draw_projection_lines added one line object per vertex just to
+find the shortest one. Here every vertex of every inner panel gets its
+distance to the outer shell (or to any clearance surface) from batched
+MeshBVH queries:
+
+- panels are streamed one at a time against one hierarchy over the outer
+  shell, and queries run in fixed-size chunks, so memory is bounded by the
+  outer shell plus one panel;
+- each panel gets min/max/mean and percentiles, and its out-of-tolerance
+  vertices are grouped into regions (connected along mesh edges, thin and
+  thick separately) with their size, worst value and centre;
+- the values go to a ScalarField .vfield file, which colours the panels'
+  vertices in Rhino without adding any objects.
+
+    python ThicknessField.py outer.obj panels/*.obj --design 0.3 --tolerance 0.01 -o zone.vfield
+
+Requires CPython 3 with NumPy and SciPy.
+"""
+import argparse
+import collections
+import csv
+import json
+import os
+import time
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+import MeshArrays
+import MeshBVH
+import MeshConvert
+import ScalarField
+
+PERCENTILES = (5, 50, 95)
+
+PanelReport = collections.namedtuple("PanelReport", "panel vertices min max mean percentiles out_of_tolerance regions")
+Region = collections.namedtuple("Region", "kind vertices worst center")
+
+
+def vertex_adjacency(faces, count):
+    """Returns the sparse vertex adjacency of the mesh edges."""
+    a = faces
+    b = np.roll(faces, -1, axis=1)
+    keep = a != b
+    rows, cols = a[keep], b[keep]
+    data = np.ones(len(rows), dtype=np.int8)
+    return sparse.coo_matrix((data, (rows, cols)), shape=(count, count)).tocsr()
+
+
+def out_of_tolerance_regions(vertices, faces, values, low, high):
+    """
+    Groups vertices with values below low ("thin") or above high ("thick")
+    into regions connected along mesh edges.
+
+    Returns:
+        list: Region(kind, vertex count, worst value, (3,) centre) per region,
+            worst first.
+    """
+    regions = []
+    adjacency = None
+    for kind, mask, worst in (("thin", values < low, np.min), ("thick", values > high, np.max)):
+        if not mask.any():
+            continue
+        if adjacency is None:
+            adjacency = vertex_adjacency(faces, len(vertices))
+        inside = np.nonzero(mask)[0]
+        count, labels = csgraph.connected_components(adjacency[inside][:, inside], directed=False)
+        order = np.argsort(labels, kind="stable")
+        for group in np.split(inside[order], np.cumsum(np.bincount(labels, minlength=count))[:-1]):
+            regions.append(Region(kind, len(group), float(worst(values[group])),
+                                  vertices[group].mean(axis=0)))
+    return sorted(regions, key=lambda r: -max(low - r.worst, r.worst - high))
+
+
+def panel_report(panel_id, vertices, faces, values, low=-np.inf, high=np.inf):
+    """Statistics and out-of-tolerance regions of one panel's field."""
+    regions = out_of_tolerance_regions(vertices, faces, values, low, high)
+    return PanelReport(panel_id, len(values), float(values.min()), float(values.max()), float(values.mean()),
+                       [float(p) for p in np.percentile(values, PERCENTILES)],
+                       int(((values < low) | (values > high)).sum()), regions)
+
+
+def panel_report_mesh(panel_id, mesh, values, low=None, high=None):
+    """
+    panel_report for a Rhino.Geometry.Mesh and its per-vertex values.
+    """
+    vertices, faces = MeshConvert.mesh_arrays(mesh)
+    return panel_report(panel_id, vertices, faces, np.asarray(values, dtype=float),
+                        -np.inf if low is None else low, np.inf if high is None else high)
+
+
+class ThicknessAnalysis(object):
+    """
+    Distances from panels to one target surface (the outer shell).
+    """
+
+    def __init__(self, target_vertices, target_faces, design=None, tolerance=None, chunk=MeshBVH.CHUNK, workers=1):
+        self.bvh = MeshBVH.TriangleBVH(target_vertices, target_faces)
+        self.chunk = chunk
+        self.workers = workers
+        if design is not None and tolerance is not None:
+            self.low, self.high = design - tolerance, design + tolerance
+        else:
+            self.low, self.high = -np.inf, np.inf
+
+    def field(self, vertices):
+        """Returns the distance from every vertex to the target surface."""
+        return self.bvh.closest_points(MeshArrays.as_vertices(vertices), self.chunk, self.workers).distances
+
+    def panel(self, panel_id, vertices, faces):
+        """
+        Returns (values, PanelReport) of one panel.
+        """
+        vertices = MeshArrays.as_vertices(vertices)
+        faces = MeshArrays.as_faces(faces)
+        values = self.field(vertices)
+        return values, panel_report(panel_id, vertices, faces, values, self.low, self.high)
+
+    def run(self, panels, writer=None, report=None):
+        """
+        Streams (panel id, vertices, faces) panels through the analysis.
+
+        Args:
+            panels: Iterable of (panel id, vertices, faces).
+            writer: Optional ScalarField.FieldWriter for the per-vertex values.
+            report: Optional callable receiving each PanelReport.
+
+        Returns:
+            list: PanelReport per panel.
+        """
+        reports = []
+        for panel_id, vertices, faces in panels:
+            values, panel = self.panel(panel_id, vertices, faces)
+            if writer is not None:
+                writer.add(panel_id, values)
+            if report is not None:
+                report(panel)
+            reports.append(panel)
+        return reports
+
+
+def report_rows(reports):
+    """Flattens PanelReports into CSV rows (one per panel)."""
+    rows = []
+    for r in reports:
+        row = {"panel": r.panel, "vertices": r.vertices, "min": r.min, "max": r.max, "mean": r.mean,
+               "out_of_tolerance": r.out_of_tolerance, "regions": len(r.regions)}
+        row.update({"p{}".format(p): value for p, value in zip(PERCENTILES, r.percentiles)})
+        rows.append(row)
+    return rows
+
+
+def format_report(r):
+    return "{}: {} vertices, min {:.4f}, max {:.4f}, p{} {:.4f}, p{} {:.4f}, {} out of tolerance in {} regions".format(
+        r.panel, r.vertices, r.min, r.max, PERCENTILES[0], r.percentiles[0], PERCENTILES[-1], r.percentiles[-1],
+        r.out_of_tolerance, len(r.regions))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shell thickness field of inner panels against the outer shell.")
+    parser.add_argument("outer", help="Outer shell OBJ/STL file")
+    parser.add_argument("panels", nargs="+", help="Inner panel OBJ/STL files")
+    parser.add_argument("-o", "--out", default="thickness.vfield", help="Per-vertex field file")
+    parser.add_argument("--design", type=float, default=None, help="Design thickness")
+    parser.add_argument("--tolerance", type=float, default=None, help="Allowed deviation from the design thickness")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for the queries")
+    args = parser.parse_args()
+
+    start = time.time()
+    analysis = ThicknessAnalysis(*MeshArrays.read_mesh(args.outer), design=args.design, tolerance=args.tolerance,
+                                 workers=args.workers)
+    panels = ((os.path.splitext(os.path.basename(path))[0],) + tuple(MeshArrays.read_mesh(path))
+              for path in args.panels)
+    low = None if np.isinf(analysis.low) else analysis.low
+    high = None if np.isinf(analysis.high) else analysis.high
+    with ScalarField.FieldWriter(args.out, "thickness", low, high) as writer:
+        reports = analysis.run(panels, writer, lambda r: print(format_report(r)))
+
+    base = os.path.splitext(args.out)[0]
+    rows = report_rows(reports)
+    with open(base + "_report.csv", "w", newline="") as stream:
+        fields = ["panel", "vertices", "min", "max", "mean"] + ["p{}".format(p) for p in PERCENTILES]
+        writer = csv.DictWriter(stream, fieldnames=fields + ["out_of_tolerance", "regions"])
+        writer.writeheader()
+        writer.writerows(rows)
+    with open(base + "_regions.json", "w") as stream:
+        json.dump({r.panel: [{"kind": g.kind, "vertices": g.vertices, "worst": g.worst, "center": g.center.tolist()}
+                             for g in r.regions] for r in reports}, stream, indent=1)
+    print("{} panels, {} vertices in {:.2f}s".format(len(reports), sum(r.vertices for r in reports),
+                                                     time.time() - start))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import rhinoscriptsyntax as rs
+import CoordinateSheet
 def PrintControlPoints():
     surface = rs.GetObject("Select surface", rs.filter.surface)
     points = rs.SurfacePoints(surface)
@@ -9,10 +10,23 @@ def PrintControlPoints():
     i = 0
     for u in range(count[0]):
         for v in range(count[1]):
-            print "CV[", u, ",", v, "] = ", points[i]
+            print("CV[", u, ",", v, "] = ", points[i])
             i += 1
+# Control net to a coordinate sheet (.cpts) instead of one point object per CV;
+# cancelling the file dialog adds the points as before
+def ExportControlPoints(surface, path):
+    points = rs.SurfacePoints(surface)
+    if points is None: return 0
+    count = rs.SurfacePointCount(surface)
+    with CoordinateSheet.SheetWriter(path) as writer:
+        return writer.add_plate(surface, [(p.X, p.Y, p.Z) for p in points],
+                                CoordinateSheet.grid_indices(count[0], count[1]))
 surface = rs.GetObject("Select surface", rs.filter.surface)
-points = rs.SurfacePoints(surface)
-for i in points:
-    np = rs.AddPoint(i)
+path = rs.SaveFileName("Save coordinate sheet", "Coordinate sheet (*.cpts)|*.cpts||")
+if path:
+    print("Control points:", ExportControlPoints(surface, path), "->", path)
+else:
+    points = rs.SurfacePoints(surface)
+    for i in points:
+        np = rs.AddPoint(i)
 #PrintControlPoints()
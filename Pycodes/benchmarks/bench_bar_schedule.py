@@ -0,0 +1,71 @@
+"""
+Times BarSchedule on a synthetic slab: a grid of straight bars, bent edge
+bars and curved bars along a wavy rail (RebarModel centrelines), from the
+model to the CSV and JSON files:
+
+    python Pycodes/benchmarks/bench_bar_schedule.py [BARS]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path[0:0] = [BENCHMARKS, os.path.dirname(BENCHMARKS)]
+
+import BarSchedule  # noqa: E402
+import RebarModel  # noqa: E402
+
+SPACING = 0.15
+LEG = 0.3           # Bent edge bars: legs turned down at both ends
+
+
+def slab_model(bars):
+    """A third each of straight, bent and curved bars, in three diameters."""
+    model = RebarModel.RebarModel()
+    third = bars // 3
+    y = np.arange(third) * SPACING
+    # Straight bars, lengths following the slab outline
+    straight = np.zeros((third, 2, 3))
+    straight[:, :, 1] = y[:, None]
+    straight[:, 1, 0] = 6.0 + 6.0 * np.abs(np.sin(y / 9.0))
+    model.extend((straight.reshape(-1, 3), np.arange(third + 1) * 2), 0.012, "Rebar_D12")
+    # Bent edge bars in four lengths
+    bent = np.zeros((third, 4, 3))
+    bent[:, :, 0] = y[:, None]
+    bent[:, 2:, 1] = (2.0 + (np.arange(third) % 4) * 0.5)[:, None]
+    bent[:, [0, 3], 2] = -LEG
+    model.extend((bent.reshape(-1, 3), np.arange(third + 1) * 4), 0.016, "Rebar_D16")
+    # Curved bars along a wavy rail
+    count = bars - 2 * third
+    x = np.linspace(0.0, count * 0.1, int(count * 0.1 * 2) + 1)
+    rail = np.column_stack([x, 2.0 * np.sin(x / 7.0), np.zeros_like(x)])
+    windows, _ = RebarModel.windows_along(rail, np.arange(count) * 0.1, 4.0)
+    model.extend(windows, 0.010, "Rebar_1_copy")
+    return model
+
+
+def main():
+    bars = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    model = slab_model(bars)
+    with tempfile.TemporaryDirectory() as folder:
+        start = time.time()
+        result = BarSchedule.schedule(model)
+        seconds = time.time() - start
+        start = time.time()
+        paths = BarSchedule.export_schedule(result, os.path.join(folder, "schedule.csv"))
+        write = time.time() - start
+        sizes = [os.path.getsize(path) // 1024 for path in paths]
+    shapes = {}
+    for mark in result.marks:
+        shapes[mark.shape] = shapes.get(mark.shape, 0) + mark.count
+    print("{} bars, {} points -> {} marks {} in {:.3f}s, written in {:.3f}s ({} KB CSV, {} KB JSON)".format(
+        len(model), len(model.points), len(result.marks), shapes, seconds, write, *sizes))
+    for diameter, total in BarSchedule.diameter_totals(result).items():
+        print("  D{:g}: {} bars, {:.0f} m, {:.0f} kg".format(diameter, total["bars"], total["length"], total["mass"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Times FormworkBatch.run_batch on a zone of synthetic OBJ panels with one
+worker and with every core, to check the batch scales with the core count:
+
+    python Pycodes/benchmarks/bench_formwork_batch.py [panels] [quads per side]
+"""
+import os
+import sys
+import tempfile
+import time
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path[0:0] = [BENCHMARKS, os.path.dirname(BENCHMARKS)]
+
+import FormworkBatch  # noqa: E402
+import MeshArrays  # noqa: E402
+import synthetic  # noqa: E402
+
+
+def main():
+    panels = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    workers = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as folder:
+        source = os.path.join(folder, "panels")
+        os.makedirs(source)
+        for index, (vertices, faces) in enumerate(synthetic.zone_panels(panels, count)):
+            MeshArrays.write_obj(os.path.join(source, "panel_{:04d}.obj".format(index)), vertices, faces)
+
+        timings = {}
+        for label, pool in (("1 worker", 1), ("{} workers".format(workers), workers)):
+            start = time.time()
+            FormworkBatch.run_batch(source, os.path.join(folder, label.replace(" ", "_")), workers=pool)
+            timings[label] = time.time() - start
+    serial = timings["1 worker"]
+    for label, seconds in timings.items():
+        print("{:<12} {:8.3f}s {:6.2f}x".format(label, seconds, serial / seconds))
+
+
+if __name__ == "__main__":
+    main()
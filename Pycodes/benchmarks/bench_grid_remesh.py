@@ -0,0 +1,29 @@
+"""
+Times GridRemesh.grid_remesh on synthetic 3m x 3m panels of increasing
+density (the common DinhViTam plate case):
+
+    python Pycodes/benchmarks/bench_grid_remesh.py [LOD]
+"""
+import os
+import sys
+import time
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path[0:0] = [BENCHMARKS, os.path.dirname(BENCHMARKS)]
+
+import GridRemesh  # noqa: E402
+import synthetic  # noqa: E402
+
+
+def main():
+    lod = int(sys.argv[1]) if len(sys.argv) > 1 else -50
+    for count in (20, 50, 100, 200):
+        vertices, faces = synthetic.grid_panel(count)
+        start = time.time()
+        grid, quads = GridRemesh.grid_remesh(vertices, faces, lod)
+        seconds = time.time() - start
+        print("{:6d} input faces -> {:5d} quads {:8.1f} ms".format(len(faces), len(quads), 1000 * seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Times MeshBVH closest-point queries from the vertices of an offset shell
+onto a synthetic opera shell, against the brute-force
+MeshArrays.closest_points (timed on a sample and checked point by point):
+
+    python Pycodes/benchmarks/bench_mesh_bvh.py [MAX_QUERIES] [WORKERS]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path[0:0] = [BENCHMARKS, os.path.dirname(BENCHMARKS)]
+
+import MeshArrays  # noqa: E402
+import MeshBVH  # noqa: E402
+import synthetic  # noqa: E402
+
+SAMPLE = 200    # Queries checked against the brute-force search
+
+
+def main():
+    max_queries = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    vertices, faces = synthetic.opera_shell(300)
+    start = time.time()
+    bvh = MeshBVH.TriangleBVH(vertices, faces)
+    print("{} faces, hierarchy built in {:.3f}s ({} leaves)".format(len(faces), time.time() - start, bvh.leaf_count))
+
+    for count in (100, 300, 1000):
+        inner, _ = synthetic.opera_shell(count)
+        queries = MeshArrays.offset(inner, synthetic.opera_shell(count)[1], 0.3)
+        if len(queries) > max_queries:
+            break
+        start = time.time()
+        result = bvh.closest_points(queries, workers=workers)
+        seconds = time.time() - start
+        line = "{:8d} queries bvh {:7.3f}s ({:.2f} us/query)".format(len(queries), seconds, 1e6 * seconds / len(queries))
+
+        sample = np.linspace(0, len(queries) - 1, min(SAMPLE, len(queries))).astype(np.int64)
+        start = time.time()
+        _, _, _, distance = MeshArrays.closest_points(vertices, faces, queries[sample])
+        brute = (time.time() - start) * len(queries) / len(sample)
+        error = np.abs(distance - result.distances[sample]).max()
+        line += "   brute force ~{:8.1f}s (extrapolated)   max error {:.1e}".format(brute, error)
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
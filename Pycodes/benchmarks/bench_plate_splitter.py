@@ -0,0 +1,59 @@
+"""
+Times PlateSplitter.split_into_plates on a synthetic 60m x 40m opera shell
+against the plane-by-plane splitting of DinhViTam.cut_mesh_into_plates
+(every fragment split by every plane, as MeshArrays.split_by_plane), and
+the strip-parallel PlateCutBatch.cut_parallel on every core:
+
+    python Pycodes/benchmarks/bench_plate_splitter.py [MAX_COUNT]
+
+The plane-by-plane run is skipped above 400 x 400 quads.
+"""
+import os
+import sys
+import time
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path[0:0] = [BENCHMARKS, os.path.dirname(BENCHMARKS)]
+
+import MeshArrays  # noqa: E402
+import PlateCutBatch  # noqa: E402
+import PlateSplitter  # noqa: E402
+import synthetic  # noqa: E402
+
+
+def split_plane_by_plane(vertices, faces, size=PlateSplitter.PLATE_SIZE):
+    """The fragments x planes loop of cut_mesh_into_plates."""
+    frame = PlateSplitter.grid_frame(vertices, size)
+    planes = [((frame.x0 + k * size, 0.0, 0.0), (1.0, 0.0, 0.0)) for k in range(1, frame.cols)]
+    planes += [((0.0, frame.y0 + k * size, 0.0), (0.0, 1.0, 0.0)) for k in range(1, frame.rows)]
+    fragments = [(vertices, faces)]
+    for origin, normal in planes:
+        fragments = [piece for v, f in fragments for piece in MeshArrays.split_by_plane(v, f, origin, normal)]
+    return fragments
+
+
+def main():
+    max_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    for count in (100, 200, 400, 1000, 2000):
+        if count > max_count:
+            break
+        vertices, faces = synthetic.opera_shell(count)
+        start = time.time()
+        plates, frame = PlateSplitter.split_into_plates(vertices, faces)
+        seconds = time.time() - start
+        line = "{:8d} faces -> {:4d} plates ({}x{} cells) grid {:8.3f}s".format(
+            len(faces), len(plates), frame.cols, frame.rows, seconds)
+        start = time.time()
+        PlateCutBatch.cut_parallel(vertices, faces)
+        line += "   strips {:8.3f}s".format(time.time() - start)
+        if count <= 400:
+            start = time.time()
+            fragments = split_plane_by_plane(vertices, faces)
+            line += "   plane-by-plane {:8.3f}s ({} fragments)".format(time.time() - start, len(fragments))
+        area = sum(MeshArrays.face_areas(plate.vertices, plate.faces).sum() for plate in plates)
+        line += "   area error {:.1e}".format(abs(area - MeshArrays.face_areas(vertices, faces).sum()) / area)
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
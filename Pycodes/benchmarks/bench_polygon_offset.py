@@ -0,0 +1,76 @@
+"""
+Times PolygonOffset's single sweep over synthetic slab outlines against
+offsetting the outline from scratch for every bar (what the Rhino version
+did), and checks the cover: no bar vertex may come closer to the outline
+than its offset distance.
+
+    python Pycodes/benchmarks/bench_polygon_offset.py [MAX_VERTICES]
+"""
+import collections
+import os
+import sys
+import time
+
+import numpy as np
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path[0:0] = [BENCHMARKS, os.path.dirname(BENCHMARKS)]
+
+import PolygonOffset  # noqa: E402
+import synthetic  # noqa: E402
+
+COVER = 0.025
+SPACING = 0.15
+SAMPLE = 500        # Bar vertices checked against every outline segment
+SCRATCH = 2000      # Largest outline also offset from scratch per bar
+
+
+def outline_distance(outline, points):
+    """Distance from points to the closed outline's segments (XY)."""
+    a = outline[:, :2]
+    b = np.roll(a, -1, axis=0)
+    ab = b - a
+    best = np.full(len(points), np.inf)
+    for start in range(0, len(a), 20000):
+        sa, sab = a[start:start + 20000], ab[start:start + 20000]
+        ap = points[:, None, :2] - sa[None]
+        t = np.clip(np.einsum("qsi,si->qs", ap, sab) / np.einsum("si,si->s", sab, sab), 0.0, 1.0)
+        best = np.minimum(best, np.linalg.norm(ap - t[..., None] * sab[None], axis=2).min(axis=1))
+    return best
+
+
+def main():
+    max_vertices = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    for count in (2000, 20000, 200000):
+        if count > max_vertices:
+            break
+        outline = synthetic.slab_outline(count)
+        start = time.time()
+        loops = PolygonOffset.inward_offsets(outline, SPACING, COVER)
+        seconds = time.time() - start
+        per_level = collections.Counter(loop.level for loop in loops)
+        vertices = sum(len(loop.points) for loop in loops)
+        line = "{:7d} vertices: {:3d} levels, {:4d} bars (up to {} per level), {:8d} bar vertices in {:6.2f}s".format(
+            count, len(per_level), len(loops), max(per_level.values()), vertices, seconds)
+
+        points = np.concatenate([loop.points for loop in loops])
+        distances = np.concatenate([np.full(len(loop.points), loop.distance) for loop in loops])
+        sample = np.linspace(0, len(points) - 1, min(SAMPLE, len(points))).astype(np.int64)
+        slack = (outline_distance(outline, points[sample]) - distances[sample]).min()
+        line += "   cover slack {:+.1e}".format(slack)
+
+        if count <= SCRATCH:
+            start = time.time()
+            scratch = [PolygonOffset.inward_offsets(outline, SPACING, COVER + SPACING * level, 1)
+                       for level in range(len(per_level))]
+            line += "   from scratch {:6.2f}s".format(time.time() - start)
+            areas = [sum(PolygonOffset.signed_area(loop.points[:-1, :2]) for loop in loops if loop.level == level)
+                     for level in range(len(per_level))]
+            scratch_areas = [sum(PolygonOffset.signed_area(loop.points[:-1, :2]) for loop in level)
+                             for level in scratch]
+            line += " (max area difference {:.1e})".format(np.abs(np.subtract(areas, scratch_areas)).max())
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Times PropLayout.layout_zone on a zone of synthetic 3m x 3m panels and
+compares the prop count with one prop per vertex:
+
+    python Pycodes/benchmarks/bench_prop_layout.py [panels] [quads per side]
+"""
+import os
+import sys
+import time
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path[0:0] = [BENCHMARKS, os.path.dirname(BENCHMARKS)]
+
+import PropLayout  # noqa: E402
+import synthetic  # noqa: E402
+
+
+def main():
+    panels = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    zone = [(vertices, faces, vertices[:, 2].min() - 0.2, vertices[0])
+            for vertices, faces in synthetic.zone_panels(panels, count)]
+    start = time.time()
+    table = PropLayout.layout_zone(zone)
+    seconds = time.time() - start
+    vertices = sum(len(panel[0]) for panel in zone)
+    print("{} panels: {} props (one per vertex: {}) in {:.2f}s".format(panels, len(table), vertices, seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: MeshProcessor.create_geometry_and_labels, direct vs. staged.
+
+Builds a synthetic doubly curved soffit panel (about 2,000 vertices), creates
+the props once through per-vertex rhinoscriptsyntax calls and once through
+PropStage, and prints document calls and wall time per vertex for both.
+Run it from Rhino's script editor, or headless with the stand-in:
+
+    PYTHONPATH=Pycodes/headless:Pycodes python Pycodes/benchmarks/bench_prop_staging.py
+
+Created objects are deleted afterwards.
+"""
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rhinoscriptsyntax as rs
+import Rhino.Geometry as rg
+import scriptcontext as sc
+
+from Body_Formwork_3 import MeshProcessor
+
+GRID = 44  # 45 x 45 = 2,025 vertices
+
+# rhinoscriptsyntax calls made per vertex by the direct path
+DOCUMENT_CALLS = ["AddLine", "CurveLength", "AddCircle", "ExtrudeCurveStraight",
+                  "DeleteObject", "AddSphere", "AddText"]
+
+
+def panel_mesh(count, size=3.0):
+    """Returns a count x count quad mesh over a size x size doubly curved patch."""
+    mesh = rg.Mesh()
+    step = size / count
+    for i in range(count + 1):
+        for j in range(count + 1):
+            x, y = i * step, j * step
+            z = 4.0 + 0.3 * math.sin(x) * math.cos(0.7 * y)
+            mesh.Vertices.Add(x, y, z)
+    for i in range(count):
+        for j in range(count):
+            a = i * (count + 1) + j
+            mesh.Faces.AddFace(a, a + count + 1, a + count + 2, a + 1)
+    mesh.Normals.ComputeNormals()
+    return mesh
+
+
+def count_calls(names):
+    """Wraps the named rhinoscriptsyntax functions with call counters."""
+    counts = dict((name, 0) for name in names)
+    originals = dict((name, getattr(rs, name)) for name in names)
+
+    def wrap(name):
+        def counted(*args, **kwargs):
+            counts[name] += 1
+            return originals[name](*args, **kwargs)
+        return counted
+
+    for name in names:
+        setattr(rs, name, wrap(name))
+
+    def restore():
+        for name, function in originals.items():
+            setattr(rs, name, function)
+    return counts, restore
+
+
+def run(mesh_id, staged):
+    """Creates the props once and returns (document calls, seconds)."""
+    processor = MeshProcessor(mesh_id, 0)
+    processor.offset_lowest = processor.calculate_new_origin()
+    before = set(rs.AllObjects() or [])
+
+    counts, restore = count_calls(DOCUMENT_CALLS)
+    start = time.time()
+    try:
+        result = processor.create_geometry_and_labels(staged=staged)
+    finally:
+        restore()
+    seconds = time.time() - start
+
+    calls = sum(counts.values())
+    if staged:
+        calls += len(result)  # one ObjectTable.Add* per staged record
+    created = [obj for obj in rs.AllObjects() or [] if obj not in before]
+    rs.DeleteObjects(created)
+    return calls, seconds
+
+
+def main():
+    mesh_id = sc.doc.Objects.AddMesh(panel_mesh(GRID))
+    vertex_count = len(rs.MeshVertices(mesh_id))
+    print("Panel vertices: {}".format(vertex_count))
+    for label, staged in (("direct", False), ("staged", True)):
+        calls, seconds = run(mesh_id, staged)
+        print("{:>7}: {:7d} document calls ({:.1f}/vertex), {:.3f}s ({:.3f} ms/vertex)".format(
+            label, calls, float(calls) / vertex_count, seconds, 1000.0 * seconds / vertex_count))
+    rs.DeleteObject(mesh_id)
+
+
+if __name__ == "__main__":
+    main()
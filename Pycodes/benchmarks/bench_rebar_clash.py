@@ -0,0 +1,92 @@
+"""
+Times RebarClash on a synthetic slab: two layers of straight 6 m bars at
+SPACING over a square slab, and a grid of prop posts under it whose tops
+reach into the bottom layer where the soffit was misread. A corner of the
+slab is checked against every bar-prop pair by brute force:
+
+    python Pycodes/benchmarks/bench_rebar_clash.py [BARS] [PROPS]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path[0:0] = [BENCHMARKS, os.path.dirname(BENCHMARKS)]
+
+import RebarClash  # noqa: E402
+
+SPACING = 0.15
+BAR = 6.0           # Bar length (m)
+SOFFIT = 3.0        # Slab soffit; bottom bars at SOFFIT + COVER
+COVER = 0.03
+CORNER = 20.0       # Slab corner (m) checked by brute force
+
+
+def slab(bars, props, seed=0):
+    """Returns (bar capsules, prop capsules) of a square slab."""
+    rng = np.random.default_rng(seed)
+    per_layer = bars // 2
+    side = np.sqrt(per_layer * SPACING * BAR)
+    lines = int(side / SPACING)
+    pieces = -(-per_layer // lines)
+    index = np.arange(per_layer)
+    across = (index % lines) * SPACING
+    along = (index // lines) * BAR
+    a = np.zeros((bars, 3))
+    b = np.zeros((bars, 3))
+    a[:per_layer, 0], a[:per_layer, 1] = along, across
+    b[:per_layer, 0], b[:per_layer, 1] = along + BAR, across
+    a[per_layer:, 0], a[per_layer:, 1] = across[:bars - per_layer], along[:bars - per_layer]
+    b[per_layer:, 0], b[per_layer:, 1] = across[:bars - per_layer], along[:bars - per_layer] + BAR
+    a[:, 2] = b[:, 2] = SOFFIT + COVER + np.where(np.arange(bars) < per_layer, 0.0, 0.012)
+    radius = np.where(np.arange(bars) < per_layer, 0.006, 0.005)
+    first = RebarClash.Capsules(a, b, radius, np.arange(bars))
+
+    grid = int(np.ceil(np.sqrt(props)))
+    step = pieces * BAR / grid
+    cells = np.arange(props)
+    top = np.column_stack([(cells % grid + 0.5) * step, (cells // grid + 0.5) * step,
+                           SOFFIT + rng.normal(0.0, 0.02, props)])
+    base = top.copy()
+    base[:, 2] = 0.0
+    second = RebarClash.Capsules(base, top, np.full(props, RebarClash.PROP_RADIUS), np.arange(props))
+    return first, second
+
+
+def brute_force(first, second):
+    """Deepest penetration per clashing (bar, prop) pair, all pairs tested."""
+    m, n = len(first.a), len(second.a)
+    distance, _, _ = RebarClash.segment_distance(np.repeat(first.a, n, axis=0), np.repeat(first.b, n, axis=0),
+                                                 np.tile(second.a, (m, 1)), np.tile(second.b, (m, 1)))
+    penetration = np.repeat(first.radius, n) + np.tile(second.radius, m) - distance
+    hit = np.nonzero(penetration > 0)[0]
+    return dict(zip(zip(hit // n, hit % n), penetration[hit]))
+
+
+def main():
+    bars = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    props = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    first, second = slab(bars, props)
+
+    start = time.time()
+    result = RebarClash.clashes(first, second)
+    seconds = time.time() - start
+    print("{} bars x {} props: {} clashes, deepest {:.4f} m, in {:.2f}s".format(
+        bars, props, len(result.first), result.penetration.max() if len(result.first) else 0.0, seconds))
+
+    corner = np.nonzero((first.a[:, :2] < CORNER).all(axis=1) & (first.b[:, :2] < CORNER).all(axis=1))[0]
+    near = np.nonzero((second.b[:, :2] < CORNER - 0.1).all(axis=1))[0]
+    expected = brute_force(RebarClash.Capsules(first.a[corner], first.b[corner], first.radius[corner], corner),
+                           RebarClash.Capsules(second.a[near], second.b[near], second.radius[near], near))
+    expected = {(corner[i], near[j]): p for (i, j), p in expected.items()}
+    inside = np.isin(result.first, corner) & np.isin(result.second, near)
+    found = dict(zip(zip(result.first[inside], result.second[inside]), result.penetration[inside]))
+    error = max([abs(found[key] - p) for key, p in expected.items() if key in found] or [0.0])
+    print("corner check: {} bars x {} props, {} clashes expected, {} found, max penetration error {:.1e}".format(
+        len(corner), len(near), len(expected), len(found), error))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Times RebarCover on the synthetic opera shell: bars laid along the shell grid
+between the shell and a 0.3 thick outer shell, a few of them set too close
+to a face or poking through it, and checks that exactly those are flagged:
+
+    python Pycodes/benchmarks/bench_rebar_cover.py [COUNT] [BAR_VERTICES]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path[0:0] = [BENCHMARKS, os.path.dirname(BENCHMARKS)]
+
+import MeshArrays  # noqa: E402
+import RebarCover  # noqa: E402
+import RebarModel  # noqa: E402
+import synthetic  # noqa: E402
+
+THICKNESS = 0.3
+DEPTHS = (0.05, 0.25)   # Bar layers, measured from the inner shell
+DIAMETERS = (0.012, 0.016)
+SHALLOW = 0.018         # Depth of the bars that miss the cover
+THROUGH = -0.02         # Depth of the bars that poke through
+
+
+def shell_model(vertices, faces, count, bar_vertices):
+    """
+    Bars along the shell grid rows, in both layers, every fiftieth one moved
+    to SHALLOW and every hundred-and-first to THROUGH (inner layer only).
+
+    Returns:
+        tuple: (RebarModel, (bars,) expected violation flags).
+    """
+    normals = MeshArrays.vertex_normals(vertices, faces)
+    grid = vertices.reshape(count + 1, count + 1, 3)
+    normals = normals.reshape(count + 1, count + 1, 3)
+    pieces = count // bar_vertices
+    model = RebarModel.RebarModel()
+    expected = []
+    for depth, diameter in zip(DEPTHS, DIAMETERS):
+        # Rows of the grid cut into bars of bar_vertices vertices, one
+        # vertex inside the boundary
+        rows = slice(1, count)
+        cut = slice(1, 1 + pieces * bar_vertices)
+        points = grid[rows, cut].reshape(-1, bar_vertices, 3)
+        along = normals[rows, cut].reshape(-1, bar_vertices, 3)
+        depths = np.full(len(points), depth)
+        flags = np.zeros(len(points), dtype=bool)
+        if depth == DEPTHS[0]:
+            depths[::50] = SHALLOW
+            depths[::101] = THROUGH
+            flags[::50] = flags[::101] = True
+        centrelines = points + depths[:, None, None] * along
+        model.extend((centrelines.reshape(-1, 3), np.arange(len(points) + 1) * bar_vertices), diameter,
+                     "Rebar_D{:g}".format(diameter * 1000))
+        expected.append(flags)
+    return model, np.concatenate(expected)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    bar_vertices = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    vertices, faces = synthetic.opera_shell(count)
+    outer = MeshArrays.offset(vertices, faces, THICKNESS)
+    model, expected = shell_model(vertices, faces, count, bar_vertices)
+    shells = [("inner", vertices, faces), ("outer", outer, faces)]
+
+    start = time.time()
+    check = RebarCover.CoverCheck(shells)
+    build = time.time() - start
+    start = time.time()
+    result = check.run(model)
+    seconds = time.time() - start
+    with tempfile.TemporaryDirectory() as folder:
+        paths = RebarCover.write_report(model, result, check.names, os.path.join(folder, "cover"))
+        sizes = [os.path.getsize(path) // 1024 for path in paths]
+    points, _ = RebarCover.sample_centrelines(model, check.step)
+    print("{} faces per shell, BVHs in {:.2f}s; {} bars, {} samples checked in {:.2f}s ({} KB CSV, {} KB JSON)".format(
+        len(faces), build, len(model), len(points), seconds, *sizes))
+    for summary in RebarCover.family_summary(model, result):
+        print("  " + RebarCover.format_summary(summary))
+    missed = int((expected & ~result.violation).sum())
+    false = int((result.violation & ~expected).sum())
+    print("{} violations expected, {} flagged, {} missed, {} false".format(
+        int(expected.sum()), int(result.violation.sum()), missed, false))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Times CurveProcessor's rebar array as RebarModel centreline records against
+the per-bar document solids it used to build (circle, trimmed segment,
+extrusion, cap and two deletes per bar), and prints what the records cost in
+memory and on disk:
+
+    python Pycodes/benchmarks/bench_rebar_model.py [BARS]
+
+The per-bar path runs on the headless stand-in for the first DOCUMENT bars
+only; its per-bar cost is extrapolated.
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path[0:0] = [BENCHMARKS, os.path.dirname(BENCHMARKS)]
+
+import run_headless  # noqa: E402
+import RebarModel  # noqa: E402
+import rhinoscriptsyntax as rs  # noqa: E402
+import scriptcontext as sc  # noqa: E402
+
+SPACING = 0.1
+LENGTH = 4.0
+SAMPLES = 2         # Rail samples per metre (about 1 mm chord deviation)
+DOCUMENT = 500      # Bars built through the per-bar document path
+SHOWN = 100         # Bars built as pipe solids from the model
+
+
+def rail(bars):
+    """Wavy plan rail long enough for bars at SPACING."""
+    x = np.linspace(0.0, bars * SPACING, int(bars * SPACING * SAMPLES) + 1)
+    return np.column_stack([x, 2.0 * np.sin(x / 7.0), np.zeros_like(x)])
+
+
+def main():
+    bars = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    path = rail(bars)
+
+    start = time.time()
+    windows, _ = RebarModel.windows_along(path, np.arange(bars) * SPACING, LENGTH)
+    model = RebarModel.RebarModel()
+    model.extend(windows, 2 * 0.005, "Rebar_1_copy")
+    seconds = time.time() - start
+    print("model:     {:6d} bars, {:8d} points, {:6.1f} MB in {:.3f}s".format(
+        len(model), len(model.points), model.nbytes / 1e6, seconds))
+
+    for label, function in (("lengths", model.lengths), ("segments", model.segments), ("bounds", model.bounds)):
+        start = time.time()
+        function()
+        print("{:<10} {:.3f}s".format(label + ":", time.time() - start))
+    with tempfile.TemporaryDirectory() as folder:
+        target = os.path.join(folder, "rebar.npz")
+        start = time.time()
+        model.save(target)
+        print("save:      {:.3f}s, {:.1f} MB on disk".format(time.time() - start, os.path.getsize(target) / 1e6))
+
+    sc.doc.Clear()
+    start = time.time()
+    RebarModel.add_pipes(model, range(SHOWN))
+    print("pipes:     {} bars shown in {:.3f}s, {} document calls".format(
+        SHOWN, time.time() - start, sum(sc.doc.Objects.calls.values())))
+
+    sc.doc.Clear()
+    module = run_headless.load_script("Rebar_byCurve-Mesh_3.py")
+    module.RebarModel = None
+    processor = module.CurveProcessor()
+    processor.curve_2 = rs.AddPolyline(rail(DOCUMENT).tolist())
+    processor.rebar_length = LENGTH
+    calls = sum(sc.doc.Objects.calls.values())
+    start = time.time()
+    processor.array_rebar()
+    seconds = time.time() - start
+    calls = sum(sc.doc.Objects.calls.values()) - calls
+    print("per bar:   {} bars in {:.3f}s, {:.1f} document calls/bar; {} bars would take ~{:.0f}s and {} calls".format(
+        DOCUMENT, seconds, calls / float(DOCUMENT), bars, seconds * bars / DOCUMENT, calls * bars // DOCUMENT))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Times StripMesher.split_meshes on a batch of synthetic tubes (two naked-edge
+rings, as the shell drums) and grid panels (one loop split at its corners),
+and checks that no tube strip twists: every strip edge between a bottom and
+a top division point stays at the same angle about the tube axis.
+
+    python Pycodes/benchmarks/bench_strip_mesher.py [MESHES]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path[0:0] = [BENCHMARKS, os.path.dirname(BENCHMARKS)]
+
+import StripMesher  # noqa: E402
+import synthetic  # noqa: E402
+
+RADIUS = 5.0
+HEIGHT = 2.0
+AROUND = 120
+ROWS = 4
+
+
+def tube(shift, twist):
+    """
+    A RADIUS x HEIGHT tube around a vertical axis through (shift, 0), its
+    rings rotated by twist against each other so their naked-edge loops
+    start at different angles.
+    """
+    angle = np.linspace(0.0, 2.0 * np.pi, AROUND, endpoint=False)
+    level = np.linspace(0.0, 1.0, ROWS + 1)
+    theta = angle[None, :] + twist * level[:, None]
+    vertices = np.column_stack([(shift + RADIUS * np.cos(theta)).ravel(), (RADIUS * np.sin(theta)).ravel(),
+                                np.repeat(HEIGHT * level, AROUND)])
+    i = np.arange(AROUND)
+    a = (np.arange(ROWS)[:, None] * AROUND + i[None, :]).ravel()
+    b = (np.arange(ROWS)[:, None] * AROUND + ((i + 1) % AROUND)[None, :]).ravel()
+    return vertices, np.column_stack([a, b, b + AROUND, a + AROUND])
+
+
+def tube_twist(strips, shifts):
+    """
+    Largest angle (degrees) about its tube axis between the bottom and top
+    ends of a strip edge (the first face of every strip holds the bottom
+    corner; the top corner is ROWS levels up).
+    """
+    first = np.ones(len(strips.faces), dtype=bool)
+    first[1:] = strips.strip_ids[1:] != strips.strip_ids[:-1]
+    corner = strips.faces[first, 0]
+    bottom, top = strips.vertices[corner], strips.vertices[corner + ROWS]
+    centre = np.asarray(shifts)[strips.mesh_ids[first]]
+    turn = (np.arctan2(top[:, 1], top[:, 0] - centre) - np.arctan2(bottom[:, 1], bottom[:, 0] - centre))
+    turn = np.abs((turn + np.pi) % (2.0 * np.pi) - np.pi)
+    return np.degrees(turn.max()) if len(turn) else 0.0
+
+
+def main():
+    meshes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    tubes = [tube(20.0 * k, 0.05 * (k % 7)) for k in range(meshes // 2)]
+    shifts = [20.0 * k for k in range(len(tubes))]
+    panels = [synthetic.grid_panel(20, origin=(0.0, 10.0 * k, 0.0)) for k in range(meshes - len(tubes))]
+
+    start = time.time()
+    strips = StripMesher.split_meshes(tubes + panels, rows=ROWS)
+    seconds = time.time() - start
+    tube_faces = strips.mesh_ids < len(tubes)
+    tube_strips = StripMesher.Strips(strips.vertices, strips.faces[tube_faces], strips.strip_ids[tube_faces],
+                                     strips.mesh_ids[tube_faces])
+    print("{} meshes ({} tubes) -> {} strips, {} faces in {:.3f}s".format(
+        meshes, len(tubes), len(np.unique(strips.strip_ids)), len(strips.faces), seconds))
+    # The rings are at most 0.3 rad (17 deg) apart, so a strip edge turning
+    # more than that has twisted
+    twist = tube_twist(tube_strips, shifts)
+    print("tube strips: largest twist {:.1f} deg ({})".format(twist, "ok" if twist < 20.0 else "TWISTED"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Runs MeshProcessor, RebarGenerator, CurveProcessor and cut_mesh_into_plates
+unmodified on the headless Rhino stand-in (../headless) and prints wall time
+and document calls for each. Use it for timing and regression runs on build
+boxes without Rhino:
+
+    python Pycodes/benchmarks/run_headless.py
+"""
+import importlib.util
+import math
+import os
+import sys
+import time
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+PYCODES = os.path.dirname(BENCHMARKS)
+sys.path[0:0] = [os.path.join(PYCODES, "headless"), PYCODES]
+
+import rhinoscriptsyntax as rs  # noqa: E402
+import Rhino.Geometry as rg  # noqa: E402
+import scriptcontext as sc  # noqa: E402
+
+
+def load_script(filename):
+    """Imports a script from Pycodes by file name (names may contain spaces)."""
+    name = os.path.splitext(filename)[0].replace(" ", "_").replace("-", "_").replace(".", "_")
+    spec = importlib.util.spec_from_file_location(name, os.path.join(PYCODES, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def shell_panel(count, size=3.0, origin=(0.0, 0.0, 4.0)):
+    """Returns a count x count quad mesh over a size x size doubly curved patch."""
+    mesh = rg.Mesh()
+    step = size / count
+    for i in range(count + 1):
+        for j in range(count + 1):
+            x, y = i * step, j * step
+            z = 0.3 * math.sin(x) * math.cos(0.7 * y) + 0.1 * x
+            mesh.Vertices.Add(origin[0] + x, origin[1] + y, origin[2] + z)
+    for i in range(count):
+        for j in range(count):
+            a = i * (count + 1) + j
+            mesh.Faces.AddFace(a, a + count + 1, a + count + 2, a + 1)
+    mesh.Normals.ComputeNormals()
+    return mesh
+
+
+def timed(label, function, *args):
+    """Runs function on a fresh document and prints seconds and document calls."""
+    sc.doc.Clear()
+    objects = sc.doc.Objects
+    start = time.time()
+    function(*args)
+    seconds = time.time() - start
+    calls = sum(objects.calls.values())
+    print("{:<22} {:8.3f}s {:8d} document calls {:8d} objects".format(label, seconds, calls, objects.Count))
+
+
+def mesh_processor(count):
+    Body_Formwork_3 = load_script("Body_Formwork_3.py")
+    mesh_id = sc.doc.Objects.AddMesh(shell_panel(count))
+    processor = Body_Formwork_3.MeshProcessor(mesh_id, 50)
+    processor.offset_lowest = processor.calculate_new_origin()
+    processor.create_working_plane()
+    processor.align_mesh_to_xy_plane()
+    processor.quad_remesh_mesh()
+    processor.create_geometry_and_labels()
+    processor.create_solid_from_mesh()
+
+
+def rebar_generator(count):
+    Rebar = load_script("Rebar.py")
+    mesh_id = sc.doc.Objects.AddMesh(shell_panel(count))
+    Rebar.RebarGenerator(mesh_id).run()
+
+
+def curve_processor(count):
+    module = load_script("Rebar_byCurve-Mesh_3.py")
+    mesh_id = sc.doc.Objects.AddMesh(shell_panel(count))
+    curve_id = rs.AddPolyline([(0.1, 0.1, 10.0), (2.9, 2.9, 10.0)])
+    rail_id = rs.AddPolyline([(0.1, 0.2, 4.0), (2.9, 0.2, 4.0)])
+    rs.queue_input(curve_id, mesh_id, rail_id)
+    module.CurveProcessor().run()
+
+
+def cut_mesh_into_plates(count):
+    DinhViTam = load_script("DinhViTam.py")
+    mesh_id = sc.doc.Objects.AddMesh(shell_panel(count, size=12.0))
+    DinhViTam.cut_mesh_into_plates(mesh_id)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    print("Synthetic panel: {0} x {0} quads".format(count))
+    timed("MeshProcessor", mesh_processor, count)
+    timed("RebarGenerator", rebar_generator, count)
+    timed("CurveProcessor", curve_processor, count)
+    timed("cut_mesh_into_plates", cut_mesh_into_plates, count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Synthetic shell panels as vertex/face arrays for the headless benchmarks.
+"""
+import numpy as np
+
+
+def shell_surface(x, y):
+    """Doubly curved shell height used by every synthetic panel."""
+    return 0.3 * np.sin(x) * np.cos(0.7 * y) + 0.1 * x
+
+
+def grid_panel(count, size=3.0, origin=(0.0, 0.0, 4.0), rows=None):
+    """
+    Returns (vertices, faces) for a count x rows quad grid over a size x size
+    patch of the synthetic shell.
+    """
+    rows = count if rows is None else rows
+    x, y = np.meshgrid(np.linspace(0.0, size, count + 1), np.linspace(0.0, size, rows + 1), indexing="ij")
+    x = x + origin[0]
+    y = y + origin[1]
+    vertices = np.column_stack([x.ravel(), y.ravel(), origin[2] + shell_surface(x, y).ravel()])
+    a = (np.arange(count)[:, None] * (rows + 1) + np.arange(rows)[None, :]).ravel()
+    faces = np.column_stack([a, a + rows + 1, a + rows + 2, a + 1])
+    return vertices, faces
+
+
+def zone_panels(panels, count, size=3.0):
+    """
+    Yields (vertices, faces) for a row of adjacent panels along X.
+    """
+    for index in range(panels):
+        yield grid_panel(count, size, origin=(index * size, 0.0, 4.0))
+
+
+def opera_shell(count, span=(60.0, 40.0), rise=18.0):
+    """
+    Returns (vertices, faces) for a count x count quad shell over a span[0] x
+    span[1] plan: a sail-like vault rising to rise, with the synthetic shell
+    ripple on top.
+    """
+    u, v = np.meshgrid(np.linspace(0.0, 1.0, count + 1), np.linspace(0.0, 1.0, count + 1), indexing="ij")
+    x = span[0] * u
+    y = span[1] * v
+    z = rise * np.sin(np.pi * u) * np.sin(np.pi * v) ** 0.5 * (1.0 - 0.3 * u) + shell_surface(x, y)
+    vertices = np.column_stack([x.ravel(), y.ravel(), z.ravel()])
+    a = (np.arange(count)[:, None] * (count + 1) + np.arange(count)[None, :]).ravel()
+    faces = np.column_stack([a, a + count + 1, a + count + 2, a + 1])
+    return vertices, faces
+
+
+def slab_outline(count, span=(40.0, 25.0), bays=7, depth=0.3, waist=0.6):
+    """
+    Returns a (count, 3) closed slab outline: an ellipse over span, pinched
+    at the middle by waist and scalloped by bays, so inward offsets split
+    into separate regions.
+    """
+    theta = np.linspace(0.0, 2.0 * np.pi, count, endpoint=False)
+    radius = (1.0 - waist * np.sin(theta) ** 2) * (1.0 - depth * np.maximum(np.sin(bays * theta), 0.0) ** 2)
+    return np.column_stack([0.5 * span[0] * radius * np.cos(theta), 0.5 * span[1] * radius * np.sin(theta),
+                            np.zeros(count)])
@@ -0,0 +1,1168 @@
+"""
+Headless stand-in for the Rhino.Geometry subset used by the scripts in Pycodes.
+
+Geometry is backed by NumPy arrays: curves are polylines with a normalized
+arc-length domain [0, 1], circles are sampled polygons and meshes keep
+vertex/face arrays (see MeshArrays). Only what the scripts call is provided.
+"""
+import copy
+import math
+import os
+import sys
+
+import numpy as np
+
+_PYCODES = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PYCODES not in sys.path:
+    sys.path.append(_PYCODES)
+
+import MeshArrays  # noqa: E402
+
+CIRCLE_SEGMENTS = 64
+
+
+class _Constant(object):
+    """Class-level property returning a fresh value (RhinoCommon structs)."""
+
+    def __init__(self, factory):
+        self.factory = factory
+
+    def __get__(self, obj, cls):
+        return self.factory()
+
+
+def _xyz(value):
+    """Returns a point-like value as a 3-element float array."""
+    return np.array([float(value[0]), float(value[1]), float(value[2])])
+
+
+class _Triple(object):
+    """Shared behaviour of Point3d and Vector3d."""
+    __slots__ = ("X", "Y", "Z")
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        if not np.isscalar(x):
+            x, y, z = x[0], x[1], x[2]
+        self.X = float(x)
+        self.Y = float(y)
+        self.Z = float(z)
+
+    def __getitem__(self, index):
+        return (self.X, self.Y, self.Z)[index]
+
+    def __setitem__(self, index, value):
+        setattr(self, "XYZ"[index], float(value))
+
+    def __iter__(self):
+        return iter((self.X, self.Y, self.Z))
+
+    def __len__(self):
+        return 3
+
+    def __eq__(self, other):
+        try:
+            return (self.X, self.Y, self.Z) == (other[0], other[1], other[2])
+        except (TypeError, IndexError):
+            return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self.X, self.Y, self.Z))
+
+    def __repr__(self):
+        return "{},{},{}".format(self.X, self.Y, self.Z)
+
+    def array(self):
+        return np.array([self.X, self.Y, self.Z])
+
+
+class Point3d(_Triple):
+    __slots__ = ()
+
+    Origin = _Constant(lambda: Point3d(0, 0, 0))
+
+    def __add__(self, other):
+        return Point3d(self.X + other[0], self.Y + other[1], self.Z + other[2])
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, Point3d):
+            return Vector3d(self.X - other.X, self.Y - other.Y, self.Z - other.Z)
+        return Point3d(self.X - other[0], self.Y - other[1], self.Z - other[2])
+
+    def __mul__(self, factor):
+        return Point3d(self.X * factor, self.Y * factor, self.Z * factor)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, factor):
+        return Point3d(self.X / factor, self.Y / factor, self.Z / factor)
+
+    def Transform(self, xform):
+        self.X, self.Y, self.Z = (float(c) for c in xform.apply(self.array()[None, :])[0])
+        return True
+
+    def DistanceTo(self, other):
+        return math.sqrt((self.X - other[0]) ** 2 + (self.Y - other[1]) ** 2 + (self.Z - other[2]) ** 2)
+
+    def GetBoundingBox(self, accurate=True):
+        return BoundingBox(self, self)
+
+
+Point3f = Point3d
+
+
+class Vector3d(_Triple):
+    __slots__ = ()
+
+    XAxis = _Constant(lambda: Vector3d(1, 0, 0))
+    YAxis = _Constant(lambda: Vector3d(0, 1, 0))
+    ZAxis = _Constant(lambda: Vector3d(0, 0, 1))
+    Zero = _Constant(lambda: Vector3d(0, 0, 0))
+
+    def __add__(self, other):
+        if isinstance(other, Point3d):
+            return Point3d(self.X + other.X, self.Y + other.Y, self.Z + other.Z)
+        return Vector3d(self.X + other[0], self.Y + other[1], self.Z + other[2])
+
+    def __sub__(self, other):
+        return Vector3d(self.X - other[0], self.Y - other[1], self.Z - other[2])
+
+    def __neg__(self):
+        return Vector3d(-self.X, -self.Y, -self.Z)
+
+    def __mul__(self, other):
+        if isinstance(other, Vector3d):
+            return self.X * other.X + self.Y * other.Y + self.Z * other.Z
+        return Vector3d(self.X * other, self.Y * other, self.Z * other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, factor):
+        return Vector3d(self.X / factor, self.Y / factor, self.Z / factor)
+
+    @property
+    def Length(self):
+        return math.sqrt(self.X ** 2 + self.Y ** 2 + self.Z ** 2)
+
+    @property
+    def IsZero(self):
+        return self.X == 0 and self.Y == 0 and self.Z == 0
+
+    def Unitize(self):
+        length = self.Length
+        if length == 0:
+            return False
+        self.X /= length
+        self.Y /= length
+        self.Z /= length
+        return True
+
+    def Reverse(self):
+        self.X, self.Y, self.Z = -self.X, -self.Y, -self.Z
+        return True
+
+    def Transform(self, xform):
+        self.X, self.Y, self.Z = (float(c) for c in xform.M[:3, :3] @ self.array())
+        return True
+
+    @staticmethod
+    def CrossProduct(a, b):
+        return Vector3d(np.cross(_xyz(a), _xyz(b)))
+
+    @staticmethod
+    def Multiply(a, b):
+        return a * b
+
+
+Vector3f = Vector3d
+
+
+def _perpendicular(normal):
+    """Returns a unit vector perpendicular to normal."""
+    n = _xyz(normal)
+    axis = np.zeros(3)
+    axis[np.argmin(np.abs(n))] = 1.0
+    perp = np.cross(n, axis)
+    return perp / np.linalg.norm(perp)
+
+
+class Interval(object):
+    def __init__(self, t0, t1):
+        self.T0 = float(t0)
+        self.T1 = float(t1)
+
+    def __getitem__(self, index):
+        return (self.T0, self.T1)[index]
+
+    @property
+    def Min(self):
+        return min(self.T0, self.T1)
+
+    @property
+    def Max(self):
+        return max(self.T0, self.T1)
+
+    @property
+    def Length(self):
+        return self.T1 - self.T0
+
+    def ParameterAt(self, normalized):
+        return self.T0 + normalized * (self.T1 - self.T0)
+
+
+class Plane(object):
+    """Plane(origin, normal), Plane(origin, xaxis, yaxis) or Plane(plane)."""
+
+    WorldXY = _Constant(lambda: Plane(Point3d(0, 0, 0), Vector3d(0, 0, 1)))
+    WorldYZ = _Constant(lambda: Plane(Point3d(0, 0, 0), Vector3d(0, 1, 0), Vector3d(0, 0, 1)))
+    WorldZX = _Constant(lambda: Plane(Point3d(0, 0, 0), Vector3d(0, 0, 1), Vector3d(1, 0, 0)))
+
+    def __init__(self, origin=None, a=None, b=None):
+        if isinstance(origin, Plane):
+            self.Origin = Point3d(origin.Origin)
+            self.XAxis = Vector3d(origin.XAxis)
+            self.YAxis = Vector3d(origin.YAxis)
+            self.ZAxis = Vector3d(origin.ZAxis)
+            return
+        self.Origin = Point3d(origin) if origin is not None else Point3d(0, 0, 0)
+        if b is None:
+            normal = _xyz(a if a is not None else (0, 0, 1))
+            normal = normal / np.linalg.norm(normal)
+            if np.allclose(normal, (0, 0, 1)):
+                x = np.array([1.0, 0.0, 0.0])
+            else:
+                x = _perpendicular(normal)
+            y = np.cross(normal, x)
+        else:
+            x = _xyz(a)
+            x = x / np.linalg.norm(x)
+            y = _xyz(b) - np.dot(_xyz(b), x) * x
+            y = y / np.linalg.norm(y)
+            normal = np.cross(x, y)
+        self.XAxis = Vector3d(x)
+        self.YAxis = Vector3d(y)
+        self.ZAxis = Vector3d(normal)
+
+    def __getitem__(self, index):
+        return (self.Origin, self.XAxis, self.YAxis, self.ZAxis)[index]
+
+    @property
+    def Normal(self):
+        return Vector3d(self.ZAxis)
+
+    def frame(self):
+        """Returns the 4x4 matrix mapping plane coordinates to world."""
+        m = np.eye(4)
+        m[:3, 0] = self.XAxis.array()
+        m[:3, 1] = self.YAxis.array()
+        m[:3, 2] = self.ZAxis.array()
+        m[:3, 3] = self.Origin.array()
+        return m
+
+    def PointAt(self, u, v, w=0.0):
+        return Point3d(self.Origin.array() + u * self.XAxis.array() + v * self.YAxis.array() + w * self.ZAxis.array())
+
+    def DistanceTo(self, point):
+        return float(np.dot(_xyz(point) - self.Origin.array(), self.ZAxis.array()))
+
+    def ClosestPoint(self, point):
+        return Point3d(_xyz(point) - self.DistanceTo(point) * self.ZAxis.array())
+
+    def Transform(self, xform):
+        origin = xform.apply(self.Origin.array()[None, :])[0]
+        axes = xform.M[:3, :3] @ np.column_stack([self.XAxis.array(), self.YAxis.array()])
+        fresh = Plane(Point3d(origin), Vector3d(axes[:, 0]), Vector3d(axes[:, 1]))
+        self.Origin, self.XAxis, self.YAxis, self.ZAxis = fresh.Origin, fresh.XAxis, fresh.YAxis, fresh.ZAxis
+        return True
+
+
+class Transform(object):
+    """4x4 transform; M holds the NumPy matrix."""
+
+    Identity = _Constant(lambda: Transform(np.eye(4)))
+
+    def __init__(self, matrix=None):
+        if matrix is None:
+            matrix = np.eye(4)
+        elif np.isscalar(matrix):
+            matrix = np.eye(4) * matrix
+        self.M = np.array(matrix, dtype=float)
+
+    def __mul__(self, other):
+        return Transform(self.M @ other.M)
+
+    def __getitem__(self, index):
+        return self.M[index]
+
+    def __setitem__(self, index, value):
+        self.M[index] = value
+
+    def apply(self, points):
+        return MeshArrays.transform_points(points, self.M)
+
+    def TryGetInverse(self):
+        try:
+            return True, Transform(np.linalg.inv(self.M))
+        except np.linalg.LinAlgError:
+            return False, Transform(np.zeros((4, 4)))
+
+    @staticmethod
+    def Translation(x, y=None, z=None):
+        if y is None:
+            x, y, z = x[0], x[1], x[2]
+        m = np.eye(4)
+        m[:3, 3] = (x, y, z)
+        return Transform(m)
+
+    @staticmethod
+    def Scale(center, factor):
+        c = _xyz(center)
+        m = np.eye(4) * factor
+        m[3, 3] = 1.0
+        m[:3, 3] = c - factor * c
+        return Transform(m)
+
+    @staticmethod
+    def Rotation(a, b, center):
+        """Rotation(angle, axis, center) or Rotation(start_dir, end_dir, center)."""
+        c = _xyz(center)
+        if np.isscalar(a):
+            axis = _xyz(b)
+            axis = axis / np.linalg.norm(axis)
+            r = _axis_angle(axis, float(a))
+        else:
+            v0 = _xyz(a) / np.linalg.norm(_xyz(a))
+            v1 = _xyz(b) / np.linalg.norm(_xyz(b))
+            axis = np.cross(v0, v1)
+            sin = np.linalg.norm(axis)
+            cos = float(np.dot(v0, v1))
+            if sin < 1e-12:
+                r = np.eye(3) if cos > 0 else _axis_angle(_perpendicular(v0), math.pi)
+            else:
+                r = _axis_angle(axis / sin, math.atan2(sin, cos))
+        m = np.eye(4)
+        m[:3, :3] = r
+        m[:3, 3] = c - r @ c
+        return Transform(m)
+
+    @staticmethod
+    def PlaneToPlane(plane0, plane1):
+        return Transform(plane1.frame() @ np.linalg.inv(plane0.frame()))
+
+
+def _axis_angle(axis, angle):
+    """Rodrigues rotation matrix."""
+    x, y, z = axis
+    k = np.array([[0, -z, y], [z, 0, -x], [-y, x, 0]])
+    return np.eye(3) + math.sin(angle) * k + (1 - math.cos(angle)) * (k @ k)
+
+
+class BoundingBox(object):
+    def __init__(self, min_point, max_point):
+        self.Min = Point3d(min_point)
+        self.Max = Point3d(max_point)
+
+    @staticmethod
+    def from_points(points):
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        return BoundingBox(points.min(axis=0), points.max(axis=0))
+
+    @property
+    def IsValid(self):
+        return self.Min.X <= self.Max.X and self.Min.Y <= self.Max.Y and self.Min.Z <= self.Max.Z
+
+    @property
+    def Center(self):
+        return (self.Min + self.Max) * 0.5
+
+    @property
+    def Diagonal(self):
+        return self.Max - self.Min
+
+    def Union(self, other):
+        self.Min = Point3d(np.minimum(self.Min.array(), other.Min.array()))
+        self.Max = Point3d(np.maximum(self.Max.array(), other.Max.array()))
+
+    def GetCorners(self):
+        x0, y0, z0 = self.Min
+        x1, y1, z1 = self.Max
+        return [Point3d(x0, y0, z0), Point3d(x1, y0, z0), Point3d(x1, y1, z0), Point3d(x0, y1, z0),
+                Point3d(x0, y0, z1), Point3d(x1, y0, z1), Point3d(x1, y1, z1), Point3d(x0, y1, z1)]
+
+
+class GeometryBase(object):
+    """Base of the stand-in geometry; subclasses expose points() for extents."""
+
+    def points(self):
+        return np.empty((0, 3))
+
+    def GetBoundingBox(self, accurate=True):
+        return BoundingBox.from_points(self.points())
+
+    def Duplicate(self):
+        return copy.deepcopy(self)
+
+
+# ---------------------------------------------------------------------------
+# Curves
+# ---------------------------------------------------------------------------
+
+class Line(object):
+    def __init__(self, start, end):
+        self.From = Point3d(start)
+        self.To = Point3d(end)
+
+    @property
+    def Length(self):
+        return self.From.DistanceTo(self.To)
+
+    @property
+    def Direction(self):
+        return self.To - self.From
+
+    def PointAt(self, t):
+        return Point3d(self.From.array() + t * (self.To.array() - self.From.array()))
+
+    def ToNurbsCurve(self):
+        return LineCurve(self)
+
+
+class Polyline(list):
+    def __init__(self, points=()):
+        list.__init__(self, [Point3d(p) for p in points])
+
+    @property
+    def Count(self):
+        return len(self)
+
+    @property
+    def IsClosed(self):
+        return len(self) > 2 and self[0].DistanceTo(self[-1]) < 1e-12
+
+    @property
+    def Length(self):
+        return float(np.linalg.norm(np.diff(self.array(), axis=0), axis=1).sum())
+
+    def array(self):
+        return np.array([p.array() for p in self]).reshape(-1, 3)
+
+    def Add(self, x, y=None, z=None):
+        self.append(Point3d(x, y, z) if y is not None else Point3d(x))
+
+    def ToPolylineCurve(self):
+        return PolylineCurve(self)
+
+    def ToNurbsCurve(self):
+        return NurbsCurve(self.array())
+
+
+class CurveOffsetCornerStyle(object):
+    Sharp = 1
+    Round = 2
+    Smooth = 3
+    Chamfer = 4
+
+
+class CurveSimplifyStyle(object):
+    All = 0
+    Merge = 1
+    RebuildLines = 2
+    AdjustG1 = 4
+
+
+class Curve(GeometryBase):
+    """Polyline-backed curve with a normalized arc-length domain [0, 1]."""
+
+    def __init__(self, points):
+        self._set_points(points)
+
+    def _set_points(self, points):
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        self._points = points
+        seg = np.linalg.norm(np.diff(points, axis=0), axis=1)
+        self._cumulative = np.concatenate([[0.0], np.cumsum(seg)])
+
+    def points(self):
+        return self._points
+
+    @property
+    def Domain(self):
+        return Interval(0.0, 1.0)
+
+    @property
+    def IsClosed(self):
+        return len(self._points) > 2 and np.allclose(self._points[0], self._points[-1])
+
+    @property
+    def PointCount(self):
+        return len(self._points)
+
+    @property
+    def PointAtStart(self):
+        return Point3d(self._points[0])
+
+    @property
+    def PointAtEnd(self):
+        return Point3d(self._points[-1])
+
+    def GetLength(self, sub_domain=None):
+        total = float(self._cumulative[-1])
+        if sub_domain is None:
+            return total
+        return total * abs(sub_domain[1] - sub_domain[0])
+
+    def _locate(self, t):
+        total = self._cumulative[-1]
+        s = min(max(t, 0.0), 1.0) * total
+        index = int(np.clip(np.searchsorted(self._cumulative, s, side="right") - 1, 0, len(self._points) - 2))
+        seg = self._cumulative[index + 1] - self._cumulative[index]
+        local = (s - self._cumulative[index]) / seg if seg > 0 else 0.0
+        return index, local
+
+    def PointAt(self, t):
+        index, local = self._locate(t)
+        a, b = self._points[index], self._points[index + 1]
+        return Point3d(a + local * (b - a))
+
+    def TangentAt(self, t):
+        index, _ = self._locate(t)
+        direction = Vector3d(self._points[index + 1] - self._points[index])
+        direction.Unitize()
+        return direction
+
+    def NormalizedLengthParameter(self, s):
+        return True, float(s)
+
+    def DivideByCount(self, count, include_ends=True):
+        params = list(np.linspace(0.0, 1.0, count + 1))
+        if self.IsClosed:
+            params = params[:-1]
+        return params if include_ends else params[1:-1]
+
+    def Trim(self, t0, t1=None):
+        if t1 is None:
+            t0, t1 = t0[0], t0[1]
+        total = self._cumulative[-1]
+        s0, s1 = t0 * total, t1 * total
+        inside = self._points[(self._cumulative > s0) & (self._cumulative < s1)]
+        points = np.vstack([self.PointAt(t0).array(), inside, self.PointAt(t1).array()])
+        return PolylineCurve(points)
+
+    def Transform(self, xform):
+        self._set_points(xform.apply(self._points))
+        return True
+
+    def Translate(self, vector):
+        return self.Transform(Transform.Translation(vector))
+
+    def DuplicateCurve(self):
+        return self.Duplicate()
+
+    def ToNurbsCurve(self):
+        return NurbsCurve(self._points)
+
+    def ToPolyline(self, *tolerances):
+        if tolerances:
+            return PolylineCurve(self._points)
+        return Polyline(self._points)
+
+    def TryGetPolyline(self):
+        return True, Polyline(self._points)
+
+    def Rebuild(self, point_count, degree, preserve_tangents):
+        return NurbsCurve(self._points)
+
+    def Simplify(self, options, distance_tolerance, angle_tolerance_radians):
+        return PolylineCurve(self._points)
+
+    def Offset(self, plane, distance, tolerance, corner_style):
+        """
+        Offsets a planar polyline to the right of its direction (seen from the
+        plane normal). Returns a one-element list, or None when a closed
+        outline collapses.
+        """
+        return _offset_polyline(self._points, self.IsClosed, plane, distance)
+
+
+def _offset_polyline(points, closed, plane, distance):
+    normal = plane.ZAxis.array()
+    pts = points[:-1] if closed else points
+    if len(pts) < 2:
+        return None
+    if closed:
+        prev_dir = MeshArrays.unitize(pts - np.roll(pts, 1, axis=0))
+        next_dir = MeshArrays.unitize(np.roll(pts, -1, axis=0) - pts)
+    else:
+        seg = MeshArrays.unitize(np.diff(pts, axis=0))
+        prev_dir = np.vstack([seg[:1], seg])
+        next_dir = np.vstack([seg, seg[-1:]])
+    n_prev = np.cross(prev_dir, normal)
+    n_next = np.cross(next_dir, normal)
+    bisector = MeshArrays.unitize(n_prev + n_next)
+    cos_half = np.einsum("ij,ij->i", bisector, n_next)
+    scale = np.divide(distance, cos_half, out=np.full(len(pts), float(distance)), where=np.abs(cos_half) > 1e-6)
+    moved = pts + bisector * scale[:, None]
+    if closed:
+        before = _signed_area(pts, plane)
+        after = _signed_area(moved, plane)
+        if before * after <= 0 or abs(after) < 1e-12:
+            return None
+        moved = np.vstack([moved, moved[:1]])
+    return [PolylineCurve(moved)]
+
+
+def _signed_area(points, plane):
+    local = (points - plane.Origin.array()) @ np.column_stack([plane.XAxis.array(), plane.YAxis.array()])
+    x, y = local[:, 0], local[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+
+class PolylineCurve(Curve):
+    def __init__(self, points):
+        if isinstance(points, Polyline):
+            points = points.array()
+        Curve.__init__(self, points)
+
+
+class NurbsCurve(Curve):
+    @staticmethod
+    def CreateFromCircle(circle):
+        return circle.ToNurbsCurve()
+
+
+class LineCurve(Curve):
+    def __init__(self, start, end=None):
+        if isinstance(start, Line):
+            start, end = start.From, start.To
+        Curve.__init__(self, [_xyz(start), _xyz(end)])
+
+    @property
+    def Line(self):
+        return Line(self.PointAtStart, self.PointAtEnd)
+
+
+class Circle(object):
+    """Circle(center, radius), Circle(plane, radius) or Circle(plane, center, radius)."""
+
+    def __init__(self, a, b, c=None):
+        if c is not None:
+            self.Plane = Plane(Point3d(b), a.XAxis, a.YAxis)
+            self.Radius = float(c)
+        elif isinstance(a, Plane):
+            self.Plane = Plane(a)
+            self.Radius = float(b)
+        else:
+            self.Plane = Plane(Point3d(a), Vector3d(0, 0, 1))
+            self.Radius = float(b)
+
+    @property
+    def Center(self):
+        return Point3d(self.Plane.Origin)
+
+    @property
+    def Normal(self):
+        return self.Plane.Normal
+
+    @property
+    def Circumference(self):
+        return 2.0 * math.pi * self.Radius
+
+    def PointAt(self, t):
+        return self.Plane.PointAt(self.Radius * math.cos(t), self.Radius * math.sin(t))
+
+    def ToNurbsCurve(self):
+        return ArcCurve(self)
+
+
+class ArcCurve(Curve):
+    def __init__(self, circle):
+        self.Circle = circle
+        angles = np.linspace(0.0, 2.0 * math.pi, CIRCLE_SEGMENTS + 1)
+        plane = circle.Plane
+        points = (plane.Origin.array()
+                  + circle.Radius * np.outer(np.cos(angles), plane.XAxis.array())
+                  + circle.Radius * np.outer(np.sin(angles), plane.YAxis.array()))
+        points[-1] = points[0]
+        Curve.__init__(self, points)
+
+    def Transform(self, xform):
+        self.Circle.Plane.Transform(xform)
+        return Curve.Transform(self, xform)
+
+    def GetLength(self, sub_domain=None):
+        total = self.Circle.Circumference
+        return total if sub_domain is None else total * abs(sub_domain[1] - sub_domain[0])
+
+
+# ---------------------------------------------------------------------------
+# Surfaces, solids and annotation
+# ---------------------------------------------------------------------------
+
+class PipeCapMode(object):
+    Flat = 1
+    Round = 2
+
+
+class Brep(GeometryBase):
+    """Brep wrapper around the geometry it was created from."""
+
+    def __init__(self, source, capped=False):
+        self.source = source
+        self.capped = capped
+
+    @staticmethod
+    def CreatePipe(rail, radius, local_blending, cap, fit_rail, absolute_tolerance, angle_tolerance_radians):
+        profile = ArcCurve(Circle(Plane(rail.PointAtStart, rail.TangentAt(rail.Domain.Min)), radius))
+        return [Brep(Sweep(profile, rail), cap != 0)]
+
+    def points(self):
+        return self.source.points()
+
+    @property
+    def IsSolid(self):
+        return self.capped
+
+    def CapPlanarHoles(self, tolerance=0.001):
+        return Brep(self.source, True)
+
+    def Transform(self, xform):
+        return self.source.Transform(xform)
+
+
+class Surface(GeometryBase):
+    """Extrusion of a profile curve along a vector, or a bilinear patch."""
+
+    def __init__(self, profile=None, direction=None, corners=None):
+        self.profile = profile
+        self.direction = None if direction is None else _xyz(direction)
+        self.corners = None if corners is None else np.asarray(corners, dtype=float).reshape(-1, 3)
+
+    def points(self):
+        if self.corners is not None:
+            return self.corners
+        base = self.profile.points()
+        return np.vstack([base, base + self.direction])
+
+    def Transform(self, xform):
+        if self.corners is not None:
+            self.corners = xform.apply(self.corners)
+        else:
+            self.profile.Transform(xform)
+            self.direction = xform.M[:3, :3] @ self.direction
+        return True
+
+    @staticmethod
+    def CreateExtrusion(profile, direction):
+        return Surface(profile=profile, direction=direction)
+
+    def ToBrep(self):
+        return Brep(self)
+
+
+NurbsSurface = Surface
+PlaneSurface = Surface
+
+
+class InstanceReferenceGeometry(GeometryBase):
+    """A block instance: definition index plus placement transform."""
+
+    def __init__(self, definition_index, xform):
+        self.ParentIdefIndex = int(definition_index)
+        self.Xform = Transform(xform.M)
+
+    def points(self):
+        return self.Xform.apply(np.zeros((1, 3)))
+
+    def Transform(self, xform):
+        self.Xform = xform * self.Xform
+        return True
+
+
+class Sweep(GeometryBase):
+    """Profile swept along a rail (rs.ExtrudeCurve)."""
+
+    def __init__(self, profile, rail):
+        self.profile = profile
+        self.rail = rail
+
+    def points(self):
+        return np.vstack([self.profile.points(), self.rail.points()])
+
+    def Transform(self, xform):
+        return self.profile.Transform(xform) and self.rail.Transform(xform)
+
+    def ToBrep(self):
+        return Brep(self)
+
+
+class Sphere(GeometryBase):
+    def __init__(self, center, radius):
+        self.Center = Point3d(center)
+        self.Radius = float(radius)
+
+    def points(self):
+        c = self.Center.array()
+        return np.vstack([c - self.Radius, c + self.Radius])
+
+    def Transform(self, xform):
+        return self.Center.Transform(xform)
+
+    def ToBrep(self):
+        return Brep(self, True)
+
+
+class Cylinder(GeometryBase):
+    def __init__(self, circle, height):
+        self.BaseCircle = circle
+        self.Height = float(height)
+
+    def points(self):
+        base = ArcCurve(self.BaseCircle).points()
+        return np.vstack([base, base + self.Height * self.BaseCircle.Normal.array()])
+
+    def Transform(self, xform):
+        return self.BaseCircle.Plane.Transform(xform)
+
+    def ToBrep(self, cap_bottom=True, cap_top=True):
+        return Brep(self, cap_bottom and cap_top)
+
+
+class Extrusion(GeometryBase):
+    @staticmethod
+    def CreateCylinderExtrusion(cylinder, cap_bottom, cap_top):
+        return cylinder
+
+
+class TextEntity(GeometryBase):
+    def __init__(self, text="", plane=None, height=1.0):
+        self.PlainText = text
+        self.Plane = plane or Plane.WorldXY
+        self.TextHeight = height
+
+    @property
+    def Text(self):
+        return self.PlainText
+
+    def points(self):
+        return self.Plane.Origin.array()[None, :]
+
+    def Transform(self, xform):
+        return self.Plane.Transform(xform)
+
+    @staticmethod
+    def Create(text, plane, dimstyle, wrapped, rect_width, rotation):
+        height = getattr(dimstyle, "TextHeight", 1.0)
+        return TextEntity(text, Plane(plane), height)
+
+
+class Point(GeometryBase):
+    def __init__(self, location):
+        self.Location = Point3d(location)
+
+    def points(self):
+        return self.Location.array()[None, :]
+
+    def Transform(self, xform):
+        return self.Location.Transform(xform)
+
+
+# ---------------------------------------------------------------------------
+# Meshes
+# ---------------------------------------------------------------------------
+
+class QuadRemeshParameters(object):
+    def __init__(self):
+        self.AdaptiveQuadCount = True
+        self.TargetQuadCount = 2000
+        self.TargetEdgeLength = 0.0
+        self.AdaptiveSize = 50.0
+        self.DetectHardEdges = True
+        self.PreserveMeshArrayEdgesMode = 0
+        self.GuideCurveInfluence = 0
+        self.SymmetryAxis = 0
+
+
+class MeshPoint(object):
+    def __init__(self, point, face_index, t):
+        self.Point = point
+        self.FaceIndex = int(face_index)
+        self.T = list(t)
+
+
+class MeshFace(object):
+    __slots__ = ("A", "B", "C", "D")
+
+    def __init__(self, a, b, c, d=None):
+        self.A, self.B, self.C = int(a), int(b), int(c)
+        self.D = int(c if d is None else d)
+
+    def __getitem__(self, index):
+        return (self.A, self.B, self.C, self.D)[index]
+
+    def __iter__(self):
+        return iter((self.A, self.B, self.C, self.D))
+
+    @property
+    def IsQuad(self):
+        return self.C != self.D
+
+    @property
+    def IsTriangle(self):
+        return self.C == self.D
+
+
+class _MeshArrayList(object):
+    """Array-backed list with cheap appends (flushed on first read)."""
+
+    width = 3
+    dtype = float
+
+    def __init__(self):
+        self._array = np.empty((0, self.width), dtype=self.dtype)
+        self._pending = []
+
+    @property
+    def array(self):
+        if self._pending:
+            self._array = np.vstack([self._array, np.array(self._pending, dtype=self.dtype)])
+            self._pending = []
+        return self._array
+
+    @array.setter
+    def array(self, value):
+        self._array = np.asarray(value, dtype=self.dtype).reshape(-1, self.width)
+        self._pending = []
+
+    @property
+    def Count(self):
+        return len(self._array) + len(self._pending)
+
+    def __len__(self):
+        return self.Count
+
+    def __iter__(self):
+        for index in range(self.Count):
+            yield self[index]
+
+    def Clear(self):
+        self.array = np.empty((0, self.width))
+
+
+class MeshVertexList(_MeshArrayList):
+    def __getitem__(self, index):
+        return Point3d(self.array[index])
+
+    def __setitem__(self, index, point):
+        self.array[index] = _xyz(point)
+
+    def Add(self, x, y=None, z=None):
+        self._pending.append(_xyz(x) if y is None else (float(x), float(y), float(z)))
+        return self.Count - 1
+
+    def AddVertices(self, points):
+        for point in points:
+            self._pending.append(_xyz(point))
+        return True
+
+    def SetVertex(self, index, x, y=None, z=None):
+        self[index] = (x, y, z) if y is not None else x
+        return True
+
+    def ToPoint3dArray(self):
+        return [Point3d(p) for p in self.array]
+
+    def ToFloatArray(self):
+        return self.array.astype(np.float32).ravel()
+
+
+class MeshFaceList(_MeshArrayList):
+    width = 4
+    dtype = np.int64
+
+    def __getitem__(self, index):
+        return MeshFace(*self.array[index])
+
+    def AddFace(self, a, b=None, c=None, d=None):
+        if b is None:
+            face = tuple(a)
+        else:
+            face = (a, b, c, c if d is None else d)
+        if len(face) == 3:
+            face = face + (face[2],)
+        self._pending.append(face)
+        return self.Count - 1
+
+    def AddFaces(self, faces):
+        for face in faces:
+            self.AddFace(face)
+        return True
+
+    def ToIntArray(self, as_triangles):
+        if not as_triangles:
+            return self.array.astype(np.int32).ravel()
+        tris, _ = MeshArrays.triangles(self.array)
+        return tris.astype(np.int32).ravel()
+
+
+class MeshVertexNormalList(object):
+    def __init__(self, mesh):
+        self._mesh = mesh
+        self.array = np.empty((0, 3))
+
+    @property
+    def Count(self):
+        return len(self.array)
+
+    def __getitem__(self, index):
+        return Vector3d(self.array[index])
+
+    def ComputeNormals(self):
+        self.array = MeshArrays.vertex_normals(self._mesh.vertex_array, self._mesh.face_array)
+        return True
+
+
+class Mesh(GeometryBase):
+    def __init__(self):
+        self.Vertices = MeshVertexList()
+        self.Faces = MeshFaceList()
+        self.Normals = MeshVertexNormalList(self)
+
+    @staticmethod
+    def from_arrays(vertices, faces):
+        mesh = Mesh()
+        mesh.Vertices.array = vertices
+        mesh.Faces.array = MeshArrays.as_faces(faces)
+        return mesh
+
+    @property
+    def vertex_array(self):
+        return self.Vertices.array
+
+    @property
+    def face_array(self):
+        return self.Faces.array
+
+    def points(self):
+        return self.vertex_array
+
+    @property
+    def IsValid(self):
+        return self.Vertices.Count > 0 and self.Faces.Count > 0
+
+    @property
+    def IsClosed(self):
+        return self.Faces.Count > 0 and not MeshArrays.boundary_loops(self.face_array)
+
+    def Compact(self):
+        vertices, faces = MeshArrays.compact(self.vertex_array, self.face_array)
+        self.Vertices.array = vertices
+        self.Faces.array = faces
+        return True
+
+    def DuplicateMesh(self):
+        return Mesh.from_arrays(self.vertex_array.copy(), self.face_array.copy())
+
+    Duplicate = DuplicateMesh
+
+    def ToMesh(self):
+        return self.DuplicateMesh()
+
+    def Transform(self, xform):
+        self.Vertices.array = xform.apply(self.vertex_array)
+        if self.Normals.Count:
+            self.Normals.ComputeNormals()
+        return True
+
+    def Translate(self, vector):
+        return self.Transform(Transform.Translation(vector))
+
+    def ClosestMeshPoint(self, point, max_distance=0.0):
+        closest, face, bary, distance = MeshArrays.closest_points(self.vertex_array, self.face_array, [_xyz(point)])
+        if max_distance > 0 and distance[0] > max_distance:
+            return None
+        return MeshPoint(Point3d(closest[0]), face[0], self._face_weights(face[0], closest[0]))
+
+    def _face_weights(self, face_index, point):
+        """Returns the 4 corner weights of point on face (RhinoCommon MeshPoint.T)."""
+        face = self.face_array[face_index]
+        tris = ((0, 1, 2),) if face[2] == face[3] else ((0, 1, 2), (0, 2, 3))
+        best = None
+        for tri in tris:
+            a, b, c = (self.vertex_array[face[k]] for k in tri)
+            closest, bary = MeshArrays.closest_point_on_triangles(point, a, b, c)
+            gap = np.linalg.norm(closest - point)
+            if best is None or gap < best[0]:
+                best = (gap, tri, bary)
+        weights = [0.0, 0.0, 0.0, 0.0]
+        for k, w in zip(best[1], best[2]):
+            weights[k] += float(w)
+        return weights
+
+    def ClosestPoint(self, point):
+        closest, _, _, _ = MeshArrays.closest_points(self.vertex_array, self.face_array, [_xyz(point)])
+        return Point3d(closest[0])
+
+    def PointAt(self, mesh_point):
+        face = self.face_array[mesh_point.FaceIndex]
+        return Point3d(np.dot(mesh_point.T, self.vertex_array[face]))
+
+    def NormalAt(self, mesh_point, t0=None, t1=None, t2=None, t3=None):
+        if isinstance(mesh_point, MeshPoint):
+            face_index, weights = mesh_point.FaceIndex, mesh_point.T
+        else:
+            face_index, weights = mesh_point, (t0, t1, t2, t3)
+        if not self.Normals.Count:
+            self.Normals.ComputeNormals()
+        face = self.face_array[face_index]
+        normal = Vector3d(np.dot(weights, self.Normals.array[face]))
+        normal.Unitize()
+        return normal
+
+    def GetNakedEdges(self):
+        vertices = self.vertex_array
+        return [Polyline(vertices[loop + loop[:1]]) for loop in MeshArrays.boundary_loops(self.face_array)]
+
+    def GetOutlines(self, plane):
+        """Naked-edge loops projected onto plane (stand-in for the silhouette)."""
+        outlines = []
+        for polyline in self.GetNakedEdges():
+            outlines.append(Polyline([plane.ClosestPoint(p) for p in polyline]))
+        return outlines
+
+    def Offset(self, distance, solidify=False):
+        vertices, faces = self.vertex_array, self.face_array
+        if solidify:
+            vertices, faces = MeshArrays.solidify(vertices, faces, distance)
+        else:
+            vertices = MeshArrays.offset(vertices, faces, distance)
+        return Mesh.from_arrays(vertices, faces)
+
+    def Split(self, plane):
+        """
+        Splits by a plane. A mesh the plane does not cross comes back whole,
+        so callers splitting fragment lists keep every fragment.
+        """
+        pieces = MeshArrays.split_by_plane(self.vertex_array, self.face_array,
+                                           plane.Origin.array(), plane.ZAxis.array())
+        return [Mesh.from_arrays(v, f) for v, f in pieces]
+
+    def QuadRemesh(self, parameters):
+        """
+        Stand-in remesh: returns a copy with the input topology. Rhino's
+        QuadRemesh is not reproduced headlessly.
+        """
+        return self.DuplicateMesh()
+
+    @staticmethod
+    def CreateFromClosedPolyline(polyline):
+        points = polyline.array() if isinstance(polyline, Polyline) else np.asarray(polyline, dtype=float)
+        if np.allclose(points[0], points[-1]):
+            points = points[:-1]
+        faces = [(0, k, k + 1, k + 1) for k in range(1, len(points) - 1)]
+        if len(points) == 4:
+            faces = [(0, 1, 2, 3)]
+        return Mesh.from_arrays(points, faces)
@@ -0,0 +1,266 @@
+"""
+Headless stand-in for the Rhino namespace: an in-memory RhinoDoc plus the
+Rhino.Geometry subset in Geometry.py.
+
+Put Pycodes/headless on sys.path (before any real Rhino) to run the scripts
+under CPython, e.g.:
+
+    PYTHONPATH=Pycodes/headless:Pycodes python Pycodes/benchmarks/run_headless.py
+
+ObjectTable counts every call in ObjectTable.calls so benchmarks can report
+document round-trips.
+"""
+import collections
+import uuid
+
+from Rhino import Geometry
+
+
+class ObjectAttributes(object):
+    def __init__(self):
+        self.Name = ""
+        self.LayerIndex = 0
+
+
+class RhinoObject(object):
+    def __init__(self, object_id, geometry, attributes=None):
+        self.Id = object_id
+        self.Geometry = geometry
+        self.Attributes = attributes or ObjectAttributes()
+
+    @property
+    def Name(self):
+        return self.Attributes.Name
+
+
+class ObjectTable(object):
+    """In-memory object table keyed by id, in creation order."""
+
+    def __init__(self, doc):
+        self._doc = doc
+        self._objects = collections.OrderedDict()
+        self._next = 1
+        self.calls = collections.Counter()
+
+    def __iter__(self):
+        return iter(list(self._objects.values()))
+
+    def __len__(self):
+        return len(self._objects)
+
+    @property
+    def Count(self):
+        return len(self._objects)
+
+    def _add(self, name, geometry, attributes=None):
+        self.calls[name] += 1
+        object_id = uuid.UUID(int=self._next)
+        self._next += 1
+        self._objects[object_id] = RhinoObject(object_id, geometry, attributes)
+        return object_id
+
+    def Add(self, geometry, attributes=None):
+        return self._add("Add", geometry, attributes)
+
+    def AddPoint(self, point, attributes=None):
+        return self._add("AddPoint", Geometry.Point(point), attributes)
+
+    def AddLine(self, start, end=None, attributes=None):
+        line = start if end is None else Geometry.Line(start, end)
+        return self._add("AddLine", Geometry.LineCurve(line), attributes)
+
+    def AddPolyline(self, points, attributes=None):
+        return self._add("AddPolyline", Geometry.PolylineCurve(Geometry.Polyline(points)), attributes)
+
+    def AddCurve(self, curve, attributes=None):
+        return self._add("AddCurve", curve, attributes)
+
+    def AddCircle(self, circle, attributes=None):
+        return self._add("AddCircle", circle.ToNurbsCurve(), attributes)
+
+    def AddSurface(self, surface, attributes=None):
+        return self._add("AddSurface", surface, attributes)
+
+    def AddBrep(self, brep, attributes=None):
+        return self._add("AddBrep", brep, attributes)
+
+    def AddExtrusion(self, extrusion, attributes=None):
+        return self._add("AddExtrusion", extrusion, attributes)
+
+    def AddSphere(self, sphere, attributes=None):
+        return self._add("AddSphere", sphere, attributes)
+
+    def AddMesh(self, mesh, attributes=None):
+        return self._add("AddMesh", mesh, attributes)
+
+    def AddText(self, text, attributes=None):
+        return self._add("AddText", text, attributes)
+
+    def AddInstanceObject(self, definition_index, xform, attributes=None):
+        return self._add("AddInstanceObject", Geometry.InstanceReferenceGeometry(definition_index, xform), attributes)
+
+    def Find(self, object_id):
+        self.calls["Find"] += 1
+        return self._objects.get(object_id)
+
+    def FindId(self, object_id):
+        return self.Find(object_id)
+
+    def Delete(self, object_id, quiet=True):
+        self.calls["Delete"] += 1
+        object_id = getattr(object_id, "Id", object_id)
+        return self._objects.pop(object_id, None) is not None
+
+    def Replace(self, object_id, geometry):
+        self.calls["Replace"] += 1
+        obj = self._objects.get(object_id)
+        if obj is None:
+            return False
+        obj.Geometry = geometry
+        return True
+
+    def Transform(self, object_id, xform, delete_original):
+        self.calls["Transform"] += 1
+        obj = self._objects.get(object_id)
+        if obj is None:
+            return uuid.UUID(int=0)
+        geometry = obj.Geometry.Duplicate()
+        geometry.Transform(xform)
+        if delete_original:
+            obj.Geometry = geometry
+            return object_id
+        attributes = ObjectAttributes()
+        attributes.Name = obj.Attributes.Name
+        attributes.LayerIndex = obj.Attributes.LayerIndex
+        return self._add("Transform", geometry, attributes)
+
+
+class ViewTable(object):
+    def __init__(self):
+        self.RedrawEnabled = True
+
+    def Redraw(self):
+        pass
+
+
+class DimStyle(object):
+    def __init__(self):
+        self.TextHeight = 1.0
+
+
+class DimStyleTable(object):
+    def __init__(self):
+        self.Current = DimStyle()
+
+
+class Layer(object):
+    def __init__(self, name):
+        self.Name = name
+        self.FullPath = name
+
+
+class LayerTable(list):
+    def FindByFullPath(self, name, not_found_return_value=-1):
+        for index, layer in enumerate(self):
+            if layer.FullPath == name:
+                return index
+        return not_found_return_value
+
+    def Add(self, name):
+        self.append(Layer(name))
+        return len(self) - 1
+
+    @property
+    def CurrentLayerIndex(self):
+        return 0
+
+
+class InstanceDefinition(object):
+    def __init__(self, index, name, description, base_point, geometry):
+        self.Index = index
+        self.Name = name
+        self.Description = description
+        self.BasePoint = base_point
+        self.Geometry = list(geometry)
+
+    def GetObjects(self):
+        return self.Geometry
+
+
+class InstanceDefinitionTable(list):
+    def Add(self, name, description, base_point, geometry, attributes=None):
+        if self.Find(name) is not None:
+            return -1
+        self.append(InstanceDefinition(len(self), name, description, base_point, geometry))
+        return len(self) - 1
+
+    def Find(self, name, ignore_deleted=True):
+        for definition in self:
+            if definition.Name == name:
+                return definition
+        return None
+
+    @property
+    def Count(self):
+        return len(self)
+
+
+class DocumentStrings(object):
+    """Document user text (RhinoDoc.Strings)."""
+
+    def __init__(self):
+        self._values = collections.OrderedDict()
+
+    @property
+    def Count(self):
+        return len(self._values)
+
+    def SetString(self, key, value):
+        old = self._values.get(key)
+        if value is None:
+            self._values.pop(key, None)
+        else:
+            self._values[key] = value
+        return old
+
+    def GetValue(self, key):
+        return self._values.get(key)
+
+    def GetKey(self, index):
+        return list(self._values)[index]
+
+
+class RhinoDoc(object):
+    """In-memory document (model units: meters)."""
+
+    ActiveDoc = None
+
+    def __init__(self):
+        self.Objects = ObjectTable(self)
+        self.Views = ViewTable()
+        self.DimStyles = DimStyleTable()
+        self.Layers = LayerTable([Layer("Default")])
+        self.Strings = DocumentStrings()
+        self.InstanceDefinitions = InstanceDefinitionTable()
+        self.ModelAbsoluteTolerance = 0.001
+        self.ModelAngleToleranceRadians = 0.0174533
+        self._undo = 0
+
+    def BeginUndoRecord(self, description):
+        self._undo += 1
+        return self._undo
+
+    def EndUndoRecord(self, serial_number):
+        return True
+
+    def CreateDefaultAttributes(self):
+        attributes = ObjectAttributes()
+        attributes.LayerIndex = self.Layers.CurrentLayerIndex
+        return attributes
+
+    def Clear(self):
+        """Empties the document (stand-in only)."""
+        self.__init__()
+
+
+RhinoDoc.ActiveDoc = RhinoDoc()
@@ -0,0 +1,12 @@
+"""
+Headless stand-in for the few System (.NET) names the scripts use.
+"""
+import uuid
+
+
+class Guid(object):
+    Empty = uuid.UUID(int=0)
+
+    @staticmethod
+    def NewGuid():
+        return uuid.uuid4()
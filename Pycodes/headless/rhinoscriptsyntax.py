@@ -0,0 +1,552 @@
+"""
+Headless stand-in for the rhinoscriptsyntax calls the scripts in Pycodes use.
+
+Objects live in the in-memory Rhino.RhinoDoc.ActiveDoc. Interactive input
+(GetObject, GetInteger, SaveFileName, ...) is answered from a queue filled
+with queue_input(); an empty queue returns the prompt's default or None.
+"""
+import re
+import uuid
+
+import numpy as np
+
+import Rhino
+import Rhino.Geometry as rg
+import scriptcontext
+
+import MeshArrays  # on sys.path once Rhino.Geometry is imported
+
+_inputs = []
+_last_created = []
+
+
+class filter(object):
+    allobjects = 0
+    point = 1
+    pointcloud = 2
+    curve = 4
+    surface = 8
+    polysurface = 16
+    mesh = 32
+    light = 256
+    annotation = 512
+    instance = 4096
+    textdot = 8192
+
+
+def queue_input(*values):
+    """Queues answers for the next Get*/FileName prompts (stand-in only)."""
+    _inputs.extend(values)
+
+
+def _next_input(default=None):
+    return _inputs.pop(0) if _inputs else default
+
+
+def _doc():
+    return scriptcontext.doc
+
+
+# ---------------------------------------------------------------------------
+# Coercion
+# ---------------------------------------------------------------------------
+
+def coerceguid(value, raise_if_missing=False):
+    if isinstance(value, uuid.UUID):
+        return value
+    if isinstance(value, str):
+        try:
+            return uuid.UUID(value)
+        except ValueError:
+            pass
+    if hasattr(value, "Id"):
+        return value.Id
+    if raise_if_missing:
+        raise ValueError("Could not convert {} to a Guid".format(value))
+    return None
+
+
+def coercerhinoobject(object_id, raise_if_missing=False):
+    object_id = coerceguid(object_id, raise_if_missing)
+    obj = _doc().Objects.Find(object_id) if object_id else None
+    if obj is None and raise_if_missing:
+        raise ValueError("Object {} does not exist".format(object_id))
+    return obj
+
+
+def coercegeometry(value, raise_if_missing=False):
+    if isinstance(value, rg.GeometryBase):
+        return value
+    obj = coercerhinoobject(value, raise_if_missing)
+    return obj.Geometry if obj else None
+
+
+def coercemesh(value, raise_if_missing=False):
+    geometry = coercegeometry(value, raise_if_missing)
+    if isinstance(geometry, rg.Mesh):
+        return geometry
+    if raise_if_missing:
+        raise ValueError("{} is not a mesh".format(value))
+    return None
+
+
+def coercecurve(value, segment_index=-1, raise_if_missing=False):
+    geometry = coercegeometry(value, raise_if_missing)
+    if isinstance(geometry, rg.Curve):
+        return geometry
+    if raise_if_missing:
+        raise ValueError("{} is not a curve".format(value))
+    return None
+
+
+def coerce3dpoint(value, raise_on_error=False):
+    if isinstance(value, rg.Point3d):
+        return value
+    if isinstance(value, rg.Point):
+        return rg.Point3d(value.Location)
+    try:
+        return rg.Point3d(value[0], value[1], value[2])
+    except (TypeError, IndexError):
+        obj = coercegeometry(value)
+        if isinstance(obj, rg.Point):
+            return rg.Point3d(obj.Location)
+    if raise_on_error:
+        raise ValueError("Could not convert {} to a Point3d".format(value))
+    return None
+
+
+def coerce3dvector(value, raise_on_error=False):
+    if isinstance(value, rg.Vector3d):
+        return value
+    return rg.Vector3d(value[0], value[1], value[2])
+
+
+def coerceplane(value, raise_on_error=False):
+    if isinstance(value, rg.Plane):
+        return value
+    return rg.Plane(coerce3dpoint(value), rg.Vector3d(0, 0, 1))
+
+
+def _add(geometry, adder="Add"):
+    object_id = getattr(_doc().Objects, adder)(geometry)
+    return object_id
+
+
+# ---------------------------------------------------------------------------
+# Document, layers and redraw
+# ---------------------------------------------------------------------------
+
+def EnableRedraw(enable=True):
+    old = _doc().Views.RedrawEnabled
+    _doc().Views.RedrawEnabled = enable
+    return old
+
+
+def Redraw():
+    _doc().Views.Redraw()
+
+
+def UnitSystem(unit_system=None, scale=False, in_model_units=True):
+    return 4  # meters
+
+
+_UNIT_METRES = {2: 0.001, 3: 0.01, 4: 1.0, 5: 1000.0, 8: 0.0254, 9: 0.3048}
+
+
+def UnitScale(to_system, from_system=None):
+    from_system = UnitSystem() if from_system is None else from_system
+    return _UNIT_METRES[from_system] / _UNIT_METRES[to_system]
+
+
+def SetDocumentUserText(key, value=None):
+    _doc().Strings.SetString(key, value)
+    return True
+
+
+def GetDocumentUserText(key=None):
+    strings = _doc().Strings
+    if key is None:
+        return [strings.GetKey(i) for i in range(strings.Count)]
+    return strings.GetValue(key)
+
+
+def UnitAbsoluteTolerance(tolerance=None, in_model_units=True):
+    return _doc().ModelAbsoluteTolerance
+
+
+def IsLayer(layer):
+    return _doc().Layers.FindByFullPath(layer, -1) >= 0
+
+
+def AddLayer(name=None, color=None, visible=True, locked=False, parent=None):
+    if not IsLayer(name):
+        _doc().Layers.Add(name)
+    return name
+
+
+def ObjectLayer(object_id, layer=None):
+    obj = coercerhinoobject(object_id, True)
+    old = _doc().Layers[obj.Attributes.LayerIndex].FullPath
+    if layer is not None:
+        AddLayer(layer)
+        obj.Attributes.LayerIndex = _doc().Layers.FindByFullPath(layer)
+    return old
+
+
+def ObjectName(object_id, name=None):
+    obj = coercerhinoobject(object_id, True)
+    old = obj.Attributes.Name
+    if name is not None:
+        obj.Attributes.Name = name
+    return old
+
+
+def AllObjects(select=False, include_lights=False, include_grips=False, include_references=False):
+    return [obj.Id for obj in _doc().Objects]
+
+
+def LastCreatedObjects(select=False):
+    return list(_last_created)
+
+
+def IsObject(object_id):
+    return coercerhinoobject(object_id) is not None
+
+
+def IsMesh(object_id):
+    return isinstance(coercegeometry(object_id), rg.Mesh)
+
+
+def IsCurve(object_id):
+    return isinstance(coercegeometry(object_id), rg.Curve)
+
+
+def DeleteObject(object_id):
+    return _doc().Objects.Delete(coerceguid(object_id), True)
+
+
+def DeleteObjects(object_ids):
+    if isinstance(object_ids, uuid.UUID):
+        object_ids = [object_ids]
+    return sum(1 for object_id in object_ids if DeleteObject(object_id))
+
+
+def TransformObject(object_id, matrix, copy=False):
+    return _doc().Objects.Transform(coerceguid(object_id, True), matrix, not copy)
+
+
+def CopyObject(object_id, translation=None):
+    xform = rg.Transform.Translation(coerce3dvector(translation)) if translation else rg.Transform.Identity
+    return TransformObject(object_id, xform, True)
+
+
+def MoveObject(object_id, translation):
+    return TransformObject(object_id, rg.Transform.Translation(coerce3dvector(translation)))
+
+
+def OrientObject(object_id, reference, target, flags=0):
+    """Two-point orient (rotate reference direction onto target) or three-point plane orient."""
+    copy = bool(flags & 1)
+    scale = bool(flags & 2)
+    reference = [coerce3dpoint(p) for p in reference]
+    target = [coerce3dpoint(p) for p in target]
+    if len(reference) == 1:
+        xform = rg.Transform.Translation(target[0] - reference[0])
+    elif len(reference) == 2:
+        v0 = reference[1] - reference[0]
+        v1 = target[1] - target[0]
+        xform = rg.Transform.Translation(target[0] - reference[0])
+        if scale:
+            xform = xform * rg.Transform.Scale(reference[0], v1.Length / v0.Length)
+        xform = xform * rg.Transform.Rotation(v0, v1, reference[0])
+    else:
+        plane0 = rg.Plane(reference[0], reference[1] - reference[0], reference[2] - reference[0])
+        plane1 = rg.Plane(target[0], target[1] - target[0], target[2] - target[0])
+        xform = rg.Transform.PlaneToPlane(plane0, plane1)
+    return TransformObject(object_id, xform, copy)
+
+
+def BoundingBox(objects, view_or_plane=None, in_world_coords=True):
+    if not isinstance(objects, (list, tuple)):
+        objects = [objects]
+    box = None
+    for obj in objects:
+        geometry = coercegeometry(obj, True)
+        current = geometry.GetBoundingBox(True)
+        if box is None:
+            box = current
+        else:
+            box.Union(current)
+    return box.GetCorners() if box else None
+
+
+# ---------------------------------------------------------------------------
+# Interactive input
+# ---------------------------------------------------------------------------
+
+def GetObject(message=None, filter=0, preselect=False, select=False, custom_filter=None, subobjects=False):
+    return _next_input()
+
+
+def GetObjects(message=None, filter=0, group=True, preselect=False, select=False, objects=None,
+               minimum_count=1, maximum_count=0, custom_filter=None):
+    return _next_input()
+
+
+def GetInteger(message=None, number=None, minimum=None, maximum=None):
+    return _next_input(number)
+
+
+def GetReal(message="Number", number=None, minimum=None, maximum=None):
+    return _next_input(number)
+
+
+def GetString(message=None, defaultString=None, strings=None):
+    return _next_input(defaultString)
+
+
+def SaveFileName(title=None, filter=None, folder=None, filename=None, extension=None):
+    return _next_input(None)
+
+
+def OpenFileName(title=None, filter=None, folder=None, filename=None, extension=None):
+    return _next_input(None)
+
+
+def Command(commandString, echo=True):
+    """Supports "-QuadRemesh ... _SelID <id>" through Mesh.QuadRemesh; other commands fail."""
+    del _last_created[:]
+    if commandString.strip().startswith("-QuadRemesh"):
+        match = re.search(r"_SelID\s+(\S+)", commandString)
+        mesh = coercemesh(match.group(1)) if match else None
+        if mesh is None:
+            return False
+        parameters = rg.QuadRemeshParameters()
+        count = re.search(r"TargetQuadCount\s+(\d+)", commandString)
+        if count:
+            parameters.TargetQuadCount = int(count.group(1))
+        _last_created.append(_add(mesh.QuadRemesh(parameters), "AddMesh"))
+        return True
+    print("Command not available headless: {}".format(commandString))
+    return False
+
+
+# ---------------------------------------------------------------------------
+# Points, curves and surfaces
+# ---------------------------------------------------------------------------
+
+def AddPoint(point, y=None, z=None):
+    if y is not None:
+        point = (point, y, z)
+    return _doc().Objects.AddPoint(coerce3dpoint(point, True))
+
+
+def AddLine(start, end):
+    return _doc().Objects.AddLine(coerce3dpoint(start, True), coerce3dpoint(end, True))
+
+
+def AddPolyline(points, replace_id=None):
+    return _doc().Objects.AddPolyline([coerce3dpoint(p, True) for p in points])
+
+
+def AddCurve(points, degree=3):
+    curve = rg.NurbsCurve(np.array([list(coerce3dpoint(p, True)) for p in points]))
+    return _doc().Objects.AddCurve(curve)
+
+
+def AddCircle(plane_or_center, radius):
+    if isinstance(plane_or_center, rg.Plane):
+        circle = rg.Circle(plane_or_center, radius)
+    else:
+        circle = rg.Circle(coerce3dpoint(plane_or_center, True), radius)
+    return _doc().Objects.AddCircle(circle)
+
+
+def AddSphere(center_or_plane, radius):
+    center = center_or_plane.Origin if isinstance(center_or_plane, rg.Plane) else coerce3dpoint(center_or_plane, True)
+    return _doc().Objects.AddSphere(rg.Sphere(center, radius))
+
+
+def AddText(text, point_or_plane, height=1.0, font=None, font_style=0, justification=None):
+    if isinstance(point_or_plane, rg.Plane):
+        plane = point_or_plane
+    else:
+        plane = rg.Plane(coerce3dpoint(point_or_plane, True), rg.Vector3d(0, 0, 1))
+    entity = rg.TextEntity.Create(str(text), plane, _doc().DimStyles.Current, False, 0, 0)
+    entity.TextHeight = height
+    return _doc().Objects.AddText(entity)
+
+
+def AddSrfPt(points):
+    corners = [list(coerce3dpoint(p, True)) for p in points]
+    return _doc().Objects.AddSurface(rg.Surface(corners=corners))
+
+
+def AddPlaneSurface(plane, u_dir, v_dir):
+    corners = [plane.PointAt(0, 0), plane.PointAt(u_dir, 0), plane.PointAt(u_dir, v_dir), plane.PointAt(0, v_dir)]
+    return AddSrfPt(corners)
+
+
+def PlaneFromNormal(origin, normal, xaxis=None):
+    origin = coerce3dpoint(origin, True)
+    normal = coerce3dvector(normal, True)
+    if xaxis is None:
+        return rg.Plane(origin, normal)
+    yaxis = rg.Vector3d.CrossProduct(normal, coerce3dvector(xaxis))
+    return rg.Plane(origin, coerce3dvector(xaxis), yaxis)
+
+
+def WorldXYPlane():
+    return rg.Plane.WorldXY
+
+
+def CurveLength(curve_id, segment_index=-1, sub_domain=None):
+    return coercecurve(curve_id, -1, True).GetLength(sub_domain)
+
+
+def CurveDomain(curve_id, segment_index=-1):
+    domain = coercecurve(curve_id, -1, True).Domain
+    return [domain.T0, domain.T1]
+
+
+def CurveNormalizedParameter(curve_id, parameter):
+    return coercecurve(curve_id, -1, True).Domain.ParameterAt(parameter)
+
+
+def CurveStartPoint(curve_id, segment_index=-1, point=None):
+    return coercecurve(curve_id, -1, True).PointAtStart
+
+
+def CurveEndPoint(curve_id, segment_index=-1):
+    return coercecurve(curve_id, -1, True).PointAtEnd
+
+
+def EvaluateCurve(curve_id, t, segment_index=-1):
+    return coercecurve(curve_id, -1, True).PointAt(t)
+
+
+def CurveTangent(curve_id, parameter, segment_index=-1):
+    return coercecurve(curve_id, -1, True).TangentAt(parameter)
+
+
+def CurvePoints(curve_id, segment_index=-1):
+    return [rg.Point3d(p) for p in coercecurve(curve_id, -1, True).points()]
+
+
+def DivideCurve(curve_id, segments, create_points=False, return_points=True):
+    curve = coercecurve(curve_id, -1, True)
+    params = curve.DivideByCount(segments, True)
+    if not return_points:
+        return params
+    points = [curve.PointAt(t) for t in params]
+    if create_points:
+        for point in points:
+            AddPoint(point)
+    return points
+
+
+def TrimCurve(curve_id, interval, delete_input=True):
+    curve = coercecurve(curve_id, -1, True)
+    object_id = _doc().Objects.AddCurve(curve.Trim(interval[0], interval[1]))
+    if delete_input:
+        DeleteObject(curve_id)
+    return object_id
+
+
+def ExtrudeCurveStraight(curve_id, start_point, end_point):
+    curve = coercecurve(curve_id, -1, True)
+    direction = coerce3dpoint(end_point, True) - coerce3dpoint(start_point, True)
+    return _doc().Objects.AddSurface(rg.Surface.CreateExtrusion(curve, direction))
+
+
+def ExtrudeCurve(curve_id, path_id):
+    profile = coercecurve(curve_id, -1, True)
+    rail = coercecurve(path_id, -1, True)
+    return _doc().Objects.AddBrep(rg.Sweep(profile, rail).ToBrep())
+
+
+def CapPlanarHoles(surface_id):
+    obj = coercerhinoobject(surface_id, True)
+    if isinstance(obj.Geometry, rg.Brep):
+        return _doc().Objects.Replace(obj.Id, obj.Geometry.CapPlanarHoles())
+    return False
+
+
+def ProjectCurveToMesh(curve_ids, mesh_ids, direction):
+    """Projects each curve's polyline points along direction onto the meshes."""
+    if not isinstance(curve_ids, (list, tuple)):
+        curve_ids = [curve_ids]
+    if not isinstance(mesh_ids, (list, tuple)):
+        mesh_ids = [mesh_ids]
+    direction = coerce3dvector(direction).array()
+    result = []
+    for curve_id in curve_ids:
+        points = coercecurve(curve_id, -1, True).points()
+        for mesh_id in mesh_ids:
+            mesh = coercemesh(mesh_id, True)
+            hits, found = MeshArrays.intersect_lines(mesh.vertex_array, mesh.face_array, points, direction)
+            if found.sum() >= 2:
+                result.append(_doc().Objects.AddCurve(rg.PolylineCurve(hits[found])))
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Meshes
+# ---------------------------------------------------------------------------
+
+def AddMesh(vertices, face_vertices, vertex_normals=None, texture_coordinates=None, vertex_colors=None):
+    mesh = rg.Mesh()
+    mesh.Vertices.AddVertices(vertices)
+    mesh.Faces.AddFaces(face_vertices)
+    return _doc().Objects.AddMesh(mesh)
+
+
+def AddPlanarMesh(object_id, delete_input=False):
+    curve = coercecurve(object_id, -1, True)
+    object_id_new = _doc().Objects.AddMesh(rg.Mesh.CreateFromClosedPolyline(curve.points()))
+    if delete_input:
+        DeleteObject(object_id)
+    return object_id_new
+
+
+def MeshVertices(object_id):
+    return coercemesh(object_id, True).Vertices.ToPoint3dArray()
+
+
+def MeshVertexCount(object_id):
+    return coercemesh(object_id, True).Vertices.Count
+
+
+def MeshVertexColors(object_id, colors=0):
+    mesh = coercemesh(object_id, True)
+    previous = getattr(mesh, "vertex_colors", None)
+    if colors != 0:
+        mesh.vertex_colors = [tuple(color) for color in colors] if colors else None
+    return previous
+
+
+def MeshFaceCount(object_id):
+    return coercemesh(object_id, True).Faces.Count
+
+
+def MeshFaceVertices(object_id):
+    return [tuple(face) for face in coercemesh(object_id, True).face_array.tolist()]
+
+
+def MeshOffset(mesh_ids, distance):
+    if not isinstance(mesh_ids, (list, tuple)):
+        mesh_ids = [mesh_ids]
+    ids = [_doc().Objects.AddMesh(coercemesh(mesh_id, True).Offset(distance)) for mesh_id in mesh_ids]
+    return ids[0] if len(ids) == 1 else ids
+
+
+def MeshOutline(object_ids, view=None):
+    if not isinstance(object_ids, (list, tuple)):
+        object_ids = [object_ids]
+    return [_doc().Objects.AddCurve(rg.PolylineCurve(polyline))
+            for object_id in object_ids for polyline in coercemesh(object_id, True).GetOutlines(rg.Plane.WorldXY)]
+
+
+def DuplicateMeshBorder(mesh_id):
+    mesh = coercemesh(mesh_id, True)
+    return [_doc().Objects.AddCurve(rg.PolylineCurve(polyline)) for polyline in mesh.GetNakedEdges()]
@@ -0,0 +1,12 @@
+"""
+Headless stand-in for scriptcontext: doc is the in-memory Rhino.RhinoDoc.
+"""
+import Rhino
+
+doc = Rhino.RhinoDoc.ActiveDoc
+id = 1
+sticky = {}
+
+
+def escape_test(throw_exception=True, reset=False):
+    return False